@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+SynergyClone Benchmark - performans ölçümleri
+
+Kullanım:
+    python3 benchmark.py switch [--backend memory] [--iterations 10000]
+    python3 benchmark.py injection [--iterations 100000]
+    python3 benchmark.py metrics [--iterations 100000]
+    python3 benchmark.py loop_lag
+    python3 benchmark.py micro [--filter fanout] [--repetitions 20] [--cpu 2] [--json micro.json]
+    python3 benchmark.py compare eski.json yeni.json [--threshold 0.1]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from itertools import repeat
+
+import logs
+
+from input_handler import InputHandler
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Bir fonksiyonu benchmark olarak kaydeden dekoratör"""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+def percentile(samples, pct):
+    """Sıralı örneklerden yüzdelik değer döndür"""
+    if not samples:
+        return 0
+    index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+    return samples[index]
+
+def report(title, samples_ns):
+    """Nanosaniye örneklerinin özetini ms olarak yazdır"""
+    samples = sorted(samples_ns)
+    print(f"📊 {title}: n={len(samples)} "
+          f"p50={percentile(samples, 50) / 1e6:.4f}ms "
+          f"p99={percentile(samples, 99) / 1e6:.4f}ms "
+          f"max={samples[-1] / 1e6:.4f}ms")
+
+@benchmark("switch")
+def bench_switch(args):
+    """Suppress açma/kapama (kontrol geçişi) gecikmesi"""
+    handler = InputHandler(args.backend)
+    handler.start()
+    handler.start_capture()
+
+    received = []
+    handler.on_mouse_move = received.append
+
+    # Geçişler sırasında capture thread'i olay üretmeye devam etsin
+    script = [("move", i % 1920, i % 1080) for i in range(args.iterations * 4)]
+    player = None
+    if hasattr(handler.backend, 'play_async'):
+        player = handler.backend.play_async(script, realtime=False)
+
+    samples = []
+    for i in range(args.iterations):
+        start = time.perf_counter_ns()
+        handler.set_suppress_input(i % 2 == 0)
+        samples.append(time.perf_counter_ns() - start)
+
+    if player:
+        player.join()
+    handler.set_suppress_input(False)
+    handler.stop_capture()
+
+    report(f"Suppress geçişi ({handler.backend.name})", samples)
+    if handler.backend.name == "memory":
+        print("ℹ️ memory backend yalnızca bastırma bayrağını değiştirir; gerçek geçiş gecikmesi "
+              "için --backend pynput/windows/macos kullanın")
+    if player:
+        lost = len(script) - len(received)
+        print(f"📨 Gönderilen: {len(script)}, alınan: {len(received)}, kayıp: {lost}")
+        return lost == 0
+    return True
+
+def _injection_rate(client, messages):
+    """Mesajları client'ın işleme yolundan geçirip (saniyedeki olay, işlenen, birleştirilen) döndür"""
+    async def run():
+        handle = client.handle_server_message
+        for message in messages:
+            await handle(message)
+
+    injector = client.injector
+    processed, coalesced = injector.processed, injector.coalesced
+    start = time.perf_counter_ns()
+    asyncio.run(run())
+    injector.flush()  # Kuyruktaki enjeksiyonlar da bitmeli
+    rate = len(messages) / ((time.perf_counter_ns() - start) / 1e9)
+    return rate, injector.processed - processed - 1, injector.coalesced - coalesced  # flush işaretçisi hariç
+
+@benchmark("injection")
+def bench_injection(args):
+    """Client enjeksiyon hızı: debug log açıkken ve kapalıyken"""
+    from client import SynergyClient
+    from utils import MessageType
+
+    client = SynergyClient(server_host='127.0.0.1', input_backend=args.backend)
+    client.headless = True
+    client.injector.coalesce = False  # Her hareket gerçekten enjekte edilsin (log maliyeti dahil)
+    client.input_handler.start()
+
+    move, click = MessageType.MOUSE_MOVE.value, MessageType.MOUSE_CLICK.value
+    messages = []
+    for i in range(args.iterations):
+        if i % 50 == 0:
+            messages.append({'type': click, 'x': i % 1920, 'y': i % 1080,
+                             'button': 'left', 'pressed': i % 100 == 0})
+        else:
+            messages.append({'type': move, 'x': i % 1920, 'y': i % 1080})
+    client.injector.capacity = len(messages) + 1  # Birleştirme yokken de hiçbir olay düşmesin
+
+    results = {}
+    for level in ("warning", "debug"):
+        logs.set_log_level(level)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            _injection_rate(client, messages[:1000])  # ısınma
+            results[level] = _injection_rate(client, messages)
+    logs.set_log_level("info")
+    client.input_handler.stop()
+    client.injector.shutdown()
+
+    (off, off_processed, off_coalesced), (on, on_processed, on_coalesced) = \
+        results["warning"], results["debug"]
+    print(f"📊 Enjeksiyon ({client.input_handler.backend.name}, n={len(messages)}): "
+          f"log kapalı {off:,.0f} olay/s, debug log açık {on:,.0f} olay/s "
+          f"({off / on:.1f}x)")
+    print(f"💉 Log kapalı: {off_processed} işlenen, {off_coalesced} birleştirilen; "
+          f"debug log açık: {on_processed} işlenen, {on_coalesced} birleştirilen; "
+          f"{client.injector.dropped} düşürülen")
+    return off_coalesced == on_coalesced == 0 and client.injector.dropped == 0
+
+class _FakeWebSocket:
+    """send() anında dönen, ağ maliyeti olmayan websocket yerine geçen nesne"""
+
+    def __init__(self, port):
+        self.remote_address = ("127.0.0.1", port)
+        self.transport = None
+
+    async def send(self, payload):
+        pass
+
+@benchmark("metrics")
+def bench_metrics(args):
+    """Sayaç güncellemelerinin send_to_clients fan-out yolundaki payı"""
+    from server import SynergyServer
+    from utils import MessageType
+
+    server = SynergyServer(host='127.0.0.1', input_backend=args.backend)
+    for port in range(4):
+        websocket = _FakeWebSocket(50000 + port)
+        server.clients.add(websocket)
+        server.metrics.add_peer(websocket, f"127.0.0.1:{50000 + port}")
+
+    message = {'type': MessageType.MOUSE_MOVE.value, 'x': 100, 'y': 200}
+    n = args.iterations
+    metrics = server.metrics
+
+    async def send_all():
+        start = time.perf_counter_ns()
+        for _ in range(n):
+            await server.send_to_clients(message)
+        return time.perf_counter_ns() - start
+
+    async def compare(rounds=5):
+        # Açık/kapalı turlar sırası değişerek art arda; her birinin en iyisi alınır
+        best = {True: None, False: None}
+        for i in range(rounds):
+            for enabled in ((True, False) if i % 2 == 0 else (False, True)):
+                metrics.enabled = enabled
+                elapsed = await send_all()
+                if best[enabled] is None or elapsed < best[enabled]:
+                    best[enabled] = elapsed
+        metrics.enabled = True
+        return best[True], best[False]
+
+    on_ns, off_ns = asyncio.run(compare())
+    sent = metrics.events_out[message['type']]
+
+    start = time.perf_counter_ns()
+    body = metrics.render()
+    render_ns = time.perf_counter_ns() - start
+
+    per_on, per_off = on_ns / n, off_ns / n
+    print(f"📊 Fan-out ({len(server.clients)} client, n={n}): metrikler açık {per_on / 1000:.2f}µs/mesaj, "
+          f"kapalı {per_off / 1000:.2f}µs/mesaj, sayaçlar {per_on - per_off:+.0f}ns/mesaj "
+          f"(%{100 * (per_on - per_off) / per_on:+.1f}); sayılan mesaj {sent}")
+    print(f"📊 /metrics üretimi: {render_ns / 1e6:.3f}ms, {len(body)} byte")
+    return True
+
+LOAD_EVENTS = 2000        # loop_lag senaryosundaki mesaj sayısı
+LOAD_RATE = 1000          # Saniyedeki mesaj
+SLOW_INJECT_EVERY = 100   # Her N mesajda bir yavaş OS çağrısı
+SLOW_INJECT_S = 0.04      # Yavaş çağrının süresi
+FAST_INJECT_S = 0.0002    # Normal çağrının süresi
+
+async def _drive_load(handle, messages):
+    """Mesajları sabit hızda handle'a verir; loop gecikmesini ölçen izleyiciyi döndürür"""
+    from loop_monitor import LoopMonitor
+
+    monitor = LoopMonitor(interval=0.005, stall_threshold=0.02)
+    monitor.start()
+    start = time.perf_counter()
+    for i, message in enumerate(messages):
+        delay = start + i / LOAD_RATE - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await handle(message)
+    await asyncio.sleep(0.05)
+    monitor.stop()
+    return monitor
+
+@benchmark("loop_lag")
+def bench_loop_lag(args):
+    """Yavaş enjeksiyon altında loop gecikmesi: loop içinde (eski) ve injection worker'da"""
+    from client import SynergyClient
+    from utils import MessageType
+
+    client = SynergyClient(server_host='127.0.0.1', input_backend=args.backend)
+    client.headless = True
+    client.input_handler.start()
+    backend = client.input_handler.backend
+    if not hasattr(backend, 'on_inject'):
+        print("⚠️ Bu benchmark memory backend gerektirir")
+        return False
+
+    def slow_os_call(entry):
+        time.sleep(SLOW_INJECT_S if entry[1] == 'click' else FAST_INJECT_S)
+    backend.on_inject = slow_os_call
+
+    move, click = MessageType.MOUSE_MOVE.value, MessageType.MOUSE_CLICK.value
+    messages = []
+    for i in range(LOAD_EVENTS):
+        if i % SLOW_INJECT_EVERY == 0:
+            messages.append({'type': click, 'x': i % 1920, 'y': 500, 'button': 'left', 'pressed': True})
+        else:
+            messages.append({'type': move, 'x': i % 1920, 'y': 500})
+
+    async def inline(data):
+        # Eski davranış: OS çağrısı doğrudan loop thread'inde
+        if data['type'] == move:
+            client.input_handler.simulate_mouse_move(data['x'], data['y'])
+        else:
+            client.input_handler.simulate_mouse_click(data['x'], data['y'], data['button'], data['pressed'])
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        before = asyncio.run(_drive_load(inline, messages))
+        after = asyncio.run(_drive_load(client.handle_server_message, messages))
+        client.injector.flush()
+    client.input_handler.stop()
+
+    for title, monitor in (("Loop içinde enjeksiyon", before), ("Injection worker", after)):
+        snap = monitor.lag.snapshot()
+        print(f"📊 {title}: max loop gecikmesi {snap['max_ns'] / 1e6:.1f}ms, "
+              f"p99 {snap['p99_ns'] / 1e6:.2f}ms, tıkanma {monitor.stall_count}")
+    return after.max_lag_ns < before.max_lag_ns
+
+MICRO_BENCHMARKS = {}
+MICRO_TARGET_NS = 20_000_000   # Bir tekrarın hedef süresi (çağrı sayısı buna göre seçilir)
+COMPARE_THRESHOLD = 0.10       # compare: medyanda bu oranı aşan yavaşlama gerileme sayılır
+
+def micro(name):
+    """Mikro benchmark kaydeden dekoratör; fonksiyon args alıp run(n) döndürür"""
+    def decorator(func):
+        MICRO_BENCHMARKS[name] = func
+        return func
+    return decorator
+
+class MicroUnavailable(Exception):
+    """Mikro benchmark bu ortamda ölçülemiyor (ör. pynput yok)"""
+
+def _sync_runner(func, *args):
+    """func(*args) çağrısını n kez yapan run(n)"""
+    def run(n):
+        for _ in repeat(None, n):
+            func(*args)
+    return run
+
+def _async_runner(loop, coroutine_function, *args):
+    """Coroutine'i tek bir loop çalıştırması içinde n kez bekleyen run(n); run.close loop'u kapatır"""
+    async def batch(n):
+        for _ in repeat(None, n):
+            await coroutine_function(*args)
+
+    def run(n):
+        return loop.run_until_complete(batch(n))
+    run.close = loop.close
+    return run
+
+def _screens():
+    from utils import ScreenInfo
+    return ScreenInfo(1920, 1080), ScreenInfo(2560, 1440, x=1920, name="client")
+
+@micro("message_to_json")
+def micro_message_to_json(args):
+    from utils import Message, MessageType
+    message = Message(MessageType.MOUSE_MOVE, {'x': 1234, 'y': 567})
+    return _sync_runner(message.to_json)
+
+@micro("message_from_json")
+def micro_message_from_json(args):
+    from utils import Message, MessageType
+    payload = Message(MessageType.MOUSE_MOVE, {'x': 1234, 'y': 567}).to_json()
+    return _sync_runner(Message.from_json, payload)
+
+@micro("normalize_coordinates")
+def micro_normalize_coordinates(args):
+    from utils import normalize_coordinates
+    local, remote = _screens()
+    return _sync_runner(normalize_coordinates, 1234, 567, local, remote)
+
+@micro("is_point_in_screen")
+def micro_is_point_in_screen(args):
+    from utils import is_point_in_screen
+    local, _ = _screens()
+    return _sync_runner(is_point_in_screen, 1234, 567, local)
+
+@micro("clamp_coordinates")
+def micro_clamp_coordinates(args):
+    from utils import clamp_coordinates
+    local, _ = _screens()
+    return _sync_runner(clamp_coordinates, 2500, -20, local)
+
+def _pynput_handler():
+    """Gerçek pynput nesneleri ve pynput backend eşlemesiyle handler; pynput yoksa MicroUnavailable"""
+    from input_backend import PynputBackend
+    try:
+        from pynput import keyboard, mouse
+    except Exception as e:
+        raise MicroUnavailable(f"pynput yüklenemedi ({e}); tuş/düğme dönüşümü pynput nesneleriyle ölçülür")
+    backend = PynputBackend()
+    backend.Button, backend.Key = mouse.Button, keyboard.Key  # Controller/listener kurmadan eşleme
+    return InputHandler(backend), keyboard, mouse
+
+@micro("key_to_string")
+def micro_key_to_string(args):
+    handler, keyboard, _ = _pynput_handler()
+    return _sync_runner(handler._key_to_string, keyboard.KeyCode.from_char('a'))
+
+@micro("key_to_string_special")
+def micro_key_to_string_special(args):
+    handler, keyboard, _ = _pynput_handler()
+    return _sync_runner(handler._key_to_string, keyboard.Key.shift)
+
+@micro("button_to_string")
+def micro_button_to_string(args):
+    handler, _, mouse = _pynput_handler()
+    return _sync_runner(handler._button_to_string, mouse.Button.left)
+
+def _fake_server(args, clients):
+    """Sahte websocket'lere bağlı, loop'u hazır bir server"""
+    from server import SynergyServer
+    server = SynergyServer(host='127.0.0.1', input_backend=args.backend)
+    server.loop = asyncio.new_event_loop()
+    for port in range(clients):
+        websocket = _FakeWebSocket(50000 + port)
+        server.clients.add(websocket)
+        server.metrics.add_peer(websocket, f"127.0.0.1:{50000 + port}")
+    return server
+
+def _fanout(clients):
+    def setup(args):
+        from utils import MessageType
+        server = _fake_server(args, clients)
+        message = {'type': MessageType.MOUSE_MOVE.value, 'x': 1234, 'y': 567}
+        return _async_runner(server.loop, server.send_to_clients, message)
+    return setup
+
+for _clients in (1, 4, 16):
+    micro(f"send_to_clients_{_clients}")(_fanout(_clients))
+
+def _dispatch(message):
+    def setup(args):
+        server = _fake_server(args, 1)
+        websocket = next(iter(server.clients))
+        return _async_runner(server.loop, server.handle_client_message, websocket, json.dumps(message))
+    return setup
+
+micro("handle_client_message_client_info")(_dispatch(
+    {'type': 'client_info', 'screen_width': 2560, 'screen_height': 1440, 'platform': 'Linux'}))
+micro("handle_client_message_trace_sync")(_dispatch({'type': 'trace_sync', 't0': 123456789}))
+micro("handle_client_message_unknown")(_dispatch({'type': 'heartbeat'}))
+
+def pin_cpu(cpu=None):
+    """Süreci tek bir CPU'ya sabitle; cpu verilmezse izin verilenlerin sonuncusu.
+
+    Sabitlenen CPU'yu, platform desteklemiyorsa ya da olmazsa None döndürür.
+    """
+    if not hasattr(os, 'sched_setaffinity'):
+        return None
+    try:
+        if cpu is None:
+            cpu = max(os.sched_getaffinity(0))  # CPU 0 genelde daha çok kesme alır
+        os.sched_setaffinity(0, {cpu})
+        return cpu
+    except OSError as e:
+        print(f"⚠️ CPU {cpu}'ya sabitlenemedi: {e}")
+        return None
+
+def _calibrate(run):
+    """Bir tekrarın yaklaşık MICRO_TARGET_NS sürmesi için çağrı sayısı"""
+    n = 1
+    while True:
+        start = time.perf_counter_ns()
+        run(n)
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= MICRO_TARGET_NS / 10 or n >= 10**7:
+            return max(1, int(n * MICRO_TARGET_NS / max(elapsed, 1)))
+        n *= 10
+
+def measure(run, warmup, repetitions, number=None):
+    """Isınma sonrası her tekrarda number çağrı; çağrı başına ns istatistikleri.
+
+    Ölçüm sırasında GC kapatılır (timeit gibi); tekrarlar arası dağılım
+    sonuçların ne kadar kararlı olduğunu gösterir.
+    """
+    import gc
+    number = number or _calibrate(run)
+    for _ in range(warmup):
+        run(number)
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repetitions):
+            start = time.perf_counter_ns()
+            run(number)
+            samples.append((time.perf_counter_ns() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        "number": number,
+        "repetitions": repetitions,
+        "min_ns": min(samples),
+        "median_ns": statistics.median(samples),
+        "mean_ns": statistics.fmean(samples),
+        "stdev_ns": statistics.pstdev(samples),
+    }
+
+@benchmark("micro")
+def bench_micro(args):
+    """Protokol, yönlendirme ve geometri sıcak yollarının mikro benchmark'ları"""
+    names = [name for name in MICRO_BENCHMARKS if not args.filter or args.filter in name]
+    affinity = os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else None
+    cpu = pin_cpu(args.cpu)
+    if cpu is None:
+        print("⚠️ CPU sabitlenmedi; sonuçlar zamanlayıcı göçleri yüzünden daha gürültülü olabilir")
+    else:
+        print(f"📌 CPU {cpu}'ya sabitlendi")
+    logs.set_log_level("warning")
+    results = {}
+    ok = True
+    try:
+        for name in names:
+            try:
+                run = MICRO_BENCHMARKS[name](args)
+            except MicroUnavailable as e:
+                print(f"❌ {name}: {e}")
+                ok = False
+                continue
+            try:
+                results[name] = measure(run, args.warmup, args.repetitions, args.number)
+            finally:
+                close = getattr(run, "close", None)  # Async benchmark'ların event loop'u
+                if close:
+                    close()
+            result = results[name]
+            print(f"📊 {name:<36} {result['median_ns']:>10.1f}ns/op "
+                  f"(min {result['min_ns']:.1f}, ±{100 * result['stdev_ns'] / result['mean_ns']:.1f}%, "
+                  f"n={result['number']}×{result['repetitions']})")
+    finally:
+        logs.set_log_level("info")
+        if cpu is not None and affinity:
+            os.sched_setaffinity(0, affinity)  # Sonraki benchmark'lar sabitlenmeden çalışsın
+
+    if args.json:
+        document = {
+            "meta": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                     "machine": platform.machine(), "system": platform.system(), "cpu": cpu, "pinned": cpu is not None,
+                     "backend": args.backend, "warmup": args.warmup, "repetitions": args.repetitions},
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"💾 Sonuçlar yazıldı: {args.json}")
+    return ok
+
+def compare_results(old, new, threshold=COMPARE_THRESHOLD):
+    """(ad, eski ns, yeni ns, değişim oranı, gerileme mi?) listesi; medyanlar karşılaştırılır.
+
+    Eskide olup yenide olmayan benchmark'lar (yeni ns ve oran None) gerileme sayılır;
+    yalnızca yenide olanlar (eski ns None) bilgi amaçlıdır.
+    """
+    rows = []
+    for name, result in old["results"].items():
+        if name not in new["results"]:
+            rows.append((name, result["median_ns"], None, None, True))
+            continue
+        before, after = result["median_ns"], new["results"][name]["median_ns"]
+        change = (after - before) / before if before else 0.0
+        rows.append((name, before, after, change, change > threshold))
+    for name, result in new["results"].items():
+        if name not in old["results"]:
+            rows.append((name, None, result["median_ns"], None, False))
+    return rows
+
+def compare_main(argv):
+    parser = argparse.ArgumentParser(prog="benchmark.py compare",
+                                     description="İki micro benchmark JSON çıktısını karşılaştır")
+    parser.add_argument("old", help="Referans sonuçlar (JSON)")
+    parser.add_argument("new", help="Yeni sonuçlar (JSON)")
+    parser.add_argument("--threshold", type=float, default=COMPARE_THRESHOLD,
+                        help="Gerileme sayılacak yavaşlama oranı (varsayılan: 0.10)")
+    args = parser.parse_args(argv)
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    regressions = 0
+    for name, before, after, change, regressed in compare_results(old, new, args.threshold):
+        regressions += regressed
+        if after is None:
+            print(f"❌ {name:<36} {before:>10.1f} → eksik (yeni sonuçlarda yok)")
+            continue
+        if before is None:
+            print(f"🆕 {name:<36} {'-':>10} → {after:>10.1f}ns/op")
+            continue
+        mark = "❌" if regressed else ("🚀" if change < -args.threshold else "✅")
+        print(f"{mark} {name:<36} {before:>10.1f} → {after:>10.1f}ns/op ({change * 100:+.1f}%)")
+    if regressions:
+        print(f"❌ {regressions} gerileme veya eksik benchmark (eşik %{args.threshold * 100:.0f})")
+        return 1
+    print("✅ Gerileme yok")
+    return 0
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["compare"]:
+        return compare_main(argv[1:])
+
+    parser = argparse.ArgumentParser(description="SynergyClone benchmark'ları")
+    parser.add_argument("names", nargs="*",
+                        help=f"Çalıştırılacak benchmark'lar: {', '.join(sorted(BENCHMARKS))} (varsayılan: hepsi)")
+    parser.add_argument("--backend", default="memory", help="Input backend adı")
+    parser.add_argument("--iterations", type=int, default=10000, help="Tekrar sayısı")
+    parser.add_argument("--filter", default=None, help="micro: yalnızca adında bu metin geçenler")
+    parser.add_argument("--warmup", type=int, default=3, help="micro: ısınma tekrarı")
+    parser.add_argument("--repetitions", type=int, default=15, help="micro: ölçüm tekrarı")
+    parser.add_argument("--number", type=int, default=None,
+                        help="micro: tekrar başına çağrı (varsayılan: ~20ms'ye göre ayarlanır)")
+    parser.add_argument("--cpu", type=int, default=None,
+                        help="micro: süreci bu CPU'ya sabitle (varsayılan: izin verilen son CPU)")
+    parser.add_argument("--json", default=None, metavar="PATH", help="micro: sonuçları JSON olarak yaz")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Bilinmeyen benchmark: {', '.join(unknown)}")
+
+    ok = True
+    for name in args.names or sorted(BENCHMARKS):
+        print(f"\n▶️ {name}")
+        ok = BENCHMARKS[name](args) and ok
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,23 +4,63 @@ SynergyClone Client - Windows bilgisayar uygulaması
 """
 
 import asyncio
-import websockets
 import json
+import signal
 import threading
 import time
 import platform
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from collections import deque
+from time import perf_counter_ns
+from edge import EdgeMonitor
+from injection import InjectionWorker
 from input_handler import InputHandler
+from logs import GuiLogFlusher, Logger, LogRing
+from loop_monitor import LoopMonitor
+from metrics import CLIENT_STAGES, Metrics, MetricsEndpoint, PipelineLatency
+from motion import Extrapolator, JitterBuffer, MotionPredictor, save_trace
+from profiler import RuntimeProfiler
+from tracing import CLOCK_SYNC_INTERVAL, CLOCK_SYNC_SAMPLES, tracer
+from utils import MessageType, lazy_import
+
+MOTION_TRACE_CAPACITY = 200000  # --record-motion ile tutulan en fazla kare (~25dk @125Hz)
+GRAB_CHECK_INTERVAL = 0.25  # auto modda işaretçi yakalama yoklaması aralığı (saniye)
+
+# Ağır modüller ilk kullanımda yüklenir (GUI oluşturma / bağlantı)
+websockets = lazy_import("websockets")
+tk = lazy_import("tkinter")
+ttk = lazy_import("tkinter.ttk")
+messagebox = lazy_import("tkinter.messagebox")
+scrolledtext = lazy_import("tkinter.scrolledtext")
 
 class SynergyClient:
-    def __init__(self):
-        self.server_host = '192.168.1.100'  # macOS server IP'sini buraya girin
-        self.server_port = 8765
+    def __init__(self, server_host='192.168.1.100', server_port=8765, input_backend=None):
+        self.server_host = server_host  # macOS server IP'sini buraya girin
+        self.server_port = server_port
         self.websocket = None
+        self.loop = None  # Bağlantının asyncio loop'u (connect_to_server içinde atanır)
+        self.startup_profile = None  # --profile-startup modunda StartupProfile
+        self.headless = False  # GUI olmadan (daemon) çalışıyor mu?
+        self.reconnect_delay = 2.0  # Headless modda yeniden bağlanma aralığı (saniye)
         self.connected = False
-        self.input_handler = InputHandler()
+        self.latency = PipelineLatency(CLIENT_STAGES)  # Aşama bazında gecikme histogramları
+        self.latency_dump_path = None  # Kapanışta histogramların yazılacağı JSON dosyası
+        self.input_handler = InputHandler(input_backend, latency=self.latency)
+        self.metrics = Metrics("synergy_client", self.latency)
+        self.metrics_port = None  # Verilirse localhost'ta Prometheus /metrics sunulur
+        self._metrics_endpoint = None
+        self._connect_attempts = 0
+        self._setup_metrics()
+        self.profiler = RuntimeProfiler("client")  # Çalışırken açılıp kapatılabilen profil
+        self.injector = InjectionWorker()  # OS enjeksiyon çağrıları loop dışında, sıralı kuyruktan
+        self.jitter_buffer = None  # Açıksa olaylar gönderen zaman damgalarına göre oynatılır
+        self.extrapolator = None  # Açıksa kare geciktiğinde imleç konumu tahmin edilir
+        self.motion_trace = None  # (gönderim ns, varış ns, x, y); --record-motion ile açılır
+        self.motion_trace_path = None
         self.controlling = False  # Bu client kontrol ediyor mu?
+        self.relative_mouse = "off"  # Göreli enjeksiyon: off / on / auto (işaretçi yakalanınca)
+        self._pointer_grabbed = False  # auto modda son yoklama sonucu (injection thread'i)
+        self._grab_checked = 0.0
+        self._buttons_held = set()  # auto modda basılı düğmeler (injection thread'i)
         self.running = True
         
         # Ekran bilgileri
@@ -28,17 +68,26 @@ class SynergyClient:
         self.server_screen_width = 1920  # Varsayılan
         self.server_screen_height = 1080
         
+        # Kenar izleyici: bağlantı süresince tek thread, kontrol yokken uyur
+        self.edge_monitor = EdgeMonitor(self.input_handler.get_mouse_position,
+                                        lambda: (self.screen_width, self.screen_height),
+                                        self._on_edge, name="client-edge")
+        
         # GUI
         self.root = None
         self.status_label = None
         self.server_ip_entry = None
         self.server_port_entry = None
         self.log_text = None
+        self.log_ring = LogRing()
+        self.logger = Logger("client", sink=self._write_log)
+        self.loop_monitor = LoopMonitor(logger=self.logger)
+        self.log_flusher = None
         self.connect_button = None
         self.disconnect_button = None
         
-        print(f"💻 Client Platform: {platform.system()}")
-        print(f"📱 Client Ekran: {self.screen_width}x{self.screen_height}")
+        self.logger.info("💻 Client Platform: %s", platform.system())
+        self.logger.info("📱 Client Ekran: %dx%d", self.screen_width, self.screen_height)
 
     def create_gui(self):
         """GUI oluştur"""
@@ -85,7 +134,8 @@ class SynergyClient:
         ttk.Button(control_buttons_frame, text="Kontrolü Al", command=self._take_control_gui).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(control_buttons_frame, text="Kontrolü Geri Ver", command=self._release_control_gui).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(control_buttons_frame, text="Mouse Test", command=self._mouse_test_gui).pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Button(control_buttons_frame, text="Durum", command=self._show_status_gui).pack(side=tk.LEFT)
+        ttk.Button(control_buttons_frame, text="Durum", command=self._show_status_gui).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(control_buttons_frame, text="Profil", command=self.toggle_profiler).pack(side=tk.LEFT)
         
         # Durum
         status_frame = ttk.LabelFrame(main_frame, text="Durum", padding="10")
@@ -100,6 +150,8 @@ class SynergyClient:
         
         self.log_text = scrolledtext.ScrolledText(log_frame, height=15, width=70)
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.log_flusher = GuiLogFlusher(self.root, self.log_text, self.log_ring)
+        self.log_flusher.start()
         
         # Grid weights
         self.root.columnconfigure(0, weight=1)
@@ -117,11 +169,17 @@ class SynergyClient:
         self.log(f"📱 Ekran çözünürlüğü: {self.screen_width}x{self.screen_height}")
 
     def log(self, message):
-        """Log mesajı ekle"""
-        if self.log_text:
-            self.log_text.insert(tk.END, f"{time.strftime('%H:%M:%S')} - {message}\n")
-            self.log_text.see(tk.END)
-        print(message)
+        """Log mesajı ekle (her thread'den çağrılabilir; GUI toplu olarak güncellenir)"""
+        self.logger.info(message)
+
+    def _write_log(self, level, message):
+        """Logger çıktısını halkaya ve stdout'a yazar."""
+        line = f"{time.strftime('%H:%M:%S')} - {message}"
+        self.log_ring.append(line)
+        if self.headless:
+            print(line, flush=True)
+        else:
+            print(message)
 
     def _connect_gui(self):
         """GUI'den bağlantı başlat"""
@@ -150,17 +208,21 @@ class SynergyClient:
             finally:
                 loop.close()
                 # GUI'yi güncelle
-                self.root.after(0, self._update_connection_status_disconnected)
+                self._gui_call(self._update_connection_status_disconnected)
         
         thread = threading.Thread(target=connect_async, daemon=True)
         thread.start()
 
     def _disconnect_gui(self):
         """GUI'den bağlantıyı kes"""
+        self.stop()
+        self._update_connection_status_disconnected()
+
+    def stop(self):
+        """Bağlantıyı kapat ve client'ı durdur (herhangi bir thread'den)"""
         self.running = False
         if self.websocket:
-            asyncio.create_task(self.websocket.close())
-        self._update_connection_status_disconnected()
+            self._run_coroutine(self.websocket.close())
 
     def _take_control_gui(self):
         """GUI'den kontrolü al"""
@@ -171,9 +233,10 @@ class SynergyClient:
     def _release_control_gui(self):
         """GUI'den kontrolü geri ver"""
         if self.websocket and self.controlling:
-            asyncio.create_task(self.return_control())
+            self._run_coroutine(self.return_control())
         else:
             self.controlling = False
+            self.edge_monitor.deactivate()
             self.log("🔄 Kontrol bırakıldı (Manuel)")
 
     def _mouse_test_gui(self):
@@ -193,6 +256,14 @@ class SynergyClient:
         self.log(f"📊 Durum: {status}")
         self.log(f"🔗 Bağlantı: {connection}")
         self.log(f"📱 Ekran: {self.screen_width}x{self.screen_height}")
+        stats = self.injector.stats()
+        self.log(f"💉 Enjeksiyon kuyruğu: {stats['depth']} bekleyen, {stats['processed']} işlenen, "
+                 f"{stats['coalesced']} birleştirilen, {stats['dropped']} düşürülen")
+        if self.jitter_buffer is not None:
+            stats = self.jitter_buffer.stats()
+            self.log(f"📶 Jitter buffer: {stats['delay_ms']:.1f}ms gecikme, {stats['played']} oynatılan, "
+                     f"{stats['skipped']} atlanan, {stats['late']} geç kalan")
+        self.log(self.latency.report())
 
     def _update_connection_status_connected(self):
         """Bağlantı durumunu güncelle - bağlı"""
@@ -213,24 +284,118 @@ class SynergyClient:
         self.running = False
         if self.websocket:
             try:
-                asyncio.create_task(self.websocket.close())
+                self._run_coroutine(self.websocket.close())
             except:
                 pass
         self.root.destroy()
 
+    def dump_latency(self):
+        """Aşama gecikme raporunu logla; latency_dump_path verildiyse JSON olarak yaz"""
+        self.log(self.latency.report())
+        self.log(self.loop_monitor.report())
+        if self.latency_dump_path:
+            try:
+                self.latency.dump(self.latency_dump_path)
+                self.log(f"💾 Gecikme histogramları yazıldı: {self.latency_dump_path}")
+            except OSError as e:
+                self.logger.warning("⚠️ Gecikme histogramları yazılamadı: %s", e)
+
+    def toggle_profiler(self, action="toggle", mode=None):
+        """Çalışırken profili aç/kapat (GUI, SIGUSR2 veya 'profile' kontrol mesajı)"""
+        self.log(self.profiler.handle_command(action, mode))
+
+    def write_trace(self):
+        """Tracing açıksa olayları (server saatine hizalanmış) Chrome trace dosyasına yaz"""
+        if tracer.enabled and tracer.path:
+            try:
+                self.log(f"🧵 Trace yazıldı: {tracer.write()}")
+            except OSError as e:
+                self.logger.warning("⚠️ Trace yazılamadı: %s", e)
+
+    def _gui_call(self, callback):
+        """GUI varsa callback'i Tk thread'inde çalıştır"""
+        if self.root:
+            self.root.after(0, callback)
+
+    def _run_coroutine(self, coro):
+        """Herhangi bir thread'den coroutine'i bağlantı loop'unda çalıştır"""
+        if self.loop and self.loop.is_running():
+            asyncio.run_coroutine_threadsafe(coro, self.loop)
+        else:
+            coro.close()
+
+    def _setup_metrics(self):
+        """Scrape anında hesaplanan göstergeleri kaydet"""
+        def receive_queue():
+            # websockets'in okunmayı bekleyen mesaj kuyruğu (sürüme göre olmayabilir)
+            return len(getattr(self.websocket, "messages", ())) if self.websocket else 0
+
+        self.metrics.gauge("connected", "Server'a bağlı mı (1/0)", lambda: int(self.connected))
+        self.metrics.gauge("controlling", "Kontrol bu client'ta mı (1/0)",
+                           lambda: int(self.controlling))
+        self.metrics.gauge("receive_queue_depth", "İşlenmeyi bekleyen gelen mesajlar", receive_queue)
+        self.metrics.gauge("injection_queue_depth", "Enjeksiyon kuyruğunda bekleyen olaylar",
+                           lambda: self.injector.depth)
+        self.metrics.gauge("injection_coalesced_total", "Birleştirilen (atlanan) mouse hareketleri",
+                           lambda: self.injector.coalesced, kind="counter")
+        self.metrics.gauge("injection_dropped_total", "Kuyruk dolu olduğu için düşürülen olaylar",
+                           lambda: self.injector.dropped, kind="counter")
+        self.metrics.gauge("loop_lag_max_seconds", "En yüksek asyncio loop gecikmesi",
+                           lambda: self.loop_monitor.max_lag_ns / 1e9)
+        self.metrics.gauge("loop_stalls", "Eşiği aşan loop tıkanmaları",
+                           lambda: self.loop_monitor.stall_count)
+
+    def _stop_motion(self):
+        if self.jitter_buffer is not None:
+            self.jitter_buffer.stop()
+        if self.extrapolator is not None:
+            self.extrapolator.stop()
+
+    async def _start_metrics_endpoint(self):
+        """metrics_port verildiyse çalışan loop'ta /metrics sun; başlatıldıysa True döner"""
+        if not self.metrics_port or self._metrics_endpoint:
+            return False
+        endpoint = MetricsEndpoint(self.metrics, self.metrics_port)
+        try:
+            await endpoint.start()
+        except OSError as e:
+            self.logger.warning("⚠️ Metrik uç noktası başlatılamadı: %s", e)
+            return False
+        self._metrics_endpoint = endpoint
+        self.log(f"📈 Metrikler: http://{endpoint.host}:{self.metrics_port}/metrics")
+        return True
+
+    async def _stop_metrics_endpoint(self):
+        if self._metrics_endpoint:
+            await self._metrics_endpoint.stop()
+            self._metrics_endpoint = None
+
     async def connect_to_server(self):
         """Server'a bağlan"""
+        # Headless modda uç nokta kalıcı loop'ta zaten açık; GUI'de bağlantı süresince açılır
+        own_endpoint = await self._start_metrics_endpoint()
         try:
             self.log(f"🔗 Server'a bağlanılıyor: {self.server_host}:{self.server_port}")
+            self.loop = asyncio.get_running_loop()
+            self.loop_monitor.start()
+            self._connect_attempts += 1
+            if self._connect_attempts > 1:
+                self.metrics.reconnects += 1
             
             self.websocket = await websockets.connect(f"ws://{self.server_host}:{self.server_port}")
             self.connected = True
+            self.edge_monitor.start()
+            self.metrics.add_peer(self, f"{self.server_host}:{self.server_port}")
+            if self.startup_profile:
+                self.startup_profile.finish("connected")
             
             self.log("✅ Server'a bağlandı!")
-            self.root.after(0, self._update_connection_status_connected)
+            self._gui_call(self._update_connection_status_connected)
             
             # Client bilgilerini gönder
             await self.send_client_info()
+            if tracer.enabled:
+                asyncio.ensure_future(self._sync_trace_clock())
             
             # Mesaj dinleme döngüsü
             await self.message_loop()
@@ -238,6 +403,26 @@ class SynergyClient:
         except Exception as e:
             self.log(f"❌ Bağlantı hatası: {e}")
             self.connected = False
+        finally:
+            # Bağlantı yoksa kontrol de yok; izleyici thread'i bağlantıyla birlikte kapanır
+            self.controlling = False
+            self.edge_monitor.stop()
+            self.loop_monitor.stop()
+            if own_endpoint:
+                await self._stop_metrics_endpoint()
+
+    async def send_message(self, message):
+        """Server'a mesaj gönder ve sayaçları güncelle"""
+        payload = json.dumps(message)
+        try:
+            await self.websocket.send(payload)
+        except Exception:
+            self.metrics.send_errors += 1
+            raise
+        if self.metrics.enabled:
+            self.metrics.bytes_out[self] += len(payload)
+            events = self.metrics.events_out
+            events[message['type'] if message['type'] in events else 'other'] += 1
 
     async def send_client_info(self):
         """Client bilgilerini server'a gönder"""
@@ -251,24 +436,50 @@ class SynergyClient:
             'platform': platform.system()
         }
         
-        await self.websocket.send(json.dumps(message))
+        await self.send_message(message)
         self.log(f"📤 Client bilgisi gönderildi: {self.screen_width}x{self.screen_height}")
 
+    async def _sync_trace_clock(self):
+        """Trace zaman çizelgelerini hizalamak için server saatine göre farkı ölç"""
+        for _ in range(CLOCK_SYNC_SAMPLES):
+            if not self.connected:
+                return
+            await self.send_message({'type': 'trace_sync', 't0': perf_counter_ns()})
+            await asyncio.sleep(CLOCK_SYNC_INTERVAL)
+        if tracer.clock.rtt_ns is not None:
+            self.log(f"🕒 Saat farkı: {tracer.clock.offset_ns / 1e6:+.3f}ms "
+                     f"(RTT {tracer.clock.rtt_ns / 1e6:.3f}ms, {tracer.clock.samples} örnek)")
+
     async def message_loop(self):
         """Server'dan gelen mesajları dinle"""
         try:
+            decode_latency = self.latency.stage("decode")
+            dispatch_latency = self.latency.stage("dispatch")
+            metrics = self.metrics
+            events = metrics.events_in
             async for message in self.websocket:
                 try:
+                    received = perf_counter_ns()
                     data = json.loads(message)
+                    decoded = perf_counter_ns()
+                    decode_latency.record(decoded - received)
+                    msg_type = data.get('type')
+                    if metrics.enabled:
+                        metrics.bytes_in[self] += len(message)
+                        events[msg_type if msg_type in events else 'other'] += 1
                     await self.handle_server_message(data)
+                    dispatch_latency.record(perf_counter_ns() - decoded)
+                    if tracer.enabled and 'event_id' in data:
+                        tracer.span(f"receive:{msg_type}", received, event_id=data['event_id'])
+                        tracer.flow_end(data['event_id'], received)
                 except json.JSONDecodeError:
-                    self.log(f"⚠️ Geçersiz JSON: {message}")
+                    self.logger.warning("⚠️ Geçersiz JSON: %.200s", message, every=1.0)
                 except Exception as e:
-                    self.log(f"⚠️ Mesaj işleme hatası: {e}")
+                    self.logger.warning("⚠️ Mesaj işleme hatası: %s", e, every=1.0)
         except websockets.exceptions.ConnectionClosed:
             self.log("❌ Server bağlantısı kesildi")
             self.connected = False
-            self.root.after(0, self._update_connection_status_disconnected)
+            self._gui_call(self._update_connection_status_disconnected)
 
     async def handle_server_message(self, data):
         """Server mesajlarını işle"""
@@ -276,106 +487,309 @@ class SynergyClient:
         
         if msg_type == 'take_control':
             # Kontrol al
+            if not self.controlling:
+                self.metrics.control_switches += 1
             self.controlling = True
             reason = data.get('reason', 'unknown')
-            self.log(f"🎮 Kontrol alındı! Sebep: {reason}")
+            self.logger.info("🎮 Kontrol alındı! Sebep: %s", reason)
+            if self.extrapolator is not None:
+                self.extrapolator.reset()
             
             # Eğer mouse pozisyonu belirtilmişse, mouse'u o pozisyona taşı
             if 'mouse_x' in data and 'mouse_y' in data:
                 mouse_x = data['mouse_x']
                 mouse_y = data['mouse_y']
-                self.log(f"🖱️ Mouse pozisyonu ayarlanıyor: ({mouse_x}, {mouse_y})")
+                self.logger.debug("🖱️ Mouse pozisyonu ayarlanıyor: (%s, %s)", mouse_x, mouse_y)
                 
                 # Mouse'u belirtilen pozisyona taşı
-                success = self.input_handler.move_mouse(mouse_x, mouse_y)
+                warp_ns = perf_counter_ns()
+                success = await self.injector.run(self.input_handler.move_mouse, mouse_x, mouse_y)
+                if tracer.enabled:
+                    tracer.span("cursor_warp", warp_ns, event_id=data.get('event_id'),
+                                x=mouse_x, y=mouse_y, ok=bool(success))
                 if success:
-                    self.log(f"✅ Mouse başarıyla taşındı: ({mouse_x}, {mouse_y})")
+                    self.logger.debug("✅ Mouse başarıyla taşındı: (%s, %s)", mouse_x, mouse_y)
                 else:
-                    self.log(f"❌ Mouse taşıma başarısız: ({mouse_x}, {mouse_y})")
+                    self.logger.warning("❌ Mouse taşıma başarısız: (%s, %s)", mouse_x, mouse_y, every=1.0)
             
             # Kenar algılama başlat
             self.start_edge_detection()
             
         elif msg_type == 'release_control':
             # Kontrol bırak
+            if self.controlling:
+                self.metrics.control_switches += 1
             self.controlling = False
+            self.edge_monitor.deactivate()
             reason = data.get('reason', 'unknown')
-            self.log(f"🔄 Kontrol bırakıldı! Sebep: {reason}")
+            self.logger.info("🔄 Kontrol bırakıldı! Sebep: %s", reason)
+            if self.extrapolator is not None:
+                self.extrapolator.reset()
+            
+        elif msg_type == 'profile':
+            # Server'dan gelen profil komutu; dosya yazımı loop'u bloklamasın
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.toggle_profiler, data.get('action', 'toggle'), data.get('mode'))
+            
+        elif msg_type == 'trace_sync':
+            tracer.clock.add_sample(data['t0'], data['t1'], data['t2'], perf_counter_ns())
+            
+        # Enjeksiyonlar injection thread'inde sırayla çalışır; loop sadece kuyruğa ekler
+        elif msg_type == MessageType.MOUSE_MOVE.value:
+            if self.motion_trace is not None and 'ts' in data:
+                self.motion_trace.append((data['ts'] * 1000, perf_counter_ns(), data['x'], data['y']))
+            if self.relative_mouse != "off" and 'dx' in data:
+                self._inject_relative(data)
+            else:
+                self._inject(data, True, self.input_handler.simulate_mouse_move, data['x'], data['y'])
+            
+        elif msg_type == MessageType.MOUSE_CLICK.value:
+            if self.relative_mouse != "off":
+                self._inject(data, False, self._click_in_place,
+                             data['x'], data['y'], data['button'], data['pressed'])
+            else:
+                self._inject(data, False, self.input_handler.simulate_mouse_click,
+                             data['x'], data['y'], data['button'], data['pressed'])
+            
+        elif msg_type == MessageType.MOUSE_SCROLL.value:
+            if self.relative_mouse != "off":
+                self._inject(data, False, self._in_place, self.input_handler.simulate_mouse_scroll,
+                             data['x'], data['y'], data['dx'], data['dy'])
+            else:
+                self._inject(data, False, self.input_handler.simulate_mouse_scroll,
+                             data['x'], data['y'], data['dx'], data['dy'])
+            
+        elif msg_type in (MessageType.KEY_PRESS.value, MessageType.KEY_RELEASE.value):
+            self._inject(data, False, self.input_handler.simulate_key_press,
+                         data['key'], msg_type == MessageType.KEY_PRESS.value)
+
+    def _inject(self, data, coalescable, func, *args):
+        """Olayı jitter buffer açıksa ona, değilse doğrudan enjeksiyon kuyruğuna ver"""
+        if self.jitter_buffer is not None:
+            self.jitter_buffer.push(data.get('ts'), coalescable, func, args)
+        elif coalescable and self.extrapolator is not None:
+            # Buffer yokken kareler kümeler halinde gelebilir; hız gönderen damgasından hesaplanır
+            sender_us = data.get('ts')
+            self.extrapolator.feed(*args, sender_ns=sender_us * 1000 if sender_us else None)
+        else:
+            self._inject_now(func, args, coalescable)
+
+    def _inject_now(self, func, args, coalescable):
+        if not coalescable:
+            self.injector.submit(func, *args)
+        elif self.extrapolator is not None:
+            self.extrapolator.feed(*args)  # Tahmin/uzlaştırma sonrası konum sink'ten kuyruğa gider
+        else:
+            self.injector.submit_move(func, *args)
+
+    def _inject_relative(self, data):
+        """Göreli mod: server deltaları ölçeklenmeden, her mesaj ayrı enjekte edilir.
+
+        Worker geride kalırsa bekleyen göreli hareketin deltalarına eklenir;
+        toplam hareket hiçbir zaman kaybolmaz.
+        """
+        if self.relative_mouse == "on":
+            func, args = self.input_handler.simulate_relative_move, ()
+        else:
+            func, args = self._move_auto, (data['x'], data['y'])
+        if self.jitter_buffer is not None:
+            self.jitter_buffer.push(data.get('ts'), False, func, (data['dx'], data['dy']) + args)
+        else:
+            self.injector.submit_relative(func, data['dx'], data['dy'], *args)
+
+    def _relative_now(self):
+        """Injection thread'inden: şu an göreli enjeksiyon mu kullanılmalı?"""
+        if self.relative_mouse != "auto":
+            return self.relative_mouse == "on"
+        if self._buttons_held:
+            # Sürüklemede X örtük grab tutar; mod sürükleme ortasında değişmesin
+            return self._pointer_grabbed
+        now = time.monotonic()
+        if now - self._grab_checked >= GRAB_CHECK_INTERVAL:
+            self._grab_checked = now
+            grabbed = bool(self.input_handler.pointer_grabbed())
+            if grabbed != self._pointer_grabbed:
+                self._pointer_grabbed = grabbed
+                self.logger.info("🎮 İşaretçi %s: %s hareket", "yakalandı" if grabbed else "bırakıldı",
+                                 "göreli" if grabbed else "mutlak")
+        return self._pointer_grabbed
+
+    def _move_auto(self, dx, dy, x, y):
+        if self._relative_now():
+            self.input_handler.simulate_relative_move(dx, dy)
+        else:
+            self.input_handler.simulate_mouse_move(x, y)
+
+    def _click_in_place(self, x, y, button, pressed):
+        self._in_place(self.input_handler.simulate_mouse_click, x, y, button, pressed)
+        if pressed:
+            self._buttons_held.add(button)
+        else:
+            self._buttons_held.discard(button)
+
+    def _in_place(self, func, x, y, *args):
+        """Göreli modda tıklama/kaydırma imleci taşımaz; uygulamanın tuttuğu konumda yapılır"""
+        if self._relative_now():
+            x, y = self.input_handler.get_mouse_position()
+        func(x, y, *args)
+
+    def _submit_predicted_move(self, x, y):
+        self.injector.submit_move(self.input_handler.simulate_mouse_move, x, y)
+
+    def enable_prediction(self, lead_ms=0.0, max_distance_px=None):
+        """Kare geciktiğinde imleci son hız/ivmeden tahmin edilen konuma taşı"""
+        kwargs = {'lead_ms': lead_ms}
+        if max_distance_px is not None:
+            kwargs['max_distance_px'] = max_distance_px
+        self.extrapolator = Extrapolator(self._submit_predicted_move, MotionPredictor(**kwargs))
+        self.extrapolator.start()
+        self.metrics.gauge("motion_predictions_total", "Kare gecikince gösterilen tahmini konumlar",
+                           lambda: self.extrapolator.predictor.predictions, kind="counter")
+
+    def record_motion(self, path):
+        """Gelen hareketleri kapanışta `motion.py evaluate` için path'e yaz"""
+        self.motion_trace = deque(maxlen=MOTION_TRACE_CAPACITY)
+        self.motion_trace_path = path
+
+    def write_motion_trace(self):
+        if self.motion_trace and self.motion_trace_path:
+            try:
+                save_trace(self.motion_trace, self.motion_trace_path)
+                self.log(f"🖱️ Hareket izi yazıldı: {self.motion_trace_path} ({len(self.motion_trace)} kare)")
+            except OSError as e:
+                self.logger.warning("⚠️ Hareket izi yazılamadı: %s", e)
+
+    def enable_jitter_buffer(self, min_delay_ms=None, max_delay_ms=None):
+        """Gelen olayları gönderen zaman damgalarına göre orijinal aralıklarıyla oynat"""
+        kwargs = {}
+        if min_delay_ms is not None:
+            kwargs['min_delay_ms'] = min_delay_ms
+        if max_delay_ms is not None:
+            kwargs['max_delay_ms'] = max_delay_ms
+        self.jitter_buffer = JitterBuffer(self._inject_now, **kwargs)
+        self.jitter_buffer.start()
+        self.metrics.gauge("jitter_buffer_delay_seconds", "Jitter buffer'ın eklediği hedef gecikme",
+                           lambda: self.jitter_buffer.delay_ns / 1e9)
+        self.metrics.gauge("jitter_buffer_late_total", "Oynatma anını kaçıran olaylar",
+                           lambda: self.jitter_buffer.late, kind="counter")
 
     def start_edge_detection(self):
-        """Kenar algılama başlat"""
-        def edge_detection_thread():
-            last_pos = None
-            edge_threshold = 5
-            
-            while self.controlling and self.running:
-                try:
-                    # Mouse pozisyonunu al
-                    current_pos = self.input_handler.get_mouse_position()
-                    if current_pos is None:
-                        time.sleep(0.1)
-                        continue
-                    
-                    x, y = current_pos
-                    
-                    # Kenar kontrolü
-                    at_left_edge = x <= edge_threshold
-                    at_right_edge = x >= self.screen_width - edge_threshold
-                    at_top_edge = y <= edge_threshold
-                    at_bottom_edge = y >= self.screen_height - edge_threshold
-                    
-                    # Eğer kenardaysa ve hareket ettiyse
-                    if (at_left_edge or at_right_edge or at_top_edge or at_bottom_edge):
-                        if last_pos and current_pos != last_pos:
-                            self.log(f"🎯 Client kenar algılandı: ({x}, {y})")
-                            
-                            # Server'a kontrol geri ver
-                            asyncio.create_task(self.return_control())
-                            break
-                    
-                    last_pos = current_pos
-                    time.sleep(0.05)
-                    
-                except Exception as e:
-                    self.log(f"⚠️ Kenar algılama hatası: {e}")
-                    time.sleep(1)
-        
-        # Thread başlat
-        edge_thread = threading.Thread(target=edge_detection_thread, daemon=True)
-        edge_thread.start()
+        """Kenar algılamayı etkinleştir (izleyici thread'i bağlantı boyunca açık kalır)"""
+        self.edge_monitor.activate()
+
+    def _on_edge(self, x, y):
+        """Kenar izleyici thread'inden: kontrolü server'a geri ver"""
+        if not self.controlling or not self.running:
+            return
+        edge_ns = perf_counter_ns()
+        self.logger.info("🎯 Client kenar algılandı: (%d, %d)", x, y, every=1.0)
+        event_id = tracer.new_event_id() if tracer.enabled else None
+        self._run_coroutine(self.return_control(event_id))
+        if tracer.enabled:
+            tracer.span("edge_detection", edge_ns, event_id=event_id, x=x, y=y)
 
-    async def return_control(self):
-        """Kontrolü server'a geri ver"""
+    async def return_control(self, event_id=None):
+        """Kontrolü server'a geri ver (event_id: tracing açıksa olay kimliği)"""
         if not self.websocket or not self.controlling:
             return
             
         self.controlling = False
+        self.edge_monitor.deactivate()
+        self.metrics.control_switches += 1
         
         message = {
             'type': 'control_returned',
             'reason': 'edge_detection'
         }
+        if event_id:
+            message['event_id'] = event_id
         
         try:
-            await self.websocket.send(json.dumps(message))
+            start = perf_counter_ns()
+            await self.send_message(message)
+            if tracer.enabled and event_id:
+                tracer.span("send:control_returned", start, event_id=event_id)
+                tracer.flow_start(event_id, start)
             self.log("📤 Kontrol server'a geri verildi")
         except Exception as e:
             self.log(f"⚠️ Kontrol geri verme hatası: {e}")
 
-    def run(self):
+    def run(self, autoconnect=False):
         """Client'ı çalıştır"""
         # Input handler'ı başlat
         if not self.input_handler.start():
-            print("❌ Input handler başlatılamadı!")
+            self.logger.error("❌ Input handler başlatılamadı!")
             return
+        if self.startup_profile:
+            self.startup_profile.mark("input_handler")
         
         # GUI oluştur ve çalıştır
         self.create_gui()
+        if self.startup_profile:
+            self.startup_profile.mark("gui")
+        if autoconnect:
+            self.root.after(0, self._connect_gui)
+        if hasattr(signal, "SIGUSR2"):
+            # Çalışırken profil aç/kapat: kill -USR2 <pid>
+            signal.signal(signal.SIGUSR2, lambda signum, frame: self.toggle_profiler())
         self.root.mainloop()
         
         # Temizlik
         self.running = False
+        self._stop_motion()
+        self.injector.shutdown()
         self.input_handler.stop()
+        self.dump_latency()
+        self.write_trace()
+        self.write_motion_trace()
+
+    def run_headless(self):
+        """GUI olmadan client'ı çalıştır; bağlantı koparsa yeniden bağlanır"""
+        self.headless = True
+        if not self.input_handler.start():
+            self.logger.error("❌ Input handler başlatılamadı!")
+            return
+        if self.startup_profile:
+            self.startup_profile.mark("input_handler")
+        try:
+            asyncio.run(self._run_headless())
+        finally:
+            self.running = False
+            self._stop_motion()
+            self.injector.shutdown()
+            self.input_handler.stop()
+            self.dump_latency()
+            self.write_trace()
+            self.write_motion_trace()
+
+    async def _run_headless(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._on_signal, sig)
+            except (NotImplementedError, RuntimeError):
+                # Windows: loop sinyal işleyicisi desteklemiyor
+                signal.signal(sig, lambda signum, frame: self._on_signal(signum))
+        if hasattr(signal, "SIGUSR1"):
+            # Çalışırken gecikme raporu: kill -USR1 <pid>
+            loop.add_signal_handler(signal.SIGUSR1, lambda: self.log(self.latency.report()))
+            # Profil aç/kapat: kill -USR2 <pid> (dosya yazımı loop'u bloklamasın)
+            loop.add_signal_handler(signal.SIGUSR2, lambda: loop.run_in_executor(None, self.toggle_profiler))
+        await self._start_metrics_endpoint()
+        
+        try:
+            while self.running:
+                await self.connect_to_server()
+                if self.running:
+                    self.log(f"🔁 {self.reconnect_delay:.0f} saniye sonra yeniden bağlanılacak...")
+                    await asyncio.sleep(self.reconnect_delay)
+        finally:
+            await self._stop_metrics_endpoint()
+        self.log("👋 Client kapatıldı")
+
+    def _on_signal(self, signum):
+        self.log(f"🛑 Sinyal alındı ({signal.Signals(signum).name}), client kapatılıyor...")
+        self.stop()
 
 if __name__ == "__main__":
     client = SynergyClient()
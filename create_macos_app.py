@@ -82,6 +82,17 @@ if __name__ == "__main__":
         'client.py', 
         'utils.py',
         'input_handler.py',
+        'input_backend.py',
+        'profiler.py',
+        'logs.py',
+        'metrics.py',
+        'tracing.py',
+        'loop_monitor.py',
+        'injection.py',
+        'edge.py',
+        'cursor_lock.py',
+        'motion.py',
+        'recording.py',
         'run_server.py',
         'run_client.py'
     ]
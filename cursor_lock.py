@@ -0,0 +1,90 @@
+"""
+SynergyClone imleç kilidi - kontrol client'tayken server imlecini gizleyip ekran
+ortasına sabitler ve yakalanan hareketleri göreli (delta) olarak okur
+"""
+
+import threading
+
+from logs import get_logger
+
+log = get_logger("input")
+
+WARP_MARGIN_RATIO = 0.25    # İmleç ortadan ekranın bu oranı kadar uzaklaşınca geri ışınlanır
+
+
+class CursorLock:
+    """Kontrol client'a geçince server imlecini kilitler (orijinal Synergy gibi).
+
+    engage() imlecin konumunu saklar, imleci gizler ve ekran ortasına ışınlar.
+    Sonraki capture olaylarının konumu delta()'ya verilir; delta bir önceki
+    olaya göre hesaplanır, böylece imleç ekran kenarına dayanmadan her yönde
+    hareket okunur. Işınlama her olayda değil, imleç ortadan margin kadar
+    uzaklaştığında bir kez yapılır (olay grubu başına bir OS çağrısı).
+    Işınlamadan önce üretilip sonra teslim edilen olaylar için eski konum ve
+    orta nokta referanslarından küçük deltayı veren seçilir. release()
+    imleci gösterir ve tam olarak saklanan konuma geri koyar.
+    """
+
+    def __init__(self, backend, screen_size, margin: int = None):
+        self.backend = backend
+        self.width, self.height = screen_size
+        self.center = (self.width // 2, self.height // 2)
+        self.margin = margin or int(min(self.width, self.height) * WARP_MARGIN_RATIO)
+        self.engaged = False
+        self.saved = None  # engage() anındaki konum; release() buraya geri koyar
+        self.hidden = False
+        self.warps = 0
+        self.events = 0
+        self._last = self.center
+        self._warp_pending = False
+        self._lock = threading.Lock()
+
+    def engage(self):
+        """Konumu sakla, imleci gizle ve ortaya ışınla"""
+        with self._lock:
+            if self.engaged:
+                return
+            self.saved = self.backend.get_mouse_position()
+            self.hidden = bool(self.backend.hide_cursor())
+            self.engaged = True
+            self._last = self.saved or self.center
+            self._warp()
+        log.debug("🔒 İmleç kilitlendi: %s saklandı, gizli=%s", self.saved, self.hidden)
+
+    def release(self):
+        """İmleci göster ve saklanan konuma geri koy"""
+        with self._lock:
+            if not self.engaged:
+                return
+            self.engaged = False
+            if self.hidden:
+                self.backend.show_cursor()
+                self.hidden = False
+            if self.saved is not None:
+                self.backend.move_mouse(*self.saved)
+        log.debug("🔓 İmleç kilidi açıldı: %s", self.saved)
+
+    def _warp(self):
+        """Kilit altında: imleci ortaya ışınla"""
+        self.backend.move_mouse(*self.center)
+        self.warps += 1
+        self._warp_pending = True
+
+    def delta(self, x: int, y: int):
+        """Capture konumundan göreli hareket (dx, dy); gerekiyorsa ortaya ışınlar"""
+        with self._lock:
+            if not self.engaged:
+                return 0, 0
+            self.events += 1
+            dx, dy = x - self._last[0], y - self._last[1]
+            if self._warp_pending:
+                cx, cy = x - self.center[0], y - self.center[1]
+                if abs(cx) + abs(cy) <= abs(dx) + abs(dy):
+                    # Işınlamadan sonraki ilk olay: referans artık orta nokta
+                    dx, dy = cx, cy
+                    self._warp_pending = False
+            self._last = (x, y)
+            if not self._warp_pending and (abs(x - self.center[0]) > self.margin or
+                                           abs(y - self.center[1]) > self.margin):
+                self._warp()
+            return dx, dy
@@ -0,0 +1,319 @@
+"""
+SynergyClone kenar algılama - capture olay akışından kenar geçişi kararı (server)
+ve süreç başına tek, kalıcı kenar izleyici thread'i (client)
+"""
+
+import argparse
+import sys
+import threading
+from collections import deque
+
+from logs import get_logger
+
+log = get_logger("edge")
+
+EDGE_POLL_INTERVAL = 0.05   # Kontroldeyken imleç konumunun okunma aralığı (saniye)
+EDGE_THRESHOLD = 5          # Kenardan kaç pixel içeride algılansın
+ERROR_BACKOFF = 1.0         # Konum okuma hatasından sonra bekleme (saniye)
+
+EDGES = ("left", "right", "top", "bottom")
+MIN_PUSH_VELOCITY = 400.0   # Kenara doğru bu hızdan (px/s) hızlı itiş hemen geçiş yapar
+DWELL_MS = 250.0            # Daha yavaş yaklaşımda kenarda bu kadar kalınırsa geçiş yapılır
+CORNER_PX = 40              # Köşelerden bu mesafe içinde geçiş yapılmaz (hot corner hareketleri)
+HYSTERESIS_PX = 24          # Geçiş/geri dönüşten sonra yeniden kurulmak için kenardan uzaklaşma
+VELOCITY_WINDOW_MS = 50.0   # Hız tahmininde kullanılan son örneklerin süresi
+
+
+class EdgeDetector:
+    """Capture olay akışından kenar geçişi kararı veren durum makinesi.
+
+    Her kenarın kendi eşiği vardır (None: o kenardan geçiş yok). Eşik
+    bandına girmek tek başına yetmez; imleç kenara doğru en az
+    min_velocity px/s hızla itilmeli ya da en dış piksele dwell_ms kadar
+    dayalı kalmalıdır. İmleç kenarda durunca yeni olay gelmez; bekleme
+    geçişi için çağıran dwell_deadline anında check_dwell() çağırmalıdır.
+    Köşelere corner_px kadar yakın noktalar ve bir mouse düğmesi basılıyken
+    (pencere boyutlandırma/sürükleme) geçiş yapılmaz. Geçişten veya disarm()
+    çağrısından sonra detektör, imleç tüm kenarlardan eşik + hysteresis_px
+    uzaklaşana kadar kapalı kalır; böylece kontrol kenarda geri dönünce
+    hemen tekrar el değiştirmez. Thread güvenli değildir; birden fazla
+    thread'den çağrılıyorsa çağıran kilitlemelidir.
+    """
+
+    def __init__(self, width: int, height: int, thresholds=None,
+                 min_velocity: float = MIN_PUSH_VELOCITY, dwell_ms: float = DWELL_MS,
+                 corner_px: int = CORNER_PX, hysteresis_px: int = HYSTERESIS_PX):
+        self.width = width
+        self.height = height
+        if thresholds is None or isinstance(thresholds, (int, float)):
+            thresholds = dict.fromkeys(EDGES, EDGE_THRESHOLD if thresholds is None else thresholds)
+        self.thresholds = {edge: thresholds.get(edge) for edge in EDGES}
+        self.min_velocity = min_velocity
+        self.dwell_ns = int(dwell_ms * 1e6)
+        self.corner_px = corner_px
+        self.hysteresis_px = hysteresis_px
+        self.buttons = 0
+        self.armed = True
+        self.switches = 0
+        self._samples = deque()   # (t_ns, x, y), son VELOCITY_WINDOW_MS
+        self._zone = None         # İmlecin dayandığı kenar (en dış piksel)
+        self._entered_ns = 0
+
+    def resize(self, width: int, height: int):
+        self.width, self.height = width, height
+
+    def disarm(self):
+        """Kontrol bu tarafa döndü: imleç kenardan uzaklaşana kadar geçiş yapma"""
+        self.armed = False
+        self._zone = None
+        self._samples.clear()
+
+    def button(self, pressed: bool):
+        """Mouse düğmesi durumu; basılıyken (sürükleme) geçiş yapılmaz"""
+        self.buttons = self.buttons + 1 if pressed else max(0, self.buttons - 1)
+        # Sürükleme sırasındaki hız ve kenarda geçen süre bırakıştan sonra sayılmaz
+        self._zone = None
+        self._samples.clear()
+
+    @property
+    def dwell_deadline(self):
+        """İmleç en dış piksele dayalıysa bekleme geçişinin yapılacağı an (ns), değilse None"""
+        if not self.dwell_ns or not self.armed or self._zone is None:
+            return None
+        return self._entered_ns + self.dwell_ns
+
+    def check_dwell(self, t_ns: int):
+        """Yeni olay olmadan: imleç dwell_ns boyunca kenarda durduysa kenar adını döndür"""
+        deadline = self.dwell_deadline
+        if deadline is None or self.buttons or t_ns < deadline:
+            return None
+        edge = self._zone
+        self.switches += 1
+        self.disarm()
+        return edge
+
+    def _zone_at(self, x: int, y: int):
+        """(kenar, kenara uzaklık); bant dışında veya köşe ölü bölgesinde (None, None)"""
+        near_x = x <= self.corner_px or x >= self.width - 1 - self.corner_px
+        near_y = y <= self.corner_px or y >= self.height - 1 - self.corner_px
+        if near_x and near_y:
+            return None, None
+        distances = (("left", x), ("right", self.width - 1 - x),
+                     ("top", y), ("bottom", self.height - 1 - y))
+        for edge, distance in distances:
+            threshold = self.thresholds[edge]
+            if threshold is not None and distance <= threshold:
+                return edge, distance
+        return None, None
+
+    def _clear_of_edges(self, x: int, y: int) -> bool:
+        margin = self.hysteresis_px
+        distances = (("left", x), ("right", self.width - 1 - x),
+                     ("top", y), ("bottom", self.height - 1 - y))
+        return all(distance > (self.thresholds[edge] or 0) + margin for edge, distance in distances)
+
+    def _push_velocity(self, edge: str, t_ns: int, x: int, y: int) -> float:
+        """Son örneklerden kenara doğru hız (px/s)"""
+        t0, x0, y0 = self._samples[0]
+        dt = (t_ns - t0) / 1e9
+        if dt <= 0:
+            return 0.0
+        toward = {"left": x0 - x, "right": x - x0, "top": y0 - y, "bottom": y - y0}[edge]
+        return toward / dt
+
+    def feed(self, t_ns: int, x: int, y: int):
+        """Bir hareket olayını işle; geçiş yapılacaksa kenar adını döndür"""
+        samples = self._samples
+        samples.append((t_ns, x, y))
+        window_ns = VELOCITY_WINDOW_MS * 1e6
+        while len(samples) > 2 and t_ns - samples[1][0] >= window_ns:
+            samples.popleft()
+
+        if not self.armed:
+            if self._clear_of_edges(x, y):
+                self.armed = True
+            return None
+
+        zone, distance = self._zone_at(x, y)
+        # Bekleme süresi yalnızca imleç en dıştaki piksele dayalıyken işler; kenar boyunca
+        # (ör. sekme çubuğunda) gezinmek bekleme sayılmaz
+        pinned = zone if distance == 0 else None
+        if pinned != self._zone:
+            self._zone, self._entered_ns = pinned, t_ns
+        if zone is None or self.buttons:
+            return None
+        pushed = not self.min_velocity or self._push_velocity(zone, t_ns, x, y) >= self.min_velocity
+        dwelled = self.dwell_ns and pinned and t_ns - self._entered_ns >= self.dwell_ns
+        if pushed or dwelled:
+            self.switches += 1
+            self.disarm()
+            return zone
+        return None
+
+
+def parse_thresholds(spec: str):
+    """"5" veya "right=5,left=3,top=off" biçimindeki eşikleri sözlüğe çevir"""
+    if "=" not in spec:
+        return int(spec)
+    thresholds = dict.fromkeys(EDGES)
+    for part in spec.split(","):
+        edge, _, value = part.partition("=")
+        edge = edge.strip()
+        if edge not in EDGES:
+            raise ValueError(f"Bilinmeyen kenar: {edge}")
+        thresholds[edge] = None if value.strip() in ("off", "none", "") else int(value)
+    return thresholds
+
+
+def replay_switches(events, detector: EdgeDetector):
+    """Kayıttaki (t_us, adım) olaylarını detektöre ver; (t_us, kenar, x, y) geçiş listesi.
+
+    Her geçişten sonra kontrolün hemen geri döndüğü varsayılır (disarm);
+    böylece kenarda gidip gelme (ping-pong) de sayılır. Olaylar arasında
+    dolan bekleme süreleri server'daki zamanlayıcı gibi o anda değerlendirilir.
+    """
+    switches = []
+    position = (0, 0)
+    for t_us, step in events:
+        deadline = detector.dwell_deadline
+        if deadline is not None and deadline <= t_us * 1000:
+            edge = detector.check_dwell(deadline)
+            if edge:
+                switches.append((deadline // 1000, edge) + position)
+        kind = step[0]
+        if kind == "move":
+            edge = detector.feed(t_us * 1000, step[1], step[2])
+            position = (step[1], step[2])
+            if edge:
+                switches.append((t_us, edge, step[1], step[2]))
+        elif kind == "click":
+            detector.button(step[4])
+    return switches
+
+
+class EdgeMonitor:
+    """Kontrol bu taraftayken imlecin ekran kenarına gelmesini izleyen tek thread.
+
+    Thread bağlantı kurulunca start() ile bir kez açılır ve bağlantı kopunca
+    stop() ile kapatılır. Kontrol yokken bir Event üzerinde uyur (yoklama
+    yapmaz); activate() onu anında uyandırır. Her aktivasyonda kenar en fazla
+    bir kez bildirilir, ardından izleyici tekrar activate() edilene kadar uyur.
+    Art arda gelen activate/deactivate çağrıları yeni thread açmaz.
+    """
+
+    def __init__(self, get_position, get_screen_size, on_edge,
+                 interval: float = EDGE_POLL_INTERVAL, threshold: int = EDGE_THRESHOLD,
+                 name: str = "edge-monitor"):
+        self.get_position = get_position
+        self.get_screen_size = get_screen_size
+        self.on_edge = on_edge  # on_edge(x, y); izleyici thread'inden çağrılır
+        self.interval = interval
+        self.threshold = threshold
+        self.name = name
+        self.detections = 0
+        self._active = threading.Event()
+        self._stopping = threading.Event()
+        self._generation = 0  # Her aktivasyonda artar; önceki konum unutulur
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def active(self) -> bool:
+        return self._active.is_set()
+
+    def start(self):
+        """İzleyici thread'ini başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        with self._lock:
+            if self.running:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+            self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Thread'i durdur ve bitmesini bekle"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping.set()
+            self._active.set()  # Uyuyan thread'i uyandır
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._active.clear()
+
+    def activate(self):
+        """Kontrol bu tarafa geçti: izlemeye hemen başla"""
+        with self._lock:
+            self._generation += 1
+            self._active.set()
+
+    def deactivate(self):
+        """Kontrol bu taraftan çıktı: bir sonraki yoklamada uykuya dön"""
+        self._active.clear()
+
+    def _edge_at(self, x: int, y: int) -> bool:
+        width, height = self.get_screen_size()
+        threshold = self.threshold
+        return x <= threshold or y <= threshold or x >= width - threshold or y >= height - threshold
+
+    def _run(self):
+        while True:
+            self._active.wait()
+            if self._stopping.is_set():
+                return
+            generation = self._generation
+            last_pos = None
+            while self._active.is_set() and not self._stopping.is_set():
+                if generation != self._generation:
+                    # Uyumadan yeniden aktive edildi: eski konum yeni oturuma ait değil
+                    generation, last_pos = self._generation, None
+                try:
+                    current_pos = self.get_position()
+                    if current_pos is not None:
+                        x, y = current_pos
+                        # Kenardaysa ve hareket ettiyse bir kez bildir
+                        if last_pos and current_pos != last_pos and self._edge_at(x, y):
+                            with self._lock:
+                                if generation == self._generation:
+                                    self._active.clear()
+                            if not self._active.is_set():
+                                self.detections += 1
+                                self.on_edge(x, y)
+                            break
+                        last_pos = current_pos
+                    self._stopping.wait(self.interval)
+                except Exception as e:
+                    log.warning("⚠️ Kenar algılama hatası: %s", e, every=5.0)
+                    self._stopping.wait(ERROR_BACKOFF)
+
+
+def main(argv=None):
+    from recording import Recording
+
+    parser = argparse.ArgumentParser(description="SynergyClone kenar detektörü değerlendirmesi")
+    parser.add_argument("command", choices=["evaluate"], help="evaluate: kayıttaki kenar geçişlerini listele")
+    parser.add_argument("path", help=".synrec kaydı (bkz. run_server.py --record)")
+    parser.add_argument("--threshold", default=str(EDGE_THRESHOLD), help="Eşik: 5 veya right=5,top=off")
+    parser.add_argument("--velocity", type=float, default=MIN_PUSH_VELOCITY, help="En küçük itiş hızı (px/s)")
+    parser.add_argument("--dwell-ms", type=float, default=DWELL_MS, help="Kenarda bekleme (ms)")
+    parser.add_argument("--corner", type=int, default=CORNER_PX, help="Köşe ölü bölgesi (px)")
+    parser.add_argument("--hysteresis", type=int, default=HYSTERESIS_PX, help="Histerezis bandı (px)")
+    args = parser.parse_args(argv)
+
+    with Recording(args.path) as recording:
+        screen = recording.screens[0] if recording.screens else None
+        width, height = (screen.width, screen.height) if screen else (1920, 1080)
+        detector = EdgeDetector(width, height, parse_thresholds(args.threshold), args.velocity,
+                                args.dwell_ms, args.corner, args.hysteresis)
+        switches = replay_switches(recording.events(), detector)
+    for t_us, edge, x, y in switches:
+        print(f"🎯 {t_us / 1e6:9.3f}s {edge:<6} ({x}, {y})")
+    print(f"📊 {len(switches)} geçiş ({width}x{height})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
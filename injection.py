@@ -0,0 +1,148 @@
+"""
+SynergyClone enjeksiyon worker'ı - OS input çağrılarını asyncio loop'u dışında, sıralı bir kuyruktan çalıştırır
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+INJECTION_QUEUE_CAPACITY = 4096  # Kuyruk dolarsa yeni hareketler düşürülür
+PUT_WAIT_TIMEOUT = 0.05  # Dolu kuyrukta tıklama/tuş olayının yer açılmasını bekleme süresi (saniye)
+
+
+class InjectionWorker:
+    """Mouse/klavye enjeksiyonlarını tek bir thread'de, geliş sırasıyla çalıştırır.
+
+    Yavaş bir OS çağrısı (SendInput, XTest, CGEvent, Tk tabanlı yardımcılar)
+    ağ trafiğini işleyen loop'u bloklamaz; loop sadece kuyruğa ekler. Worker
+    geride kaldığında kuyruğun sonunda bekleyen mutlak mouse hareketi yenisiyle
+    değiştirilir (ara konumlar atlanır). Göreli hareketlerde ise bekleyen
+    hareketin deltalarına eklenir, böylece toplam hareket kaybolmaz; tıklama
+    ve tuş olayları arasındaki sıra hiçbir zaman bozulmaz. Kuyruk doluyken
+    gelen tıklama/tuş olayı düşürülmez (bırakma kaybolursa tuş basılı kalır):
+    yerine bekleyen en eski mutlak hareket atılır, o da yoksa kısa süre beklenir.
+    """
+
+    def __init__(self, name: str = "injection", capacity: int = INJECTION_QUEUE_CAPACITY):
+        self.capacity = capacity
+        self.coalesce = True  # False: hareketler de tek tek enjekte edilir (ölçümler için)
+        self.processed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue = deque()  # [func, args, future, birleştirme türü: False / True (mutlak) / "rel"]
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._blocked = 0  # Yer açılmasını bekleyen üreticiler
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def _put(self, item, coalesce=False):
+        with self._cond:
+            queue = self._queue
+            if coalesce and self.coalesce and queue and queue[-1][3] is True:
+                queue[-1] = item
+                self.coalesced += 1
+                return True
+            if len(queue) >= self.capacity and (item[3] is not False or not self._make_room()):
+                self.dropped += 1
+                return False
+            queue.append(item)
+            self._cond.notify()
+            return True
+
+    def _make_room(self) -> bool:
+        """Kilit altında: dolu kuyrukta tıklama/tuş olayına yer açar.
+
+        Bekleyen en eski mutlak hareket atılır (sonraki konumlar onu zaten
+        geçersiz kılar); göreli hareketler deltaları yüzünden atılmaz. Atılacak
+        hareket yoksa worker'ın bir öğe almasını PUT_WAIT_TIMEOUT kadar bekler.
+        """
+        queue = self._queue
+        for i, queued in enumerate(queue):
+            if queued[3] is True:
+                del queue[i]
+                self.dropped += 1
+                return True
+        deadline = time.monotonic() + PUT_WAIT_TIMEOUT
+        self._blocked += 1
+        try:
+            while len(queue) >= self.capacity:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        finally:
+            self._blocked -= 1
+        return True
+
+    def submit(self, func, *args):
+        """Çağrıyı sıraya ekler ve beklemeden döner; kuyruk doluysa False"""
+        return self._put([func, args, None, False])
+
+    def submit_move(self, func, x, y):
+        """Mutlak mouse hareketini ekler; sonda bekleyen hareket varsa onun yerine geçer"""
+        return self._put([func, (x, y), None, True], coalesce=True)
+
+    def submit_relative(self, func, dx, dy, *args):
+        """Göreli mouse hareketini ekler; sonda aynı türden hareket bekliyorsa deltalar toplanır"""
+        with self._cond:
+            queue = self._queue
+            if self.coalesce and queue and queue[-1][3] == "rel" and queue[-1][0] == func:  # Bağlı metodlar her seferinde yeni nesne
+                tail = queue[-1][1]
+                queue[-1][1] = (tail[0] + dx, tail[1] + dy) + args
+                self.coalesced += 1
+                return True
+        return self._put([func, (dx, dy) + args, None, "rel"])
+
+    async def run(self, func, *args):
+        """Çağrıyı sıraya ekler ve sonucunu loop'u bloklamadan bekler"""
+        future = Future()
+        if not self._put([func, args, future, False]):
+            raise RuntimeError("Enjeksiyon kuyruğu dolu")
+        return await asyncio.wrap_future(future)
+
+    def flush(self, timeout: float = None):
+        """Kuyruktaki tüm çağrılar bitene kadar bekler (loop dışından çağrılmalı)"""
+        future = Future()
+        with self._cond:
+            self._queue.append([lambda: None, (), future, False])
+            self._cond.notify()
+        future.result(timeout)
+
+    def shutdown(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        return {"depth": self.depth, "processed": self.processed,
+                "coalesced": self.coalesced, "dropped": self.dropped, "errors": self.errors}
+
+    def _run(self):
+        queue = self._queue
+        while True:
+            with self._cond:
+                while not queue and not self._stopping:
+                    self._cond.wait()
+                if not queue:
+                    return
+                func, args, future, _ = queue.popleft()
+                if self._blocked:
+                    self._cond.notify_all()
+            try:
+                result = func(*args)
+            except Exception as e:
+                self.errors += 1
+                if future is not None:
+                    future.set_exception(e)
+            else:
+                if future is not None:
+                    future.set_result(result)
+            self.processed += 1
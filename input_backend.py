@@ -0,0 +1,1277 @@
+"""
+Input backend'leri - platforma özel capture, inject, ekran geometrisi ve clipboard katmanı
+
+InputHandler platform ayrımı yapmaz; başlangıçta kayıtlı backend'lerden biri seçilir
+ve tüm işler ona devredilir. "memory" backend'i ekran/pynput gerektirmez, inject
+edilen olayları kaydeder ve senaryolu capture olaylarını oynatır (headless test ve
+benchmark için).
+"""
+
+import os
+import shutil
+import sys
+import time
+import threading
+import platform
+import subprocess
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from logs import get_logger
+from utils import PhaseTimer, get_platform_name
+
+log = get_logger("input")
+
+# Listener hook'unun hazır olması için beklenecek en uzun süre (saniye)
+LISTENER_READY_TIMEOUT = 2.0
+
+# Başka bir uygulama grab'ı tutuyorsa (açık menü, sürükleme) bastırma denemeleri
+GRAB_ATTEMPTS = 5
+GRAB_RETRY_DELAY = 0.01
+
+# Clipboard aracı için en uzun bekleme (saniye)
+CLIPBOARD_TIMEOUT = 2.0
+
+# Denenecek clipboard komutları (sırayla; PATH'te olan ilki kullanılır)
+CLIPBOARD_COMMANDS = {
+    "get": (["pbpaste"], ["wl-paste", "--no-newline"], ["xclip", "-selection", "clipboard", "-o"],
+            ["xsel", "--clipboard", "--output"], ["powershell", "-NoProfile", "-Command", "Get-Clipboard -Raw"]),
+    "set": (["pbcopy"], ["wl-copy"], ["xclip", "-selection", "clipboard"], ["xsel", "--clipboard", "--input"],
+            ["powershell", "-NoProfile", "-Command", "$input | Set-Clipboard"]),
+}
+
+
+def check_macos_accessibility_permissions():
+    """macOS'ta accessibility izinlerini kontrol eder."""
+    if platform.system() != "Darwin":
+        return True
+
+    try:
+        # Sistem veritabanından accessibility izinlerini kontrol et
+        import sqlite3
+
+        # TCC (Transparency, Consent, and Control) veritabanını kontrol et
+        tcc_db_path = "/Library/Application Support/com.apple.TCC/TCC.db"
+        user_tcc_db_path = os.path.expanduser("~/Library/Application Support/com.apple.TCC/TCC.db")
+
+        # Önce kullanıcı TCC veritabanını kontrol et
+        for db_path in [user_tcc_db_path, tcc_db_path]:
+            if os.path.exists(db_path):
+                try:
+                    conn = sqlite3.connect(db_path)
+                    cursor = conn.cursor()
+
+                    # Terminal veya Python için accessibility izinlerini kontrol et
+                    cursor.execute("""
+                        SELECT allowed FROM access
+                        WHERE service = 'kTCCServiceAccessibility'
+                        AND (client LIKE '%Terminal%' OR client LIKE '%Python%' OR client LIKE '%python%')
+                    """)
+
+                    results = cursor.fetchall()
+                    conn.close()
+
+                    # Eğer izin varsa (allowed = 1)
+                    for result in results:
+                        if result[0] == 1:
+                            return True
+
+                except Exception:
+                    continue
+
+        # TCC kontrolü başarısız olursa, AppleScript ile kontrol et
+        script = '''
+        tell application "System Events"
+            try
+                set frontApp to name of first application process whose frontmost is true
+                return "true"
+            on error
+                return "false"
+            end try
+        end tell
+        '''
+
+        result = subprocess.run(
+            ['osascript', '-e', script],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+
+        return result.stdout.strip() == "true"
+
+    except Exception as e:
+        log.warning(f"Accessibility izin kontrolü hatası: {e}")
+        # Hata durumunda güvenli tarafta kal - izin yok varsay
+        return False
+
+def open_accessibility_settings():
+    """macOS accessibility ayarlarını açar."""
+    if platform.system() == "Darwin":
+        try:
+            subprocess.run([
+                'open',
+                'x-apple.systempreferences:com.apple.preference.security?Privacy_Accessibility'
+            ])
+            return True
+        except Exception:
+            return False
+    return False
+
+def request_macos_accessibility_permission():
+    """macOS'ta accessibility izni ister."""
+    if platform.system() != "Darwin":
+        return True
+
+    try:
+        # Önce mevcut izinleri kontrol et
+        if check_macos_accessibility_permissions():
+            return True
+
+        log.info("🔐 macOS Accessibility izni gerekli...")
+        log.info("📋 Sistem otomatik olarak izin isteyecek...")
+
+        # Accessibility gerektiren bir işlem yapmaya çalış
+        # Bu sistem tarafından izin dialog'u tetikleyecek
+        from pynput import mouse
+        controller = mouse.Controller()
+
+        # Mouse pozisyonunu al - bu accessibility izni tetikler
+        try:
+            pos = controller.position
+            log.info(f"✅ İzin mevcut - Mouse pozisyonu: {pos}")
+            return True
+        except Exception as e:
+            log.error(f"❌ Accessibility izni reddedildi: {e}")
+
+            # Kullanıcıyı yönlendir
+            log.info("\n🔧 İzin vermek için:")
+            log.info("1. System Settings > Privacy & Security > Accessibility")
+            log.info("2. Terminal veya Python'ı listeye ekleyin")
+            log.info("3. İzinleri etkinleştirin")
+            log.info("4. Bu uygulamayı yeniden başlatın")
+
+            # Ayarları otomatik aç
+            open_accessibility_settings()
+            log.info("📱 System Settings açıldı...")
+
+            return False
+
+    except Exception as e:
+        log.warning(f"İzin isteme hatası: {e}")
+        return False
+
+
+def wait_for_listener(listener, timeout: float = LISTENER_READY_TIMEOUT) -> float:
+    """pynput listener'ının hook'u kurduğunu bildirmesini bekler.
+
+    Geçen süreyi ms olarak döndürür. Listener thread'i hazır olmadan ölürse
+    ya da süre aşılırsa RuntimeError fırlatır.
+
+    pynput'un wait() metodu zaman aşımı almaz; bu yüzden listener'ın iç
+    hazır koşulu (_condition/_ready) zaman aşımıyla beklenir ve ek thread
+    açılmaz. Bu iç alanlar yoksa wait() adlandırılmış bir yardımcı thread'de
+    çağrılır; hazır olmadan biten listener'da o thread wait() içinde asılı
+    kalır (daemon, başarısız her başlatmada bir thread).
+    """
+    start = time.perf_counter()
+    condition = getattr(listener, "_condition", None)
+    if condition is not None and hasattr(listener, "_ready"):
+        def wait_step(step):
+            with condition:
+                return condition.wait_for(lambda: listener._ready, step)
+    else:
+        ready = threading.Event()
+
+        def waiter():
+            listener.wait()
+            ready.set()
+
+        threading.Thread(target=waiter, daemon=True, name="listener-ready-wait").start()
+        wait_step = ready.wait
+
+    while not wait_step(0.005):
+        if not listener.is_alive():
+            raise RuntimeError("listener thread'i hazır olmadan sonlandı")
+        if time.perf_counter() - start > timeout:
+            raise RuntimeError(f"listener {timeout * 1000:.0f}ms içinde hazır olmadı")
+    if not listener.running:
+        raise RuntimeError("listener hazır ama çalışmıyor")
+    return (time.perf_counter() - start) * 1000
+
+
+def _clipboard_commands(action: str) -> List[List[str]]:
+    """Sistemde bulunan clipboard komutları (action: "get" veya "set")."""
+    wayland = bool(os.environ.get("WAYLAND_DISPLAY"))
+    return [command for command in CLIPBOARD_COMMANDS[action]
+            if (wayland or not command[0].startswith("wl-")) and shutil.which(command[0])]
+
+
+# Kayıtlı backend sınıfları: isim -> sınıf
+_BACKENDS: Dict[str, Type["InputBackend"]] = {}
+
+def register_backend(name: str, platforms: Tuple[str, ...] = ()):
+    """Bir backend sınıfını verilen isimle kaydeden dekoratör.
+
+    `platforms` get_platform_name() değerleridir; otomatik seçimde kullanılır.
+    """
+    def decorator(cls):
+        cls.name = name
+        cls.platforms = tuple(platforms)
+        _BACKENDS[name] = cls
+        return cls
+    return decorator
+
+def available_backends() -> List[str]:
+    """Kayıtlı backend isimlerini döndürür."""
+    return list(_BACKENDS)
+
+def create_backend(name: Optional[str] = None, **kwargs) -> "InputBackend":
+    """İsimle ya da platforma göre bir backend örneği oluşturur.
+
+    İsim verilmezse SYNERGY_INPUT_BACKEND ortam değişkenine, o da yoksa
+    mevcut platforma bakılır.
+    """
+    name = name or os.environ.get("SYNERGY_INPUT_BACKEND")
+    if name:
+        if name not in _BACKENDS:
+            raise ValueError(f"Bilinmeyen input backend: {name} (mevcut: {', '.join(_BACKENDS)})")
+        return _BACKENDS[name](**kwargs)
+
+    current = get_platform_name()
+    for cls in _BACKENDS.values():
+        if current in cls.platforms:
+            return cls(**kwargs)
+    return _BACKENDS["pynput"](**kwargs)
+
+
+class InputBackend:
+    """Input backend arayüzü.
+
+    Capture tarafında backend, `sink` nesnesinin `_on_mouse_move(x, y)`,
+    `_on_mouse_click(x, y, button, pressed)`, `_on_mouse_scroll(x, y, dx, dy)`,
+    `_on_key_press(key)` ve `_on_key_release(key)` metodlarını çağırır.
+    """
+
+    name = "base"
+    platforms: Tuple[str, ...] = ()
+
+    def __init__(self):
+        self.capturing = False
+        self.suppress_input = False
+        self.sink = None
+
+    # Yaşam döngüsü
+    def start(self) -> bool:
+        """Backend'i başlatır; inject hazırsa True döner."""
+        return True
+
+    def stop(self):
+        """Backend'i durdurur."""
+        if self.capturing:
+            self.stop_capture()
+
+    def check_permissions(self) -> Tuple[bool, str]:
+        """Platform izinlerini (ok, açıklama) olarak döndürür."""
+        return True, "İzin gerekmiyor"
+
+    # Capture
+    def start_capture(self, sink) -> bool:
+        raise NotImplementedError
+
+    def stop_capture(self):
+        raise NotImplementedError
+
+    def set_suppress(self, suppress: bool) -> bool:
+        """Yakalanan input'un yerel sisteme ulaşıp ulaşmayacağını ayarlar; uygulanamazsa False."""
+        self.suppress_input = suppress
+        return True
+
+    def button_to_string(self, button) -> str:
+        return button if isinstance(button, str) else "unknown"
+
+    def key_to_string(self, key) -> str:
+        try:
+            if hasattr(key, 'char') and key.char:
+                return key.char
+            elif hasattr(key, 'name'):
+                return key.name
+            else:
+                return str(key)
+        except AttributeError:
+            return str(key)
+
+    # Inject
+    def move_mouse(self, x: int, y: int) -> bool:
+        raise NotImplementedError
+
+    def mouse_button(self, x: int, y: int, button: str, pressed: bool) -> bool:
+        raise NotImplementedError
+
+    def scroll(self, x: int, y: int, dx: int, dy: int) -> bool:
+        raise NotImplementedError
+
+    def key(self, key_name: str, pressed: bool) -> bool:
+        raise NotImplementedError
+
+    def move_relative(self, dx: int, dy: int) -> bool:
+        """Göreli hareket; varsayılan mutlak konum + delta (işaretçiyi kilitleyen uygulamalar görmez)"""
+        x, y = self.get_mouse_position()
+        return self.move_mouse(x + dx, y + dy)
+
+    def pointer_grabbed(self) -> Optional[bool]:
+        """Ön plandaki uygulama işaretçiyi yakalamış mı (oyun/3D görünüm); None: bilinmiyor"""
+        return None
+
+    # Geometri
+    def get_mouse_position(self) -> tuple:
+        raise NotImplementedError
+
+    def get_screen_size(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    # İmleç görünürlüğü (imleç kilidi için; desteklenmiyorsa False)
+    def hide_cursor(self) -> bool:
+        return False
+
+    def show_cursor(self) -> bool:
+        return False
+
+    # Clipboard: platform araçları (pbcopy, wl-copy, xclip, xsel, PowerShell); Tk yalnızca
+    # GUI zaten yüklüyse yedek olarak kullanılır (headless modda tkinter import edilmez)
+    def get_clipboard_text(self) -> str:
+        for command in _clipboard_commands("get"):
+            try:
+                result = subprocess.run(command, capture_output=True, timeout=CLIPBOARD_TIMEOUT)
+            except (OSError, subprocess.SubprocessError):
+                continue
+            if result.returncode == 0:
+                return result.stdout.decode("utf-8", errors="replace")
+        if "tkinter" not in sys.modules:
+            return ""
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+            root.withdraw()  # Pencereyi gizle
+            clipboard_text = root.clipboard_get()
+            root.destroy()
+            return clipboard_text
+        except Exception:
+            return ""
+
+    def set_clipboard_text(self, text: str):
+        for command in _clipboard_commands("set"):
+            try:
+                result = subprocess.run(command, input=text.encode("utf-8"), timeout=CLIPBOARD_TIMEOUT)
+            except (OSError, subprocess.SubprocessError):
+                continue
+            if result.returncode == 0:
+                return
+        if "tkinter" not in sys.modules:
+            log.warning("Clipboard ayarlanamadı: pbcopy/wl-copy/xclip/xsel bulunamadı", every=60.0)
+            return
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+            root.withdraw()  # Pencereyi gizle
+            root.clipboard_clear()
+            root.clipboard_append(text)
+            root.update()  # Clipboard'ı güncelle
+            root.destroy()
+        except Exception as e:
+            log.warning(f"Clipboard ayarlama hatası: {e}")
+
+
+@register_backend("pynput", platforms=("linux",))
+class PynputBackend(InputBackend):
+    """pynput controller ve listener'ları ile çalışan genel backend."""
+
+    def __init__(self):
+        super().__init__()
+        self._mouse_controller = None
+        self._keyboard_controller = None
+        self._pynput_loaded = False
+        self.mouse_listener = None
+        self.keyboard_listener = None
+        self._grab_display = None
+        self._inject_display = None  # XTest göreli hareket ve grab yoklaması (injection thread'i)
+        self._uinput = None  # python-evdev UInput cihazı; False: denendi, kullanılamıyor
+
+    # pynput ilk kullanımda yüklenir; import ve controller kurulumu başlangıcı yavaşlatır
+    @property
+    def mouse_controller(self):
+        if not self._pynput_loaded:
+            self._init_pynput()
+        return self._mouse_controller
+
+    @property
+    def keyboard_controller(self):
+        if not self._pynput_loaded:
+            self._init_pynput()
+        return self._keyboard_controller
+
+    def _init_pynput(self):
+        """Pynput'u güvenli şekilde başlatır."""
+        self._pynput_loaded = True
+        try:
+            from pynput import mouse, keyboard
+            from pynput.mouse import Button, Listener as MouseListener
+            from pynput.keyboard import Key, Listener as KeyboardListener
+
+            self._mouse_controller = mouse.Controller()
+            self._keyboard_controller = keyboard.Controller()
+            self.MouseListener = MouseListener
+            self.KeyboardListener = KeyboardListener
+            self.Button = Button
+            self.Key = Key
+
+        except Exception as e:
+            log.warning(f"Pynput import hatası: {e}")
+            log.warning("⚠️ Pynput mevcut değil - input capture devre dışı")
+            self._mouse_controller = None
+            self._keyboard_controller = None
+
+    def start_capture(self, sink) -> bool:
+        if self.capturing:
+            return True
+
+        if not self.mouse_controller or not self.keyboard_controller:
+            raise RuntimeError("Input controllers başlatılamadı")
+
+        self.sink = sink
+        self.capturing = True
+        try:
+            return self._start_listeners()
+        except Exception as e:
+            self.capturing = False
+            self._stop_listeners()
+            raise RuntimeError(f"Input capture başlatılamadı: {e}")
+
+    def _start_listeners(self) -> bool:
+        """Mouse ve klavye listener'larını başlatır.
+
+        Listener'lar her zaman suppress=False ile kurulur; bastırma
+        _apply_suppress ile canlı olarak açılıp kapatılır.
+        """
+        sink = self.sink
+        timeline = PhaseTimer("Listener başlatma")
+
+        # Mouse listener - hook hazır olana kadar bekle
+        try:
+            self.mouse_listener = self.MouseListener(
+                on_move=sink._on_mouse_move,
+                on_click=sink._on_mouse_click,
+                on_scroll=sink._on_mouse_scroll,
+                suppress=False
+            )
+            self.mouse_listener.start()
+            wait_for_listener(self.mouse_listener)
+            timeline.mark("mouse")
+
+        except Exception as e:
+            raise RuntimeError(f"Mouse listener hatası: {e}")
+
+        # Keyboard listener - hook hazır olana kadar bekle
+        try:
+            self.keyboard_listener = self.KeyboardListener(
+                on_press=sink._on_key_press,
+                on_release=sink._on_key_release,
+                suppress=False
+            )
+            self.keyboard_listener.start()
+            wait_for_listener(self.keyboard_listener)
+            timeline.mark("keyboard")
+
+        except Exception as e:
+            raise RuntimeError(f"Keyboard listener hatası: {e}")
+
+        if self.suppress_input:
+            self._try_suppress(True)
+            timeline.mark("suppress")
+        log.info(timeline.summary())
+        return True
+
+    def _stop_listeners(self):
+        if self.suppress_input:
+            try:
+                self._apply_suppress(False)
+            except Exception:
+                pass
+        for attr in ('mouse_listener', 'keyboard_listener'):
+            listener = getattr(self, attr)
+            if listener:
+                try:
+                    listener.stop()
+                except Exception:
+                    pass
+                setattr(self, attr, None)
+
+    def stop_capture(self):
+        if not self.capturing:
+            return
+        self.capturing = False
+        try:
+            self._stop_listeners()
+        except Exception as e:
+            log.warning(f"Input capture durdurma hatası: {e}")
+
+    def set_suppress(self, suppress: bool) -> bool:
+        """Bastırmayı listener'ları yeniden başlatmadan açıp kapatır; başarısızsa False."""
+        if suppress == self.suppress_input:
+            return True
+        self.suppress_input = suppress
+        if self.capturing and self.mouse_listener:
+            return self._try_suppress(suppress)
+        return True
+
+    def _try_suppress(self, suppress: bool) -> bool:
+        """_apply_suppress'i çağırır; hata (Xlib/DISPLAY yok) ya da başarısız grab'da
+        bastırma açıkça kapatılır ve False döner."""
+        try:
+            applied = self._apply_suppress(suppress)
+        except Exception as e:
+            log.warning("⚠️ Input bastırma uygulanamadı: %s", e, every=1.0)
+            applied = False
+        if not applied and suppress:
+            self.suppress_input = False
+        return applied
+
+    def _apply_suppress(self, suppress: bool) -> bool:
+        """Xorg: pointer/klavye grab'ı ile bastırma; grab alınamazsa False.
+
+        Grab aktifken uygulamalar olay almaz ama pynput'un RECORD tabanlı
+        listener'ları almaya devam eder; pointer ve klavye için birer X round-trip'idir.
+        """
+        display = self._grab_display
+        if display is None:
+            import Xlib.display
+            display = self._grab_display = Xlib.display.Display()
+
+        import Xlib.X
+        if not suppress:
+            display.ungrab_pointer(Xlib.X.CurrentTime)
+            display.ungrab_keyboard(Xlib.X.CurrentTime)
+            display.sync()
+            return True
+
+        root = display.screen().root
+        grabs = {
+            "pointer": lambda: root.grab_pointer(
+                True, Xlib.X.ButtonPressMask | Xlib.X.ButtonReleaseMask | Xlib.X.PointerMotionMask,
+                Xlib.X.GrabModeAsync, Xlib.X.GrabModeAsync, 0, 0, Xlib.X.CurrentTime),
+            "keyboard": lambda: root.grab_keyboard(
+                True, Xlib.X.GrabModeAsync, Xlib.X.GrabModeAsync, Xlib.X.CurrentTime),
+        }
+        failed = []
+        for device, grab in grabs.items():
+            status = grab()
+            for _ in range(GRAB_ATTEMPTS - 1):
+                if status == Xlib.X.GrabSuccess:
+                    break
+                time.sleep(GRAB_RETRY_DELAY)
+                status = grab()
+            if status != Xlib.X.GrabSuccess:
+                failed.append(f"{device}={status}")
+        if failed:
+            # AlreadyGrabbed/GrabFrozen: yerel masaüstü de aynı input'u almaya devam eder;
+            # yarım kalan grab'ı bırak ki bastırma tamamen kapalı olsun
+            display.ungrab_pointer(Xlib.X.CurrentTime)
+            display.ungrab_keyboard(Xlib.X.CurrentTime)
+            display.sync()
+            log.warning("⚠️ Input bastırılamadı, X grab başarısız: %s", ", ".join(failed), every=1.0)
+            return False
+        display.sync()
+        return True
+
+    def _xfixes_cursor(self, visible: bool) -> bool:
+        """Xorg: XFixes ile kök penceredeki imleci gizler/gösterir."""
+        try:
+            display = self._grab_display
+            if display is None:
+                import Xlib.display
+                display = self._grab_display = Xlib.display.Display()
+            if not display.has_extension("XFIXES"):
+                return False
+            display.xfixes_query_version()
+            root = display.screen().root
+            if visible:
+                root.xfixes_show_cursor()
+            else:
+                root.xfixes_hide_cursor()
+            display.sync()
+            return True
+        except Exception as e:
+            log.warning("XFixes imleç hatası: %s", e, every=5.0)
+            return False
+
+    def hide_cursor(self) -> bool:
+        return self._xfixes_cursor(False)
+
+    def show_cursor(self) -> bool:
+        return self._xfixes_cursor(True)
+
+    def _x_inject_display(self):
+        if self._inject_display is None:
+            import Xlib.display
+            self._inject_display = Xlib.display.Display()
+        return self._inject_display
+
+    def _uinput_device(self):
+        """Ham REL olayları için uinput cihazı (python-evdev ve /dev/uinput erişimi gerekir)"""
+        if self._uinput is None:
+            try:
+                from evdev import UInput, ecodes
+                self._uinput = UInput({ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y],
+                                       ecodes.EV_KEY: [ecodes.BTN_LEFT, ecodes.BTN_RIGHT, ecodes.BTN_MIDDLE]},
+                                      name="synergyclone-relative")
+                log.info("🖱️ Göreli hareket uinput cihazı ile enjekte edilecek")
+            except Exception as e:
+                log.debug("uinput kullanılamıyor, XTest'e düşülüyor: %s", e)
+                self._uinput = False
+        return self._uinput or None
+
+    def move_relative(self, dx: int, dy: int) -> bool:
+        """Linux: uinput varsa ham REL_X/REL_Y, yoksa XTest göreli MotionNotify"""
+        device = self._uinput_device()
+        if device is not None:
+            from evdev import ecodes
+            device.write(ecodes.EV_REL, ecodes.REL_X, int(dx))
+            device.write(ecodes.EV_REL, ecodes.REL_Y, int(dy))
+            device.syn()
+            return True
+        try:
+            import Xlib.X
+            from Xlib.ext import xtest
+            display = self._x_inject_display()
+            xtest.fake_input(display, Xlib.X.MotionNotify, detail=1, x=int(dx), y=int(dy))
+            display.flush()
+            return True
+        except Exception as e:
+            log.warning("XTest göreli hareket hatası: %s", e, every=1.0)
+            return InputBackend.move_relative(self, dx, dy)
+
+    def pointer_grabbed(self) -> Optional[bool]:
+        """Xorg: işaretçiyi kilitleyen uygulamalar boş imleç tanımlar; XFixes imleç görüntüsü
+        tamamen saydamsa yakalanmış sayılır.
+
+        Pasif bir okumadır: grab denemesi yapmaz, bu yüzden sürüklemedeki örtük
+        grab'ı (düğme basılıyken) yakalama sanmaz ve uygulamanın grab'ını bozmaz.
+        """
+        try:
+            display = self._x_inject_display()
+            if not display.has_extension("XFIXES"):
+                return None
+            image = display.xfixes_get_cursor_image(display.screen().root)
+            if not image.width or not image.height:
+                return True
+            return not any(pixel >> 24 for pixel in image.cursor_image)  # ARGB: alfa > 0 yok
+        except Exception as e:
+            log.debug("İmleç görüntüsü okunamadı: %s", e)
+            return None
+
+    def button_to_string(self, button) -> str:
+        if not hasattr(self, 'Button'):
+            return "unknown"
+
+        button_map = {
+            self.Button.left: "left",
+            self.Button.right: "right",
+            self.Button.middle: "middle"
+        }
+        return button_map.get(button, "unknown")
+
+    def move_mouse(self, x: int, y: int) -> bool:
+        if not self.mouse_controller:
+            return False
+        self.mouse_controller.position = (x, y)
+        return True
+
+    def mouse_button(self, x: int, y: int, button: str, pressed: bool) -> bool:
+        if not self.mouse_controller or not hasattr(self, 'Button'):
+            return False
+        # Önce mouse'u ilgili pozisyona götür
+        self.mouse_controller.position = (x, y)
+        time.sleep(0.01)  # Küçük bir gecikme
+
+        # Button mapping
+        button_map = {
+            "left": self.Button.left,
+            "right": self.Button.right,
+            "middle": self.Button.middle
+        }
+
+        mouse_button = button_map.get(button, self.Button.left)
+
+        if pressed:
+            self.mouse_controller.press(mouse_button)
+        else:
+            self.mouse_controller.release(mouse_button)
+        return True
+
+    def scroll(self, x: int, y: int, dx: int, dy: int) -> bool:
+        if not self.mouse_controller:
+            return False
+        self.mouse_controller.position = (x, y)
+        time.sleep(0.01)
+        self.mouse_controller.scroll(dx, dy)
+        return True
+
+    def key(self, key_name: str, pressed: bool) -> bool:
+        if not self.keyboard_controller or not hasattr(self, 'Key'):
+            return False
+
+        # Özel tuşlar için mapping
+        special_keys = {
+            'space': self.Key.space,
+            'enter': self.Key.enter,
+            'tab': self.Key.tab,
+            'shift': self.Key.shift,
+            'ctrl': self.Key.ctrl,
+            'alt': self.Key.alt,
+            'cmd': self.Key.cmd,
+            'esc': self.Key.esc,
+            'backspace': self.Key.backspace,
+            'delete': self.Key.delete,
+            'up': self.Key.up,
+            'down': self.Key.down,
+            'left': self.Key.left,
+            'right': self.Key.right,
+            'home': self.Key.home,
+            'end': self.Key.end,
+            'page_up': self.Key.page_up,
+            'page_down': self.Key.page_down,
+            'f1': self.Key.f1, 'f2': self.Key.f2, 'f3': self.Key.f3, 'f4': self.Key.f4,
+            'f5': self.Key.f5, 'f6': self.Key.f6, 'f7': self.Key.f7, 'f8': self.Key.f8,
+            'f9': self.Key.f9, 'f10': self.Key.f10, 'f11': self.Key.f11, 'f12': self.Key.f12
+        }
+
+        if key_name.lower() in special_keys:
+            key = special_keys[key_name.lower()]
+        else:
+            key = key_name
+
+        if pressed:
+            self.keyboard_controller.press(key)
+        else:
+            self.keyboard_controller.release(key)
+        return True
+
+    def get_mouse_position(self) -> tuple:
+        if not self.mouse_controller:
+            return (0, 0)
+        try:
+            return self.mouse_controller.position
+        except Exception:
+            return (0, 0)
+
+    def get_screen_size(self) -> Tuple[int, int]:
+        # Kök pencere boyutu (Tk'nin winfo_screenwidth'i ile aynı); Tk root açmaz
+        try:
+            import Xlib.display
+            display = Xlib.display.Display()
+            try:
+                screen = display.screen()
+                return screen.width_in_pixels, screen.height_in_pixels
+            finally:
+                display.close()
+        except Exception as e:
+            log.debug(f"Ekran boyutu alınamadı, varsayılan kullanılıyor: {e}")
+            return 1920, 1080
+
+
+class _PollingCaptureMixin:
+    """Listener yerine mouse pozisyonunu periyodik okuyarak capture yapar."""
+
+    polling_interval = 0.01  # 100 FPS polling
+
+    def _start_polling(self):
+        self.polling_active = True
+        self.last_mouse_position = self.mouse_controller.position
+
+        def polling_loop():
+            while self.polling_active and self.capturing:
+                try:
+                    current_pos = self.mouse_controller.position
+                    if current_pos != self.last_mouse_position:
+                        self.sink._on_mouse_move(current_pos[0], current_pos[1])
+                        self.last_mouse_position = current_pos
+                    time.sleep(self.polling_interval)
+                except Exception as e:
+                    log.warning(f"Polling hatası: {e}")
+                    break
+
+        self.polling_thread = threading.Thread(target=polling_loop, daemon=True)
+        self.polling_thread.start()
+
+    def _stop_polling(self):
+        self.polling_active = False
+        thread = getattr(self, 'polling_thread', None)
+        if thread and thread.is_alive():
+            try:
+                thread.join(timeout=1.0)
+            except RuntimeError:
+                # Thread join hatası - normal durum
+                pass
+
+    def stop_capture(self):
+        if not self.capturing:
+            return
+        self.capturing = False
+        self._stop_polling()
+        try:
+            self._stop_listeners()
+        except Exception as e:
+            log.warning(f"Input capture durdurma hatası: {e}")
+
+    def set_suppress(self, suppress: bool) -> bool:
+        if getattr(self, 'polling_active', False):
+            # Polling olayları bastıramaz; bayrak yine de güncellenir
+            self.suppress_input = suppress
+            return not suppress
+        return PynputBackend.set_suppress(self, suppress)
+
+
+@register_backend("windows", platforms=("windows",))
+class WindowsBackend(_PollingCaptureMixin, PynputBackend):
+    """Windows API (ctypes) ile inject ve geometri, polling ile capture."""
+
+    # MOUSEEVENTF_* (down, up) bayrakları
+    BUTTON_FLAGS = {
+        "left": (0x0002, 0x0004),
+        "right": (0x0008, 0x0010),
+        "middle": (0x0020, 0x0040),
+    }
+    MOUSEEVENTF_MOVE = 0x0001  # ABSOLUTE olmadan: göreli hareket
+
+    def start_capture(self, sink) -> bool:
+        if self.capturing:
+            return True
+
+        if not self.mouse_controller or not self.keyboard_controller:
+            raise RuntimeError("Input controllers başlatılamadı")
+
+        self.sink = sink
+        self.capturing = True
+        try:
+            # Windows'ta sadece polling kullan - listener sorunları nedeniyle
+            log.info("🪟 Windows polling sistemi başlatılıyor...")
+            self._start_polling()
+            log.info("✅ Windows polling sistemi başarıyla başlatıldı")
+            return True
+        except Exception as e:
+            log.warning(f"Windows polling hatası: {e}")
+            # Fallback: listener'ları dikkatli şekilde dene
+            return self._try_windows_listeners()
+
+    def _try_windows_listeners(self):
+        """Windows'ta listener'ları dikkatli şekilde dener."""
+        sink = self.sink
+        timeline = PhaseTimer("Windows listener başlatma")
+        try:
+            log.info("🪟 Windows listener'ları deneniyor...")
+
+            # Suppress=False ile dene (daha güvenli)
+            self.mouse_listener = self.MouseListener(
+                on_move=sink._on_mouse_move,
+                on_click=sink._on_mouse_click,
+                on_scroll=sink._on_mouse_scroll,
+                suppress=False  # Windows'ta suppress=False daha güvenli
+            )
+            self.mouse_listener.start()
+
+            # Listener hook'unun hazır olmasını bekle
+            try:
+                wait_for_listener(self.mouse_listener)
+                timeline.mark("mouse")
+            except RuntimeError as e:
+                log.error(f"❌ Windows mouse listener başarısız: {e}")
+                self._stop_listeners()
+                self.capturing = False
+                return False
+
+            log.info("✅ Windows mouse listener başarılı")
+
+            # Keyboard listener'ı da dene
+            try:
+                self.keyboard_listener = self.KeyboardListener(
+                    on_press=sink._on_key_press,
+                    on_release=sink._on_key_release,
+                    suppress=False
+                )
+                self.keyboard_listener.start()
+                wait_for_listener(self.keyboard_listener)
+                timeline.mark("keyboard")
+                log.info("✅ Windows keyboard listener başarılı")
+
+            except Exception as e:
+                log.warning(f"⚠️ Windows keyboard listener başarısız - sadece mouse: {e}")
+                if self.keyboard_listener:
+                    try:
+                        self.keyboard_listener.stop()
+                    except Exception:
+                        pass
+                    self.keyboard_listener = None
+
+            if self.suppress_input:
+                self._try_suppress(True)
+            log.info(timeline.summary())
+            return True  # Mouse yeterli
+
+        except Exception as e:
+            log.warning(f"Windows listener hatası: {e}")
+            self.capturing = False
+            return False
+
+    def _apply_suppress(self, suppress: bool) -> bool:
+        # pynput'un win32 hook'u her olayda listener.suppress değerine bakar,
+        # bu yüzden bayrağı değiştirmek bir sonraki olaydan itibaren geçerlidir
+        for listener in (self.mouse_listener, self.keyboard_listener):
+            if listener is not None:
+                listener._suppress = suppress
+        return True
+
+    def move_mouse(self, x: int, y: int) -> bool:
+        try:
+            import ctypes
+            return bool(ctypes.windll.user32.SetCursorPos(int(x), int(y)))
+        except Exception as e:
+            log.warning("Windows API hatası: %s", e, every=1.0)
+            # Fallback: pynput kullan
+            return PynputBackend.move_mouse(self, x, y)
+
+    def mouse_button(self, x: int, y: int, button: str, pressed: bool) -> bool:
+        try:
+            import ctypes
+
+            # Önce mouse'u pozisyona götür
+            ctypes.windll.user32.SetCursorPos(int(x), int(y))
+
+            down_flag, up_flag = self.BUTTON_FLAGS.get(button, self.BUTTON_FLAGS["left"])
+            ctypes.windll.user32.mouse_event(down_flag if pressed else up_flag, 0, 0, 0, 0)
+
+            if log.debug_enabled:
+                log.debug("Windows API mouse click: (%s, %s) %s %s", x, y, button, "down" if pressed else "up")
+            return True
+        except Exception as e:
+            log.warning("Windows API click hatası: %s", e, every=1.0)
+            # Fallback: pynput kullan
+            return PynputBackend.mouse_button(self, x, y, button, pressed)
+
+    def get_screen_size(self) -> Tuple[int, int]:
+        try:
+            import ctypes
+            user32 = ctypes.windll.user32
+            # DPI awareness ayarla
+            try:
+                ctypes.windll.shcore.SetProcessDpiAwareness(1)
+            except Exception:
+                pass
+            return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+        except Exception as e:
+            log.warning(f"⚠️ Ekran boyutu alma hatası: {e}")
+            return 1920, 1080
+
+    def move_relative(self, dx: int, dy: int) -> bool:
+        try:
+            import ctypes
+            ctypes.windll.user32.mouse_event(self.MOUSEEVENTF_MOVE, int(dx), int(dy), 0, 0)
+            return True
+        except Exception as e:
+            log.warning("Windows API göreli hareket hatası: %s", e, every=1.0)
+            return InputBackend.move_relative(self, dx, dy)
+
+    def pointer_grabbed(self) -> Optional[bool]:
+        """İmleç ClipCursor ile sanal ekrandan küçük bir alana hapsedilmişse yakalanmıştır"""
+        try:
+            import ctypes
+            from ctypes import wintypes
+            user32 = ctypes.windll.user32
+            rect = wintypes.RECT()
+            if not user32.GetClipCursor(ctypes.byref(rect)):
+                return None
+            # SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN
+            left, top = user32.GetSystemMetrics(76), user32.GetSystemMetrics(77)
+            width, height = user32.GetSystemMetrics(78), user32.GetSystemMetrics(79)
+            return (rect.left > left or rect.top > top or
+                    rect.right < left + width or rect.bottom < top + height)
+        except Exception as e:
+            log.debug("ClipCursor yoklaması başarısız: %s", e)
+            return None
+
+    # ShowCursor yalnızca çağıran thread'in pencerelerini etkiler; global gizleme yok
+    def hide_cursor(self) -> bool:
+        return False
+
+    def show_cursor(self) -> bool:
+        return False
+
+
+@register_backend("macos", platforms=("darwin",))
+class MacOSBackend(_PollingCaptureMixin, PynputBackend):
+    """Quartz ile geometri, accessibility izin kontrolü ve polling ile capture."""
+
+    def __init__(self):
+        super().__init__()
+        self._accessibility = None
+        self._permission_thread = None
+
+    @property
+    def accessibility_available(self) -> bool:
+        # İzin kontrolü (sqlite + AppleScript) start() ile arka planda başlar
+        if self._accessibility is None and self._permission_thread is not None:
+            self._permission_thread.join()
+        if self._accessibility is None:
+            self._accessibility = check_macos_accessibility_permissions()
+        return self._accessibility
+
+    def _check_permissions_background(self):
+        self._accessibility = check_macos_accessibility_permissions()
+        if self._accessibility:
+            log.info("✅ macOS Accessibility izni mevcut")
+        else:
+            log.warning("⚠️ macOS Accessibility izni yok - input capture devre dışı")
+
+    def start(self) -> bool:
+        # Yine de başlat; capture izin sonucu gelene kadar bekler
+        if self._accessibility is None and self._permission_thread is None:
+            self._permission_thread = threading.Thread(
+                target=self._check_permissions_background, daemon=True)
+            self._permission_thread.start()
+        return super().start()
+
+    def check_permissions(self) -> Tuple[bool, str]:
+        if not self.accessibility_available:
+            return False, "Accessibility izinleri gerekli"
+        return True, "İzinler mevcut"
+
+    def start_capture(self, sink) -> bool:
+        if self.capturing:
+            return True
+
+        if not self.accessibility_available:
+            raise PermissionError("macOS accessibility izinleri eksik")
+
+        if not self.mouse_controller or not self.keyboard_controller:
+            raise RuntimeError("Input controllers başlatılamadı")
+
+        # Önce basit bir test yapalım
+        try:
+            test_pos = self.mouse_controller.position
+            log.info(f"Mouse pozisyon testi başarılı: {test_pos}")
+        except Exception as e:
+            raise PermissionError(f"macOS accessibility izinleri eksik: {e}")
+
+        # macOS'ta polling tabanlı sistem kullan (daha güvenli)
+        self.sink = sink
+        self.capturing = True
+        log.info("🍎 macOS için polling tabanlı mouse tracking başlatılıyor...")
+        self._start_polling()
+        log.info("✅ macOS polling sistemi başarıyla başlatıldı")
+        return True
+
+    def get_screen_size(self) -> Tuple[int, int]:
+        try:
+            import Quartz
+            main_display = Quartz.CGMainDisplayID()
+            width = Quartz.CGDisplayPixelsWide(main_display)
+            height = Quartz.CGDisplayPixelsHigh(main_display)
+            return width, height
+        except Exception:
+            # Fallback
+            return 1920, 1080
+
+    def _display_cursor(self, visible: bool) -> bool:
+        try:
+            import Quartz
+            main_display = Quartz.CGMainDisplayID()
+            if visible:
+                error = Quartz.CGDisplayShowCursor(main_display)
+            else:
+                error = Quartz.CGDisplayHideCursor(main_display)
+            return error == 0
+        except Exception as e:
+            log.warning("Quartz imleç hatası: %s", e, every=5.0)
+            return False
+
+    def hide_cursor(self) -> bool:
+        return self._display_cursor(False)
+
+    def show_cursor(self) -> bool:
+        return self._display_cursor(True)
+
+    def move_relative(self, dx: int, dy: int) -> bool:
+        """Delta alanları dolu CGEvent; imleci ayıran (pointer lock) uygulamalar deltayı okur"""
+        try:
+            import Quartz
+            x, y = self.get_mouse_position()
+            event = Quartz.CGEventCreateMouseEvent(None, Quartz.kCGEventMouseMoved,
+                                                   Quartz.CGPointMake(x + dx, y + dy),
+                                                   Quartz.kCGMouseButtonLeft)
+            Quartz.CGEventSetIntegerValueField(event, Quartz.kCGMouseEventDeltaX, int(dx))
+            Quartz.CGEventSetIntegerValueField(event, Quartz.kCGMouseEventDeltaY, int(dy))
+            Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+            return True
+        except Exception as e:
+            log.warning("Quartz göreli hareket hatası: %s", e, every=1.0)
+            return InputBackend.move_relative(self, dx, dy)
+
+    def pointer_grabbed(self) -> Optional[bool]:
+        """İşaretçiyi kilitleyen uygulamalar imleci gizler"""
+        try:
+            import Quartz
+            return not Quartz.CGCursorIsVisible()
+        except Exception:
+            return None
+
+
+@register_backend("memory")
+class MemoryBackend(InputBackend):
+    """Bellekte çalışan backend - ekran ve pynput gerektirmez.
+
+    Inject edilen olaylar `injected` listesine `(perf_counter_ns, tür, *argümanlar)`
+    olarak kaydedilir. `play()` senaryolu capture olaylarını sink'e iletir ve her
+    olayı sink'e vermeden hemen önce ("donanım" anı) `captured` listesine aynı
+    biçimde yazar;
+    senaryo adımları `("move", x, y)`, `("click", x, y, button, pressed)`,
+    `("scroll", x, y, dx, dy)`, `("press", key)`, `("release", key)` veya
+    `("sleep", saniye)` biçimindedir. `("rel", dx, dy)` fare donanımı gibi
+    imleci mevcut konumdan ekrana sığdırarak kaydırır ve sink'e mutlak konumu
+    verir. Bastırma canlı bir bayraktır; kapalıyken oynatılan olaylar
+    `passed_through` sayacına eklenir.
+    """
+
+    def __init__(self, screen_size: Tuple[int, int] = (1920, 1080),
+                 on_inject: Optional[Callable[[tuple], None]] = None):
+        super().__init__()
+        self.screen_size = tuple(screen_size)
+        self.position = (self.screen_size[0] // 2, self.screen_size[1] // 2)
+        self.clipboard = ""
+        self.cursor_hidden = False
+        self.pointer_grab = False  # Ön plandaki uygulama işaretçiyi yakalamış gibi davran
+        self.buttons_held = set()  # Inject edilmiş, henüz bırakılmamış düğmeler
+        self.injected: List[tuple] = []
+        self.captured: List[tuple] = []
+        self.passed_through = 0  # Bastırılmadan yerel sisteme ulaşan capture olayları
+        self.on_inject = on_inject
+        self._lock = threading.Lock()
+
+    def _record(self, *event):
+        entry = (time.perf_counter_ns(),) + event
+        with self._lock:
+            self.injected.append(entry)
+        if self.on_inject:
+            self.on_inject(entry)
+
+    def clear(self):
+        """Kaydedilmiş inject ve capture olaylarını temizler."""
+        with self._lock:
+            self.injected.clear()
+            self.captured.clear()
+
+    # Capture
+    def start_capture(self, sink) -> bool:
+        self.sink = sink
+        self.capturing = True
+        return True
+
+    def stop_capture(self):
+        self.capturing = False
+
+    def play(self, script, realtime: bool = True) -> int:
+        """Senaryoyu capture olayı olarak sink'e iletir; iletilen olay sayısını döndürür.
+
+        `realtime=False` ise "sleep" adımları atlanır.
+        """
+        delivered = 0
+        for step in script:
+            kind, args = step[0], step[1:]
+            if kind == "sleep":
+                if realtime:
+                    time.sleep(args[0])
+                continue
+            if not self.capturing or self.sink is None:
+                break
+            if not self.suppress_input:
+                self.passed_through += 1
+            if kind == "rel":
+                kind, args = "move", self._moved_by(*args)
+            self.captured.append((time.perf_counter_ns(), kind) + tuple(args))
+            if kind == "move":
+                self.position = (args[0], args[1])
+                self.sink._on_mouse_move(*args)
+            elif kind == "click":
+                self.sink._on_mouse_click(*args)
+            elif kind == "scroll":
+                self.sink._on_mouse_scroll(*args)
+            elif kind == "press":
+                self.sink._on_key_press(*args)
+            elif kind == "release":
+                self.sink._on_key_release(*args)
+            else:
+                raise ValueError(f"Bilinmeyen senaryo adımı: {kind}")
+            delivered += 1
+        return delivered
+
+    def _moved_by(self, dx: int, dy: int) -> tuple:
+        x = min(max(self.position[0] + dx, 0), self.screen_size[0] - 1)
+        y = min(max(self.position[1] + dy, 0), self.screen_size[1] - 1)
+        return x, y
+
+    def play_async(self, script, realtime: bool = True) -> threading.Thread:
+        """Senaryoyu ayrı bir thread'de (listener thread'i gibi) oynatır."""
+        thread = threading.Thread(target=self.play, args=(script, realtime), daemon=True)
+        thread.start()
+        return thread
+
+    # Inject
+    def move_mouse(self, x: int, y: int) -> bool:
+        self.position = (int(x), int(y))
+        self._record("move", int(x), int(y))
+        return True
+
+    def mouse_button(self, x: int, y: int, button: str, pressed: bool) -> bool:
+        self.position = (int(x), int(y))
+        if pressed:
+            self.buttons_held.add(button)
+        else:
+            self.buttons_held.discard(button)
+        self._record("click", int(x), int(y), button, pressed)
+        return True
+
+    def scroll(self, x: int, y: int, dx: int, dy: int) -> bool:
+        self._record("scroll", int(x), int(y), dx, dy)
+        return True
+
+    def key(self, key_name: str, pressed: bool) -> bool:
+        self._record("key", key_name, pressed)
+        return True
+
+    def move_relative(self, dx: int, dy: int) -> bool:
+        self.position = self._moved_by(dx, dy)
+        self._record("rel", int(dx), int(dy))
+        return True
+
+    def pointer_grabbed(self) -> Optional[bool]:
+        # Aktif grab yoklaması gibi: sürüklemedeki örtük grab da yakalama görünür
+        return self.pointer_grab or bool(self.buttons_held)
+
+    # Geometri
+    def get_mouse_position(self) -> tuple:
+        return self.position
+
+    def get_screen_size(self) -> Tuple[int, int]:
+        return self.screen_size
+
+    def hide_cursor(self) -> bool:
+        self.cursor_hidden = True
+        return True
+
+    def show_cursor(self) -> bool:
+        self.cursor_hidden = False
+        return True
+
+    # Clipboard
+    def get_clipboard_text(self) -> str:
+        return self.clipboard
+
+    def set_clipboard_text(self, text: str):
+        self.clipboard = text
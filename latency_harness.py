@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+SynergyClone uçtan uca gecikme düzeneği - gerçek server ve client kodunu aynı
+makinede, sahte (memory) backend'lerle loopback üzerinden çalıştırır
+
+Server'ın backend'i senaryolu capture olaylarını "donanım" anında, client'ın
+backend'i enjeksiyonları gerçekleştiği anda zaman damgalar. Ölçülenler:
+    glass_to_glass  capture → server → ağ → client → enjeksiyon
+    switch          kenara çarpan hareket → mouse_edge_detection → take_control →
+                    handle_server_message → move_mouse (imleç ışınlama)
+    throughput      beklemesiz senaryoda saniyedeki enjeksiyon
+
+Kullanım:
+    python3 latency_harness.py --save-baseline latency_baseline.json
+    python3 latency_harness.py --baseline latency_baseline.json   # gerileme varsa çıkış kodu 1
+    python3 latency_harness.py --netem wifi                       # kötü Wi-Fi altında
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from time import perf_counter_ns
+
+import logs
+from input_backend import MemoryBackend
+from metrics import LatencyHistogram
+from netem import PROFILES, NetemProxy
+
+SCREEN = (1920, 1080)
+SETTLE_TIMEOUT = 5.0        # Bir olayın karşı tarafa ulaşması için en uzun bekleme (saniye)
+EDGE_POLL_WAIT = 0.12       # İç noktadan kenara itişten önceki bekleme (kenar detektörü yeniden kurulsun)
+REGRESSION_TOLERANCE = 0.25  # Baseline'dan bu oranda kötüleşme gerileme sayılır
+REGRESSION_SLACK_MS = 0.5   # Çok küçük gecikmelerde gürültüyü yutmak için mutlak pay
+
+# Baseline karşılaştırmasında bakılan değerler: (bölüm, alan, büyük değer daha mı iyi?)
+COMPARED = (
+    ("glass_to_glass", "p50_ms", False),
+    ("glass_to_glass", "p99_ms", False),
+    ("switch", "p50_ms", False),
+    ("switch", "p99_ms", False),
+    ("throughput", "delivered_per_s", True),
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(condition, timeout: float = SETTLE_TIMEOUT) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def _summary(histogram: LatencyHistogram) -> dict:
+    snap = histogram.snapshot()
+    return {"count": snap["count"], "mean_ms": snap["mean_ns"] / 1e6, "p50_ms": snap["p50_ns"] / 1e6,
+            "p99_ms": snap["p99_ns"] / 1e6, "p999_ms": snap["p999_ns"] / 1e6,
+            "max_ms": snap["max_ns"] / 1e6}
+
+
+def match_latencies(captured, injected, histogram: LatencyHistogram) -> dict:
+    """Capture ve enjeksiyon kayıtlarını eşleyip gecikmeleri histograma yazar.
+
+    Hareketler client'ta birleştirilebildiği için enjekte edilen hareketler
+    yakalananların sıralı bir alt dizisidir; koordinat (±1px yuvarlama)
+    eşleşene kadar ilerlenir. Tıklama ve tuşlar birebir sırayla eşlenir.
+    """
+    captured_moves = [entry for entry in captured if entry[1] == "move"]
+    captured_other = [entry for entry in captured if entry[1] in ("click", "scroll", "press", "release")]
+    injected_other = [entry for entry in injected if entry[1] in ("click", "scroll", "key")]
+    index = matched = 0
+    for t_inject, kind, *args in injected:
+        if kind != "move":
+            continue
+        while index < len(captured_moves):
+            t_capture, _, x, y = captured_moves[index]
+            index += 1
+            if abs(x - args[0]) <= 1 and abs(y - args[1]) <= 1:
+                histogram.record(t_inject - t_capture)
+                matched += 1
+                break
+    for capture_entry, inject_entry in zip(captured_other, injected_other):
+        histogram.record(inject_entry[0] - capture_entry[0])
+    return {
+        "moves_captured": len(captured_moves),
+        "moves_injected": matched,
+        "moves_coalesced": len(captured_moves) - matched,
+        "other_captured": len(captured_other),
+        "other_injected": len(injected_other),
+    }
+
+
+class Harness:
+    """Aynı süreçte memory backend'li bir server ve bir client; her biri kendi loop thread'inde."""
+
+    def __init__(self, port: int = None, netem: str = None):
+        from client import SynergyClient
+        from server import SynergyServer
+        self.port = port or _free_port()
+        self.server_backend = MemoryBackend(screen_size=SCREEN)
+        self.client_backend = MemoryBackend(screen_size=SCREEN)
+        self.server = SynergyServer(host="127.0.0.1", port=self.port, input_backend=self.server_backend)
+        # Ağ profili verildiyse client server'a bozucu proxy üzerinden bağlanır
+        self.proxy = NetemProxy("127.0.0.1", self.port, profile=netem) if netem else None
+        client_port = self.proxy.start_in_thread() if self.proxy else self.port
+        self.client = SynergyClient(server_host="127.0.0.1", server_port=client_port,
+                                    input_backend=self.client_backend)
+        self._threads = []
+
+    def start(self):
+        self._spawn(self.server.start_server)
+        if not _wait_for(lambda: getattr(self.server_backend, "capturing", False)):
+            raise RuntimeError("Server başlatılamadı")
+        self.client.input_handler.start()
+        self._spawn(self.client.connect_to_server)
+        if not _wait_for(lambda: self.server.client_info):
+            raise RuntimeError("Client bağlanamadı")
+
+    def _spawn(self, coroutine_function):
+        thread = threading.Thread(target=lambda: asyncio.run(coroutine_function()), daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self):
+        self.client.stop()
+        self.server.stop()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self.client.injector.shutdown()
+        self.client.input_handler.stop()
+        if self.proxy:
+            self.proxy.stop_thread()
+
+    def reset(self):
+        """Ölçümler arasında kontrolü server'a al ve kayıtları temizle"""
+        if not self.server.controlling_local:
+            self.server.switch_to_local()
+            _wait_for(lambda: not self.client.controlling)
+        self.client.injector.flush(SETTLE_TIMEOUT)
+        self.server_backend.clear()
+        self.client_backend.clear()
+
+    def measure_switch(self, iterations: int) -> dict:
+        """Kenar hareketinden client'ta imlecin ışınlanmasına kadar geçen süre"""
+        histogram = LatencyHistogram()
+        injected = self.client_backend.injected
+        failures = 0
+        for i in range(iterations):
+            self.reset()
+            y = 200 + (i * 37) % 600
+            self.server_backend.play([("move", SCREEN[0] // 2, y)])
+            time.sleep(EDGE_POLL_WAIT)  # İmleç kenardan uzakta dursun, sonra kenara itilsin
+            self.server_backend.play([("move", SCREEN[0] - 1, y)])
+            edge_ns = self.server_backend.captured[-1][0]
+            if _wait_for(lambda: any(entry[1] == "move" for entry in injected)):
+                warp = next(entry for entry in injected if entry[1] == "move")
+                histogram.record(warp[0] - edge_ns)
+            else:
+                failures += 1
+        result = _summary(histogram)
+        result["failures"] = failures
+        return result
+
+    def _take_control(self):
+        self.reset()
+        self.server.switch_to_client()
+        if not _wait_for(lambda: self.client.controlling):
+            raise RuntimeError("Client kontrolü almadı")
+
+    def _script(self, events: int, interval: float = None):
+        """Benzersiz koordinatlı hareketler; her 50 harekette bir tıklama ve tuş"""
+        script = []
+        for i in range(events):
+            x, y = 100 + i % 1700, 100 + (i // 1700) % 800
+            if i % 50 == 25:
+                script += [("click", x, y, "left", True), ("click", x, y, "left", False),
+                           ("press", "a"), ("release", "a")]
+            else:
+                script.append(("move", x, y))
+            if interval:
+                script.append(("sleep", interval))
+        return script
+
+    def _settle(self, expected_other: int):
+        """Tüm tıklama/tuşlar enjekte edilene ve kuyruk boşalana kadar bekle"""
+        injected = self.client_backend.injected
+        _wait_for(lambda: sum(entry[1] != "move" for entry in injected) >= expected_other)
+        self.client.injector.flush(SETTLE_TIMEOUT)
+
+    def measure_glass_to_glass(self, events: int, rate: float) -> dict:
+        self._take_control()
+        script = self._script(events, 1.0 / rate)
+        self.server_backend.play(script)
+        expected_other = sum(step[0] in ("click", "press", "release") for step in script)
+        self._settle(expected_other)
+        histogram = LatencyHistogram()
+        result = match_latencies(self.server_backend.captured, self.client_backend.injected, histogram)
+        result.update(_summary(histogram))
+        result["rate"] = rate
+        return result
+
+    def measure_throughput(self, events: int) -> dict:
+        self._take_control()
+        script = self._script(events)
+        start = perf_counter_ns()
+        self.server_backend.play(script, realtime=False)
+        captured_ns = perf_counter_ns() - start
+        expected_other = sum(step[0] in ("click", "press", "release") for step in script)
+        self._settle(expected_other)
+        injected = list(self.client_backend.injected)
+        elapsed_ns = (injected[-1][0] if injected else perf_counter_ns()) - start
+        return {
+            "events": len(script),
+            "injected": len(injected),
+            "elapsed_s": elapsed_ns / 1e9,
+            "captured_per_s": len(script) / (captured_ns / 1e9),
+            "injected_per_s": len(injected) / (elapsed_ns / 1e9),
+            "delivered_per_s": len(script) / (elapsed_ns / 1e9),
+        }
+
+
+def run(args) -> dict:
+    harness = Harness(args.port, args.netem)
+    harness.start()
+    try:
+        results = {
+            "glass_to_glass": harness.measure_glass_to_glass(args.events, args.rate),
+            "switch": harness.measure_switch(args.switches),
+            "throughput": harness.measure_throughput(args.throughput_events),
+        }
+    finally:
+        harness.stop()
+    results["config"] = {"events": args.events, "rate": args.rate, "switches": args.switches,
+                         "throughput_events": args.throughput_events, "netem": args.netem,
+                         "python": sys.version.split()[0]}
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float = REGRESSION_TOLERANCE):
+    """(bölüm, alan, baseline, şimdiki, değişim oranı, gerileme mi?) listesi"""
+    rows = []
+    for section, field, higher_is_better in COMPARED:
+        old = baseline.get(section, {}).get(field)
+        new = results.get(section, {}).get(field)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old if old else 0.0
+        if higher_is_better:
+            regressed = new < old * (1 - tolerance)
+        else:
+            regressed = new > old * (1 + tolerance) + REGRESSION_SLACK_MS
+        rows.append((section, field, old, new, change, regressed))
+    return rows
+
+
+def print_results(results: dict):
+    g2g, switch, throughput = results["glass_to_glass"], results["switch"], results["throughput"]
+    print(f"🪟 Glass-to-glass ({g2g['rate']:.0f} olay/s): p50={g2g['p50_ms']:.3f}ms "
+          f"p99={g2g['p99_ms']:.3f}ms p99.9={g2g['p999_ms']:.3f}ms max={g2g['max_ms']:.3f}ms "
+          f"(n={g2g['count']}, birleştirilen hareket {g2g['moves_coalesced']})")
+    print(f"🔀 Kontrol geçişi: p50={switch['p50_ms']:.2f}ms p99={switch['p99_ms']:.2f}ms "
+          f"max={switch['max_ms']:.2f}ms (n={switch['count']}, başarısız {switch['failures']})")
+    print(f"🚀 Throughput: {throughput['injected_per_s']:.0f} enjeksiyon/s, "
+          f"{throughput['delivered_per_s']:.0f} olay/s uçtan uca "
+          f"({throughput['events']} olay, {throughput['elapsed_s']:.2f}s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SynergyClone uçtan uca gecikme düzeneği")
+    parser.add_argument("--events", type=int, default=2000, help="Glass-to-glass olay sayısı")
+    parser.add_argument("--rate", type=float, default=500.0, help="Glass-to-glass olay hızı (olay/s)")
+    parser.add_argument("--switches", type=int, default=20, help="Kontrol geçişi tekrar sayısı")
+    parser.add_argument("--throughput-events", type=int, default=20000,
+                        help="Throughput ölçümündeki olay sayısı")
+    parser.add_argument("--port", type=int, default=None, help="Loopback portu (varsayılan: boş port)")
+    parser.add_argument("--netem", default=None, choices=sorted(PROFILES),
+                        help="Client-server arasına bu ağ profiliyle bozucu proxy koy")
+    parser.add_argument("--json", default=None, metavar="PATH", help="Sonuçları JSON olarak yaz")
+    parser.add_argument("--baseline", default=None, metavar="PATH",
+                        help="Sonuçları bu baseline ile karşılaştır; gerilemede çıkış kodu 1")
+    parser.add_argument("--save-baseline", default=None, metavar="PATH",
+                        help="Sonuçları yeni baseline olarak yaz")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE,
+                        help="Gerileme sayılacak kötüleşme oranı (varsayılan: 0.25)")
+    parser.add_argument("--verbose", action="store_true", help="Server/client loglarını göster")
+    args = parser.parse_args(argv)
+
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(f"Dosya bulunamadı: {args.baseline}")
+    if not args.verbose:
+        logs.set_log_level("warning")
+
+    results = run(args)
+    print_results(results)
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"💾 Sonuçlar yazıldı: {path}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = 0
+    print(f"📏 Baseline karşılaştırması ({args.baseline}, tolerans %{args.tolerance * 100:.0f}):")
+    for section, field, old, new, change, regressed in compare(results, baseline, args.tolerance):
+        regressions += regressed
+        mark = "❌" if regressed else "✅"
+        print(f"   {mark} {section}.{field}: {old:.3f} → {new:.3f} ({change * 100:+.1f}%)")
+    if regressions:
+        print(f"❌ {regressions} gerileme")
+        return 1
+    print("✅ Gerileme yok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+SynergyClone yük üreteci - server'ı loopback üzerinde N sanal client ile zorlar
+
+Server ayrı bir süreçte memory backend ile çalışır (CPU/bellek ölçümü yalnızca
+server'ı kapsasın diye); bu süreç sentetik veya kaydedilmiş input'u yakalama
+yoluna verir. Sanal client'ların hepsi bu süreçte tek asyncio loop'unda
+çalışır: client_info gönderir, kontrol mesajlarını izler ve ilk client her
+--switch-every harekette bir kontrolü geri verir (kenar algılama gibi).
+
+Kullanım:
+    python3 loadgen.py --clients 50 --rate 125 --duration 10
+    python3 loadgen.py --clients 1 --rate 1000 --duration 10 --json load.json
+    python3 loadgen.py --clients 5 --recording session.synrec --speed 2
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from time import perf_counter_ns
+
+import websockets
+
+from loop_monitor import LoopMonitor
+from metrics import LatencyHistogram
+from motion import sleep_until
+from profiler import current_rss_mb
+
+LOADGEN_PORT = 18765
+CONNECT_TIMEOUT = 10.0      # Client'ların bağlanması için beklenecek süre (saniye)
+DRAIN_TIMEOUT = 5.0         # Server bittikten sonra kalan mesajlar için bekleme (saniye)
+SWITCH_EVERY = 500          # İlk client bu kadar hareketten sonra kontrolü geri verir
+INPUT_TYPES = ("mouse_move", "mouse_click", "mouse_scroll", "key_press", "key_release")
+
+
+def peak_rss_mb():
+    """Sürecin tepe bellek kullanımı (MB); ölçülemezse None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def synthetic_events(rate: float, width: int = 1920, height: int = 1080):
+    """(başlangıçtan ns, adım): daire çizen mouse, arada tıklama ve tuş"""
+    interval_ns = 1e9 / rate
+    i = 0
+    while True:
+        angle = i * 2 * math.pi / 500
+        x = int(width / 2 + width / 4 * math.cos(angle))
+        y = int(height / 2 + height / 4 * math.sin(angle))
+        phase = i % 500
+        if phase in (100, 101):
+            step = ("click", x, y, "left", phase == 100)
+        elif phase == 300:
+            step = ("press", "a")
+        elif phase == 301:
+            step = ("release", "a")
+        else:
+            step = ("move", x, y)
+        yield int(i * interval_ns), step
+        i += 1
+
+
+def recorded_events(path: str, speed: float):
+    """Kaydı speed katı hızda, süre dolana kadar başa sararak üretir"""
+    from recording import Recording
+    offset_ns = 0
+    with Recording(path) as recording:
+        while True:
+            first_us = last_ns = None
+            for t_us, step in recording.events():
+                if first_us is None:
+                    first_us = t_us
+                last_ns = int((t_us - first_us) * 1000 / speed)
+                yield offset_ns + last_ns, step
+            if last_ns is None:
+                return
+            offset_ns += last_ns + 1_000_000
+
+
+def run_server_worker(args) -> int:
+    """Alt süreç: server'ı başlatır, client'ları bekler, input'u sürer ve sonucu JSON yazar"""
+    from input_backend import MemoryBackend
+    from recording import capture_target
+    from server import SynergyServer
+
+    server = SynergyServer(host="127.0.0.1", port=args.port, input_backend=MemoryBackend())
+    server.headless = True
+    thread = threading.Thread(target=lambda: asyncio.run(server.start_server()), daemon=True)
+    thread.start()
+
+    result = {}
+    deadline = time.monotonic() + CONNECT_TIMEOUT + args.clients * 0.05
+    while len(server.client_info) < args.clients and time.monotonic() < deadline:
+        time.sleep(0.01)
+    if len(server.client_info) < args.clients:
+        result["error"] = f"{len(server.client_info)}/{args.clients} client bağlandı"
+    else:
+        if args.recording:
+            events = recorded_events(args.recording, args.speed)
+        else:
+            events = synthetic_events(args.rate, server.screen_width, server.screen_height)
+        capture = capture_target(server.input_handler)
+        server.switch_to_client()
+
+        cpu_start = os.times()
+        start_ns = perf_counter_ns()
+        end_ns = start_ns + int(args.duration * 1e9)
+        for offset_ns, step in events:
+            due = start_ns + offset_ns
+            if due >= end_ns:
+                break
+            sleep_until(due, spin_ns=0)  # Meşgul bekleme server CPU'suna sayılırdı
+            if server.controlling_local:
+                server.switch_to_client()  # Client kontrolü geri verdi; hemen tekrar geç
+            capture(step)
+
+        # Loop'a aktarılmış ama henüz gönderilmemiş mesajları bekle
+        drain_deadline = time.monotonic() + DRAIN_TIMEOUT
+        while (server._handoff_submitted > server._handoff_started
+               and time.monotonic() < drain_deadline):
+            time.sleep(0.01)
+        time.sleep(0.1)
+        wall = (perf_counter_ns() - start_ns) / 1e9
+        cpu = os.times()
+        cpu_user, cpu_system = cpu.user - cpu_start.user, cpu.system - cpu_start.system
+        result = {
+            "duration_s": wall,
+            "cpu_user_s": cpu_user,
+            "cpu_system_s": cpu_system,
+            "cpu_percent": 100 * (cpu_user + cpu_system) / wall,
+            "rss_mb": current_rss_mb(),
+            "peak_rss_mb": peak_rss_mb(),
+            "events_out": {name: count for name, count in server.metrics.events_out.items() if count},
+            "control_switches": server.metrics.control_switches,
+            "send_errors": server.metrics.send_errors,
+            "loop_lag_max_ms": server.loop_monitor.max_lag_ns / 1e6,
+            "stages": server.latency.snapshot(),
+        }
+
+    with open(args.result, "w") as f:
+        json.dump(result, f)
+    server.stop()
+    thread.join(timeout=5)
+    return 0 if "error" not in result else 1
+
+
+class VirtualClient:
+    """Tek websocket bağlantısı; gelen olayları sayar ve teslim gecikmesini ölçer.
+
+    Gecikme, server'ın eklediği yakalama zaman damgasıyla (µs) alım anı
+    arasındaki farktır; iki süreç aynı makinede olduğundan perf_counter
+    saati ortaktır.
+    """
+
+    def __init__(self, index: int, latency: LatencyHistogram, switch_every: int = 0,
+                 screen=(1920, 1080)):
+        self.index = index
+        self.screen = screen
+        self.switch_every = switch_every  # 0: kontrolü hiç geri verme
+        self.latency = latency            # Tüm client'larda ortak histogram
+        self.own_latency = LatencyHistogram()
+        self.switch_latency = LatencyHistogram()
+        self.received = {}
+        self.connected = False
+        self.error = None
+        self.controlling = False
+        self._moves = 0
+        self._returned_ns = None
+
+    @property
+    def input_received(self) -> int:
+        return sum(self.received.get(name, 0) for name in INPUT_TYPES)
+
+    async def run(self, uri: str, deadline: float):
+        while True:
+            try:
+                websocket = await websockets.connect(uri, max_size=None, ping_interval=None)
+                break
+            except OSError as e:
+                if time.monotonic() > deadline:
+                    self.error = str(e)
+                    return
+                await asyncio.sleep(0.05)
+        self.connected = True
+        try:
+            await websocket.send(json.dumps({
+                'type': 'client_info',
+                'screen_width': self.screen[0],
+                'screen_height': self.screen[1],
+                'platform': f"loadgen-{self.index}",
+            }))
+            await self._receive(websocket)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            await websocket.close()
+
+    async def _receive(self, websocket):
+        received = self.received
+        async for message in websocket:
+            now_ns = perf_counter_ns()
+            data = json.loads(message)
+            msg_type = data.get('type')
+            received[msg_type] = received.get(msg_type, 0) + 1
+            sent_us = data.get('ts')
+            if sent_us is not None:
+                delay = now_ns - sent_us * 1000
+                self.latency.record(delay)
+                self.own_latency.record(delay)
+
+            if msg_type == 'take_control':
+                self.controlling = True
+                self._moves = 0
+                if self._returned_ns is not None:
+                    self.switch_latency.record(now_ns - self._returned_ns)
+                    self._returned_ns = None
+            elif msg_type == 'release_control':
+                self.controlling = False
+            elif msg_type == 'mouse_move' and self.switch_every and self.controlling:
+                self._moves += 1
+                if self._moves >= self.switch_every:
+                    self.controlling = False
+                    self._returned_ns = perf_counter_ns()
+                    await websocket.send(json.dumps({'type': 'control_returned',
+                                                     'reason': 'edge_detection'}))
+
+
+async def run_clients(args, worker: subprocess.Popen):
+    """Sanal client'ları çalıştırır; server süreci bitince kalan mesajları bekleyip döner"""
+    latency = LatencyHistogram()
+    clients = [VirtualClient(i, latency, args.switch_every if i == 0 else 0)
+               for i in range(args.clients)]
+    monitor = LoopMonitor()
+    monitor.start()
+    uri = f"ws://127.0.0.1:{args.port}"
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    tasks = [asyncio.create_task(client.run(uri, deadline)) for client in clients]
+    while worker.poll() is None:
+        await asyncio.sleep(0.1)
+    done, pending = await asyncio.wait(tasks, timeout=DRAIN_TIMEOUT)
+    for task in pending:
+        task.cancel()
+    monitor.stop()
+    return clients, latency, monitor
+
+
+def _histogram_ms(histogram: LatencyHistogram) -> dict:
+    snap = histogram.snapshot()
+    return {"count": snap["count"], "p50_ms": snap["p50_ns"] / 1e6, "p99_ms": snap["p99_ns"] / 1e6,
+            "p999_ms": snap["p999_ns"] / 1e6, "max_ms": snap["max_ns"] / 1e6}
+
+
+def build_report(args, server: dict, clients, latency: LatencyHistogram, monitor: LoopMonitor) -> dict:
+    sent = sum(server.get("events_out", {}).get(name, 0) for name in INPUT_TYPES)
+    per_client = []
+    for client in clients:
+        per_client.append({
+            "index": client.index,
+            "connected": client.connected,
+            "error": client.error,
+            "received": client.input_received,
+            "lost": sent - client.input_received,
+            "take_control": client.received.get("take_control", 0),
+            "latency": _histogram_ms(client.own_latency),
+        })
+    expected = sent * len(clients)
+    lost = sum(item["lost"] for item in per_client)
+    return {
+        "config": {"clients": args.clients, "rate": args.rate, "duration_s": args.duration,
+                   "recording": args.recording, "speed": args.speed,
+                   "switch_every": args.switch_every},
+        "server": server,
+        "delivery_latency": _histogram_ms(latency),
+        "switch_round_trip": _histogram_ms(clients[0].switch_latency) if clients else None,
+        "sent": sent,
+        "expected": expected,
+        "lost": lost,
+        "loss_ratio": lost / expected if expected else 0.0,
+        "loadgen_loop_lag_max_ms": monitor.max_lag_ns / 1e6,
+        "clients": per_client,
+    }
+
+
+def print_report(report: dict):
+    config, server = report["config"], report["server"]
+    source = f"kayıt {config['recording']} x{config['speed']}" if config["recording"] \
+        else f"{config['rate']:.0f} olay/s"
+    print(f"🧪 Yük: {config['clients']} client, {source}, {config['duration_s']:.1f}s")
+    if "error" in server:
+        print(f"❌ Server: {server['error']}")
+        return
+    rss, peak = server["rss_mb"], server["peak_rss_mb"]  # Windows'ta ölçülemez (None)
+    print(f"🖥️ Server: CPU %{server['cpu_percent']:.1f} (user {server['cpu_user_s']:.2f}s, "
+          f"sys {server['cpu_system_s']:.2f}s), "
+          + (f"RSS {rss:.1f}MB" if rss is not None else "RSS ölçülemedi")
+          + (f" (tepe {peak:.1f}MB)" if peak else "")
+          + f", loop gecikmesi max {server['loop_lag_max_ms']:.1f}ms")
+    print(f"   {report['sent']} girdi olayı, {server['control_switches']} kontrol geçişi, "
+          f"{server['send_errors']} gönderim hatası")
+    lat = report["delivery_latency"]
+    print(f"📬 Teslim gecikmesi: p50={lat['p50_ms']:.2f}ms p99={lat['p99_ms']:.2f}ms "
+          f"p99.9={lat['p999_ms']:.2f}ms max={lat['max_ms']:.2f}ms (n={lat['count']})")
+    switch = report["switch_round_trip"]
+    if switch and switch["count"]:
+        print(f"🔁 Kontrol geri verme → yeniden alma: p50={switch['p50_ms']:.2f}ms "
+              f"p99={switch['p99_ms']:.2f}ms (n={switch['count']})")
+    worst = max(report["clients"], key=lambda item: item["lost"])
+    print(f"📉 Kayıp: {report['lost']}/{report['expected']} (%{100 * report['loss_ratio']:.3f}), "
+          f"en kötü client #{worst['index']}: {worst['lost']}")
+    failed = [item["index"] for item in report["clients"] if not item["connected"]]
+    if failed:
+        print(f"⚠️ Bağlanamayan client'lar: {failed}")
+    if report["loadgen_loop_lag_max_ms"] > 50:
+        print(f"⚠️ Yük üreteci loop'u {report['loadgen_loop_lag_max_ms']:.0f}ms gecikti; "
+              f"gecikmeler üretecin kendisiyle sınırlı olabilir")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SynergyClone yük üreteci (loopback)")
+    parser.add_argument("--clients", type=int, default=10, help="Sanal client sayısı")
+    parser.add_argument("--rate", type=float, default=125.0, help="Sentetik input hızı (olay/s)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Süre (saniye)")
+    parser.add_argument("--recording", default=None, help="Sentetik yerine oynatılacak .synrec kaydı")
+    parser.add_argument("--speed", type=float, default=1.0, help="Kayıt oynatma hızı (kat)")
+    parser.add_argument("--switch-every", type=int, default=SWITCH_EVERY,
+                        help="İlk client bu kadar hareketten sonra kontrolü geri verir (0: hiç)")
+    parser.add_argument("--port", type=int, default=LOADGEN_PORT, help="Loopback portu")
+    parser.add_argument("--json", default=None, metavar="PATH", help="Raporu JSON olarak yaz")
+    parser.add_argument("--verbose", action="store_true", help="Server loglarını göster")
+    parser.add_argument("--server-worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.server_worker:
+        return run_server_worker(args)
+    if args.recording and not os.path.exists(args.recording):
+        parser.error(f"Dosya bulunamadı: {args.recording}")
+    if args.clients < 1 or args.rate <= 0 or args.speed <= 0:
+        parser.error("--clients, --rate ve --speed pozitif olmalı")
+
+    fd, result_path = tempfile.mkstemp(prefix="synergy_loadgen_", suffix=".json")
+    os.close(fd)
+    command = [sys.executable, os.path.abspath(__file__), "--server-worker", "--result", result_path,
+               "--clients", str(args.clients), "--rate", str(args.rate),
+               "--duration", str(args.duration), "--speed", str(args.speed), "--port", str(args.port)]
+    if args.recording:
+        command += ["--recording", args.recording]
+    worker = subprocess.Popen(command, stdout=None if args.verbose else subprocess.DEVNULL)
+    try:
+        clients, latency, monitor = asyncio.run(run_clients(args, worker))
+        with open(result_path) as f:
+            server = json.load(f) if os.path.getsize(result_path) else {"error": "sonuç yok"}
+    finally:
+        if worker.poll() is None:
+            worker.terminate()
+        os.unlink(result_path)
+
+    report = build_report(args, server, clients, latency, monitor)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Rapor yazıldı: {args.json}")
+    return 0 if "error" not in server else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
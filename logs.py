@@ -0,0 +1,214 @@
+"""
+SynergyClone log altyapısı - seviyeli logger, sabit kapasiteli log halkası ve GUI'ye toplu aktarım
+"""
+
+import itertools
+import os
+import sys
+import time
+import weakref
+from collections import deque
+
+# Log seviyeleri
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+
+# Varsayılan kapasiteler
+LOG_RING_CAPACITY = 5000    # Bellekte tutulan en fazla satır
+GUI_MAX_LINES = 1000        # Log widget'ında tutulan en fazla satır
+GUI_FLUSH_FPS = 10          # Widget'ın saniyedeki güncellenme sayısı
+
+
+class LogRing:
+    """Sabit kapasiteli, her thread'den eklenebilen log halkası.
+
+    Ekleme kilitsizdir (sinyal handler'ından gelen log da kilitlenmeden yazılır);
+    bu yüzden iki thread arasında numaralar halkaya sırasız girebilir. Okuyucular
+    son gördükleri numaradan büyükleri sıralayarak ister. Dolduğunda en eski
+    satırlar düşer.
+    """
+
+    def __init__(self, capacity: int = LOG_RING_CAPACITY):
+        self.capacity = capacity
+        self._buffer = deque(maxlen=capacity)
+        self._counter = itertools.count(1)
+
+    def append(self, line: str):
+        # next() ve deque.append GIL altında atomik; ikisi arasında başka thread girebilir
+        self._buffer.append((next(self._counter), line))
+
+    def since(self, last_seq: int):
+        """last_seq'ten sonraki satırları (son sıra no, satırlar, atlanan) olarak döndürür."""
+        snapshot = list(self._buffer)  # C seviyesinde tek adımda kopyalanır
+        new = sorted(entry for entry in snapshot if entry[0] > last_seq)
+        if not new:
+            return last_seq, [], 0
+        newest = new[-1][0]
+        # Halkadan düşen (ya da numarası alınıp henüz eklenmemiş) satırlar
+        skipped = newest - last_seq - len(new)
+        return newest, [line for _, line in new], skipped
+
+    def lines(self):
+        """Halkadaki tüm satırları döndürür."""
+        return [line for _, line in list(self._buffer)]
+
+    def __len__(self):
+        return len(self._buffer)
+
+
+class GuiLogFlusher:
+    """LogRing'deki yeni satırları root.after ile sabit aralıklarla Text widget'ına aktarır.
+
+    Sadece Tk thread'inde çalışır; widget'a tek seferde ekler ve max_lines
+    satırın üzerini baştan siler.
+    """
+
+    def __init__(self, root, text_widget, ring: LogRing,
+                 fps: int = GUI_FLUSH_FPS, max_lines: int = GUI_MAX_LINES):
+        self.root = root
+        self.text = text_widget
+        self.ring = ring
+        self.interval_ms = max(1, int(1000 / fps))
+        self.max_lines = max_lines
+        self.last_seq = 0
+        self._job = None
+
+    def start(self):
+        self._job = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def _tick(self):
+        try:
+            self.flush()
+        finally:
+            self._job = self.root.after(self.interval_ms, self._tick)
+
+    def flush(self):
+        """Bekleyen satırları widget'a yazar; yazılan satır sayısını döndürür."""
+        self.last_seq, lines, skipped = self.ring.since(self.last_seq)
+        if not lines:
+            return 0
+        if skipped:
+            lines.insert(0, f"... {skipped} satır atlandı")
+
+        self.text.insert("end", "\n".join(lines) + "\n")
+
+        # Widget'ı max_lines satırla sınırla (sondaki boş satır hariç)
+        line_count = int(self.text.index("end-1c").split(".")[0]) - 1
+        excess = line_count - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+
+        self.text.see("end")
+        return len(lines)
+
+
+def parse_level(level) -> int:
+    """'debug', 'INFO' veya sayısal değeri seviye numarasına çevirir."""
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVEL_NAMES[str(level).lower()]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen log seviyesi: {level}")
+
+
+_default_level = parse_level(os.environ.get("SYNERGY_LOG_LEVEL", "info"))
+_loggers = weakref.WeakSet()
+_named_loggers = {}
+
+
+def _print_sink(level, message):
+    print(message)
+
+
+class Logger:
+    """Seviyeli ve çağrı noktası bazında hız sınırlamalı logger.
+
+    Mesajlar `%` biçiminde argümanlarla verilir ve seviye kapalıysa hiç
+    biçimlendirilmez. Sıcak yollarda `debug_enabled` / `info_enabled`
+    bayraklarıyla argüman hazırlığı da atlanabilir. `every=saniye` verilen
+    çağrılar aynı satırdan en fazla o sıklıkla yazılır; aradaki mesajlar
+    sayılıp bir sonraki mesaja eklenir.
+    """
+
+    def __init__(self, name: str, level=None, sink=None):
+        self.name = name
+        self.sink = sink or _print_sink
+        self._sites = {}  # (kod, satır) -> [son yazım zamanı (None: henüz yok), bastırılan sayısı]
+        self.set_level(_default_level if level is None else level)
+        _loggers.add(self)
+
+    def set_level(self, level):
+        self.level = parse_level(level)
+        self.debug_enabled = self.level <= DEBUG
+        self.info_enabled = self.level <= INFO
+
+    def is_enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def _emit(self, level, fmt, args, every):
+        suppressed = 0
+        if every is not None:
+            frame = sys._getframe(2)
+            key = (frame.f_code, frame.f_lineno)
+            now = time.monotonic()
+            # Site kaydı setdefault ile tek adımda eklenir ve yerinde güncellenir; iki thread
+            # aynı satırdan yazarsa biri diğerinin sayacını silmez. Aynı anda gelen
+            # artırma ve sıfırlama arasında bir bastırma sayısı kaybolabilir (yalnızca
+            # rapordaki sayıyı etkiler); bunun için sıcak yola kilit eklenmez.
+            site = self._sites.get(key) or self._sites.setdefault(key, [None, 0])
+            last = site[0]
+            if last is not None and now - last < every:
+                site[1] += 1
+                return
+            site[0] = now
+            suppressed, site[1] = site[1], 0
+
+        message = fmt % args if args else fmt
+        if suppressed:
+            message = f"{message} ({suppressed:,} benzer mesaj bastırıldı)"
+        self.sink(level, message)
+
+    def debug(self, fmt, *args, every=None):
+        if self.level <= DEBUG:
+            self._emit(DEBUG, fmt, args, every)
+
+    def info(self, fmt, *args, every=None):
+        if self.level <= INFO:
+            self._emit(INFO, fmt, args, every)
+
+    def warning(self, fmt, *args, every=None):
+        if self.level <= WARNING:
+            self._emit(WARNING, fmt, args, every)
+
+    def error(self, fmt, *args, every=None):
+        if self.level <= ERROR:
+            self._emit(ERROR, fmt, args, every)
+
+
+def get_logger(name: str) -> Logger:
+    """Modül seviyesi paylaşılan logger'ı döndürür (stdout'a yazar)."""
+    logger = _named_loggers.get(name)
+    if logger is None:
+        logger = _named_loggers[name] = Logger(name)
+    return logger
+
+
+def set_log_level(level):
+    """Varsayılan seviyeyi ve mevcut tüm logger'ların seviyesini ayarlar."""
+    global _default_level
+    _default_level = parse_level(level)
+    for logger in list(_loggers):
+        logger.set_level(_default_level)
@@ -0,0 +1,127 @@
+"""
+SynergyClone loop izleyici - asyncio loop gecikmesini ölçer ve tıkanmaya yol açan kodu yakalar
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from collections import deque
+from time import perf_counter_ns
+
+from metrics import LatencyHistogram
+
+LOOP_CHECK_INTERVAL = 0.02    # Loop içindeki nabız aralığı (saniye)
+LOOP_STALL_THRESHOLD = 0.1    # Bu süreden uzun nabızsızlık tıkanma sayılır (saniye)
+STALL_HISTORY = 50            # Hatırlanan son tıkanma sayısı
+STALL_STACK_DEPTH = 4         # Tıkanma kaydındaki en içteki çerçeve sayısı
+
+
+def _format_stack(frame, depth: int = STALL_STACK_DEPTH) -> str:
+    """En içteki çerçeveden başlayarak 'fonksiyon (dosya:satır)' listesi"""
+    parts = []
+    while frame is not None and len(parts) < depth:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return " ← ".join(parts) if parts else "?"
+
+
+class LoopMonitor:
+    """Loop içinde çalışan bir nabız coroutine'i ve loop dışında bir bekçi thread'i.
+
+    Nabız, her uyanışında planlanandan ne kadar geç kaldığını (loop gecikmesi)
+    histograma yazar. Bekçi, nabız eşikten uzun süre gelmezse loop thread'inin
+    o anki yığınını alır; böylece tıkanmaya hangi callback'in yol açtığı
+    kaydedilir. Tıkanma bitince toplam süresiyle birlikte loglanır.
+    """
+
+    def __init__(self, interval: float = LOOP_CHECK_INTERVAL,
+                 stall_threshold: float = LOOP_STALL_THRESHOLD, logger=None):
+        self.interval = interval
+        self.stall_threshold_ns = int(stall_threshold * 1e9)
+        self.logger = logger
+        self.lag = LatencyHistogram()
+        self.stalls = deque(maxlen=STALL_HISTORY)  # (süre ns, yığın)
+        self.stall_count = 0
+        self._last_beat = 0
+        self._stall_stack = None
+        self._loop_thread_id = None
+        self._task = None
+        self._watchdog = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def max_lag_ns(self) -> int:
+        return self.lag.max_ns
+
+    def start(self):
+        """Çalışan loop'un içinden çağrılmalı"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = perf_counter_ns()
+        # Her bekçi kendi olayını argüman olarak alır; stop/start art arda gelse de
+        # eski bekçi set edilmiş olayını görüp kapanır, yenisininkini paylaşmaz
+        self._stop = stop = threading.Event()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, args=(stop,), name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._watchdog = None
+
+    async def _heartbeat(self):
+        interval_ns = int(self.interval * 1e9)
+        while True:
+            expected = perf_counter_ns() + interval_ns
+            await asyncio.sleep(self.interval)
+            now = perf_counter_ns()
+            self.lag.record(now - expected)
+            stalled_ns = now - self._last_beat
+            self._last_beat = now
+            if self._stall_stack is not None:
+                self._finish_stall(stalled_ns)
+
+    def _watch(self, stop: threading.Event):
+        while not stop.wait(self.interval):
+            if self._stall_stack is not None:
+                continue
+            if perf_counter_ns() - self._last_beat < self.stall_threshold_ns:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            self._stall_stack = _format_stack(frame)
+
+    def _finish_stall(self, stalled_ns: int):
+        stack, self._stall_stack = self._stall_stack, None
+        if stalled_ns < self.stall_threshold_ns:
+            return  # Bekçi nabızla aynı anda uyandı; gerçek tıkanma değil
+        self.stall_count += 1
+        self.stalls.append((stalled_ns, stack))
+        if self.logger:
+            self.logger.warning("🐢 Loop %.0fms tıkandı: %s", stalled_ns / 1e6, stack, every=1.0)
+
+    def snapshot(self) -> dict:
+        return {
+            "lag": self.lag.snapshot(),
+            "stall_count": self.stall_count,
+            "recent_stalls": [{"duration_ns": duration, "stack": stack}
+                              for duration, stack in self.stalls],
+        }
+
+    def report(self) -> str:
+        snap = self.lag.snapshot()
+        lines = [f"🫀 Loop gecikmesi: p50={snap['p50_ns'] / 1e6:.2f}ms "
+                 f"p99={snap['p99_ns'] / 1e6:.2f}ms max={snap['max_ns'] / 1e6:.2f}ms, "
+                 f"tıkanma: {self.stall_count}"]
+        for duration, stack in list(self.stalls)[-5:]:
+            lines.append(f"   {duration / 1e6:7.0f}ms  {stack}")
+        return "\n".join(lines)
@@ -0,0 +1,301 @@
+"""
+SynergyClone metrikleri - aşama bazında gecikme histogramları, sayaçlar ve
+Prometheus metin formatında yerel HTTP uç noktası
+"""
+
+import asyncio
+import json
+from array import array
+
+from utils import MessageType
+
+# Varsayılan histogram ayarları
+SUB_BUCKET_BITS = 5                 # Her ikinin kuvveti aralığında 32 alt kova (~%3 hassasiyet)
+MAX_TRACKABLE_NS = 60 * 10**9       # Bunun üstündeki değerler son kovaya yazılır
+
+# Hattaki aşamalar (sırasıyla)
+SERVER_STAGES = ("capture", "handoff", "encode", "send")
+CLIENT_STAGES = ("decode", "dispatch", "inject")
+
+# Sayaçlarda etiket olarak kullanılan mesaj tipleri; bilinmeyenler "other" sayılır
+EVENT_TYPES = tuple(t.value for t in MessageType) + (
+    "take_control", "release_control", "control_returned", "client_info", "trace_sync",
+    "profile", "other")
+
+SUMMARY_QUANTILES = (0.5, 0.99, 0.999)
+METRICS_HOST = "127.0.0.1"
+
+
+class LatencyHistogram:
+    """Log-lineer (HDR tarzı) nanosaniye histogramı.
+
+    Küçük değerler (< 2^(bits+1)) kendi kovalarına, büyük değerler her ikinin
+    kuvveti aralığı 2^bits alt kovaya bölünerek yazılır; göreli hata
+    2^-bits ile sınırlıdır. Kovalar baştan ayrılmış bir array'dir, kayıt
+    sırasında liste/sözlük büyümez. Her aşamaya tek thread yazması beklenir.
+    """
+
+    __slots__ = ("sub_bucket_bits", "_direct_limit", "counts", "count", "total_ns",
+                 "max_ns", "_last_index")
+
+    def __init__(self, sub_bucket_bits: int = SUB_BUCKET_BITS,
+                 max_trackable_ns: int = MAX_TRACKABLE_NS):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._direct_limit = 1 << (sub_bucket_bits + 1)
+        self._last_index = self._index(max_trackable_ns)
+        self.counts = array("Q", bytes(8 * (self._last_index + 1)))
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def _index(self, value_ns: int) -> int:
+        shift = value_ns.bit_length() - self.sub_bucket_bits - 1
+        if shift <= 0:
+            return value_ns
+        return (shift << self.sub_bucket_bits) + (value_ns >> shift)
+
+    def _bucket_high(self, index: int) -> int:
+        """Kovadaki en büyük değer"""
+        if index < self._direct_limit:
+            return index
+        shift = (index >> self.sub_bucket_bits) - 1
+        top = index - (shift << self.sub_bucket_bits)
+        return ((top + 1) << shift) - 1
+
+    def record(self, value_ns: int):
+        if value_ns < 0:
+            value_ns = 0
+        shift = value_ns.bit_length() - self.sub_bucket_bits - 1
+        if shift <= 0:
+            index = value_ns
+        else:
+            index = (shift << self.sub_bucket_bits) + (value_ns >> shift)
+            if index > self._last_index:
+                index = self._last_index
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def value_at_quantile(self, quantile: float) -> int:
+        """quantile (0-1) için kova üst sınırını döndürür (en fazla gözlenen max)"""
+        if not self.count:
+            return 0
+        target = max(1, int(quantile * self.count + 0.5))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            if bucket:
+                seen += bucket
+                if seen >= target:
+                    if index == self._last_index:
+                        return self.max_ns
+                    return min(self._bucket_high(index), self.max_ns)
+        return self.max_ns
+
+    def reset(self):
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ns": self.total_ns // self.count if self.count else 0,
+            "p50_ns": self.value_at_quantile(0.50),
+            "p99_ns": self.value_at_quantile(0.99),
+            "p999_ns": self.value_at_quantile(0.999),
+            "max_ns": self.max_ns,
+        }
+
+
+class PipelineLatency:
+    """Aşama adı -> LatencyHistogram. Sıcak yollar histogramı bir kez alıp saklar."""
+
+    def __init__(self, stages=()):
+        self.stages = {}
+        for name in stages:
+            self.stage(name)
+
+    def stage(self, name: str) -> LatencyHistogram:
+        histogram = self.stages.get(name)
+        if histogram is None:
+            histogram = self.stages[name] = LatencyHistogram()
+        return histogram
+
+    def reset(self):
+        for histogram in self.stages.values():
+            histogram.reset()
+
+    def snapshot(self) -> dict:
+        return {name: histogram.snapshot() for name, histogram in self.stages.items()}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def dump(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.to_json())
+
+    def report(self) -> str:
+        lines = ["⏱️ Aşama gecikmeleri (µs):"]
+        for name, histogram in self.stages.items():
+            if not histogram.count:
+                continue
+            snap = histogram.snapshot()
+            lines.append(f"   {name:<9} n={snap['count']:<8} "
+                         f"p50={snap['p50_ns'] / 1000:9.1f} "
+                         f"p99={snap['p99_ns'] / 1000:9.1f} "
+                         f"p99.9={snap['p999_ns'] / 1000:9.1f} "
+                         f"max={snap['max_ns'] / 1000:9.1f}")
+        if len(lines) == 1:
+            lines.append("   (henüz örnek yok)")
+        return "\n".join(lines)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Sıcak yolda doğrudan artırılan düz int sayaçlar ve okuma anında hesaplanan göstergeler.
+
+    Yazan taraf alanları kendisi artırır (ör. `metrics.send_errors += 1`,
+    `metrics.events_out[msg_type] += 1`); kilit veya fonksiyon çağrısı yoktur.
+    enabled False ise mesaj başına sayaçlar (events_*, bytes_*) güncellenmez.
+    render() Prometheus metin formatını (0.0.4) üretir.
+    """
+
+    def __init__(self, prefix: str, latency: PipelineLatency = None):
+        self.prefix = prefix
+        self.latency = latency
+        self.enabled = True
+        self.events_in = dict.fromkeys(EVENT_TYPES, 0)
+        self.events_out = dict.fromkeys(EVENT_TYPES, 0)
+        self.bytes_in = {}      # bağlantı nesnesi -> byte
+        self.bytes_out = {}
+        self.peer_labels = {}   # bağlantı nesnesi -> "ip:port"
+        self.send_errors = 0
+        self.control_switches = 0
+        self.reconnects = 0
+        self._gauges = []       # (ad, açıklama, fonksiyon, etiket adı, tip)
+
+    def add_peer(self, key, label: str):
+        self.peer_labels[key] = label
+        self.bytes_in[key] = 0
+        self.bytes_out[key] = 0
+
+    def remove_peer(self, key):
+        self.peer_labels.pop(key, None)
+        self.bytes_in.pop(key, None)
+        self.bytes_out.pop(key, None)
+
+    def gauge(self, name: str, help_text: str, func, label: str = None, kind: str = "gauge"):
+        """Scrape anında func() çağrılır; label verilirse func {etiket: değer} döndürür.
+
+        Başka bir nesnede tutulan sayaçlar kind="counter" ile aynı yoldan sunulur.
+        """
+        self._gauges.append((name, help_text, func, label, kind))
+
+    def render(self) -> str:
+        p = self.prefix
+        lines = []
+
+        def header(name, help_text, kind):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+
+        header("events_total", "Mesaj tipine göre gönderilen/alınan mesaj sayısı", "counter")
+        for direction, events in (("in", self.events_in), ("out", self.events_out)):
+            for msg_type, count in list(events.items()):
+                if count:
+                    lines.append(f'{p}_events_total{{direction="{direction}",type="{msg_type}"}} {count}')
+
+        header("bytes_total", "Bağlantı başına gönderilen/alınan byte", "counter")
+        for direction, counters in (("in", self.bytes_in), ("out", self.bytes_out)):
+            for key, count in list(counters.items()):
+                peer = _escape_label(self.peer_labels.get(key, "?"))
+                lines.append(f'{p}_bytes_total{{direction="{direction}",peer="{peer}"}} {count}')
+
+        for name, help_text, value in (
+                ("send_errors_total", "Mesaj gönderme hataları", self.send_errors),
+                ("control_switches_total", "Kontrol geçişleri", self.control_switches),
+                ("reconnects_total", "Yeniden bağlanma denemeleri", self.reconnects)):
+            header(name, help_text, "counter")
+            lines.append(f"{p}_{name} {value}")
+
+        for name, help_text, func, label, kind in self._gauges:
+            header(name, help_text, kind)
+            try:
+                value = func()
+            except Exception:
+                continue
+            if label is None:
+                lines.append(f"{p}_{name} {value}")
+            else:
+                for label_value, item in value.items():
+                    lines.append(f'{p}_{name}{{{label}="{_escape_label(label_value)}"}} {item}')
+
+        if self.latency is not None:
+            name = f"{p}_stage_latency_seconds"
+            lines.append(f"# HELP {name} Aşama bazında gecikme")
+            lines.append(f"# TYPE {name} summary")
+            for stage, histogram in self.latency.stages.items():
+                if not histogram.count:
+                    continue
+                for quantile in SUMMARY_QUANTILES:
+                    value = histogram.value_at_quantile(quantile) / 1e9
+                    lines.append(f'{name}{{stage="{stage}",quantile="{quantile}"}} {value:.9f}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.total_ns / 1e9:.9f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsEndpoint:
+    """Çalışan asyncio loop'unda /metrics sunan minimal HTTP sunucusu (ek thread yok)."""
+
+    def __init__(self, metrics: Metrics, port: int, host: str = METRICS_HOST):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            while True:  # Başlıkları atla
+                line = await asyncio.wait_for(reader.readline(), timeout=5)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+            parts = request.decode("latin-1").split()
+            path = parts[1].split("?")[0] if len(parts) > 1 else ""
+            if path in ("/", "/metrics"):
+                status, body = "200 OK", self.metrics.render().encode("utf-8")
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+SynergyClone hareket yumuşatma - uzak imleç hareketleri için uyarlanabilir jitter buffer
+ve gecikmeyi gizleyen hareket tahmini
+
+Kaydedilmiş bir hareket izinde tahmin hatası ve gizlenen gecikme:
+    python3 run_client.py --host 192.168.1.100 --record-motion motion.json
+    python3 motion.py evaluate motion.json --lead-ms 5
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from time import perf_counter_ns
+
+SPIN_THRESHOLD_NS = 1_500_000   # Hedefe bu kadar kala sleep yerine perf_counter_ns ile bekle
+JITTER_MIN_DELAY_MS = 1.0       # Buffer'ın ekleyebileceği en az gecikme
+JITTER_MAX_DELAY_MS = 50.0      # Buffer'ın ekleyebileceği en fazla gecikme
+JITTER_WINDOW = 128             # Gecikme/jitter istatistiği için son kare sayısı
+JITTER_PERCENTILE = 0.95        # Hedef gecikme: bu yüzdelikteki jitter
+JITTER_UPDATE_EVERY = 16        # Hedef gecikme kaç karede bir yeniden hesaplanır
+JITTER_SHRINK = 16              # Gecikme azalırken hedefe yaklaşma oranı (1/N)
+
+PREDICT_MAX_MS = 40.0           # Son kareden en fazla bu kadar ileriye tahmin yapılır
+PREDICT_MAX_PX = 64             # Tahmin son gerçek konumdan en fazla bu kadar uzaklaşır
+PREDICT_RECONCILE_MS = 24.0     # Gerçek kare gelince tahmin hatası bu sürede sıfırlanır
+PREDICT_LATE_FACTOR = 1.5       # Kare aralığının bu katı kadar kare gelmezse kare gecikmiş sayılır
+PREDICT_DEFAULT_INTERVAL_MS = 8.0
+EVAL_TICK_MS = 1.0              # Çevrimdışı değerlendirmede ekran örnekleme aralığı
+EVAL_MIN_SPEED = 0.2            # Gecikme hesabına katılan en düşük hız (px/ms)
+
+
+def sleep_until(deadline_ns: int, spin_ns: int = SPIN_THRESHOLD_NS, clock=perf_counter_ns):
+    """deadline_ns anına kadar bekler: uzak hedefte time.sleep, son kısımda meşgul bekleme.
+
+    İşletim sistemi uykusu ~1ms (Windows'ta ~15ms) hassasiyette uyandığından
+    son spin_ns aralığı perf_counter_ns ile döngüde beklenir.
+    """
+    remaining = deadline_ns - clock()
+    if remaining > spin_ns:
+        time.sleep((remaining - spin_ns) / 1e9)
+    while clock() < deadline_ns:
+        pass
+
+
+class JitterBuffer:
+    """Gönderen zaman damgalarına göre olayları orijinal aralıklarıyla oynatan uyarlanabilir buffer.
+
+    Her kare için geçiş süresi (varış - gönderim) ölçülür; iki saat arasındaki
+    sabit fark pencere içindeki en küçük geçiş süresiyle (taban) elenir.
+    Tabanın üstündeki kısım jitter'dır; buffer gecikmesi pencerenin
+    JITTER_PERCENTILE jitter'ına ayarlanır (artarken hemen, azalırken yavaşça).
+    Kare, gönderim zamanı + taban + gecikme anında sink'e verilir. Geç kalan
+    ardışık hareket kareleri atlanıp en sonuncusu oynatılır; tıklama ve tuş
+    olayları atlanmaz, sıraları korunur.
+    """
+
+    def __init__(self, sink, min_delay_ms: float = JITTER_MIN_DELAY_MS,
+                 max_delay_ms: float = JITTER_MAX_DELAY_MS, window: int = JITTER_WINDOW,
+                 clock=perf_counter_ns):
+        self.sink = sink  # sink(func, args, birleştirilebilir) - oynatma anında çağrılır
+        self.min_delay_ns = int(min_delay_ms * 1e6)
+        self.max_delay_ns = int(max_delay_ms * 1e6)
+        self.clock = clock
+        self.delay_ns = self.min_delay_ns
+        self.played = 0
+        self.skipped = 0
+        self.late = 0
+        self._transits = deque(maxlen=window)
+        self._base_ns = None
+        self._since_update = 0
+        self._queue = deque()  # (oynatma anı, func, args, birleştirilebilir)
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def schedule(self, sender_ns: int, arrival_ns: int) -> int:
+        """Kareyi istatistiğe ekler ve oynatma anını (yerel saat, ns) döndürür."""
+        transit = arrival_ns - sender_ns
+        transits = self._transits
+        if len(transits) == transits.maxlen and transits[0] == self._base_ns:
+            self._base_ns = None  # Taban pencereden çıkıyor; yeniden hesapla
+        transits.append(transit)
+        if self._base_ns is None:
+            self._base_ns = min(transits)
+        elif transit < self._base_ns:
+            self._base_ns = transit
+
+        self._since_update += 1
+        if self._since_update >= JITTER_UPDATE_EVERY:
+            self._since_update = 0
+            self._update_delay()
+        return sender_ns + self._base_ns + self.delay_ns
+
+    def _update_delay(self):
+        jitter = sorted(t - self._base_ns for t in self._transits)
+        target = jitter[min(len(jitter) - 1, int(JITTER_PERCENTILE * len(jitter)))]
+        target = max(self.min_delay_ns, min(self.max_delay_ns, target))
+        if target > self.delay_ns:
+            self.delay_ns = target
+        else:
+            self.delay_ns += (target - self.delay_ns) // JITTER_SHRINK
+
+    def start(self):
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="jitter-playout", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def push(self, sender_us, coalescable: bool, func, args):
+        """Olayı gönderen zaman damgasıyla (µs) kuyruğa ekler; damga yoksa hemen oynatılır."""
+        now = self.clock()
+        due = now if sender_us is None else max(now, self.schedule(sender_us * 1000, now))
+        with self._cond:
+            self._queue.append((due, func, args, coalescable))
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        return {"delay_ms": self.delay_ns / 1e6, "depth": self.depth, "played": self.played,
+                "skipped": self.skipped, "late": self.late}
+
+    def _run(self):
+        queue = self._queue
+        while True:
+            with self._cond:
+                while not queue and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                due, func, args, coalescable = queue[0]
+
+            now = self.clock()
+            if due > now:
+                sleep_until(due, clock=self.clock)
+            elif now - due > self.min_delay_ns:
+                self.late += 1
+
+            with self._cond:
+                queue.popleft()
+                # Geride kalındıysa sıradaki hareket de zamanı gelmişse bunu atla
+                if coalescable and queue and queue[0][3] and queue[0][0] <= self.clock():
+                    self.skipped += 1
+                    continue
+            self.sink(func, args, coalescable)
+            self.played += 1
+
+
+class MotionPredictor:
+    """Son hız ve ivmeden imleç konumu tahmini (tek thread'den kullanılır).
+
+    observe() her gerçek karede, predict() kare gecikmişken çağrılır; ikisi de
+    o an gösterilecek konumu döndürür. Tahmin süresi max_extrapolation_ms,
+    uzaklığı max_distance_px ile sınırlıdır. Gerçek kare tahminden farklı
+    gelirse imleç sıçramaz: aradaki fark reconcile_ms içinde doğrusal olarak
+    sıfırlanır. lead_ms > 0 ise her kare bu kadar ileriye tahmin edilir
+    (bilinen ağ gecikmesini gizlemek için).
+    """
+
+    def __init__(self, max_extrapolation_ms: float = PREDICT_MAX_MS,
+                 max_distance_px: float = PREDICT_MAX_PX,
+                 reconcile_ms: float = PREDICT_RECONCILE_MS, lead_ms: float = 0.0):
+        self.max_extrapolation_ns = int(max_extrapolation_ms * 1e6)
+        self.max_distance_px = max_distance_px
+        self.reconcile_ns = int(reconcile_ms * 1e6)
+        self.lead_ns = int(lead_ms * 1e6)
+        self.predictions = 0
+        self.reset()
+
+    def reset(self):
+        """Durumu sıfırla (ör. kontrol alınıp imleç ışınlandığında)"""
+        self.interval_ns = int(PREDICT_DEFAULT_INTERVAL_MS * 1e6)
+        self._last = None           # (t, x, y)
+        self._last_sender = None
+        self._velocity = (0.0, 0.0)  # px/ns
+        self._accel = (0.0, 0.0)     # px/ns²
+        self._correction = None     # (dx, dy, başlangıç) - sönümlenen tahmin hatası
+        self._shown = None          # Son gösterilen konum
+        self._predicted = False     # Son kareden sonra tahmin gösterildi mi?
+
+    def observe(self, t_ns: int, x, y, sender_ns: int = None):
+        """Gerçek kareyi işler ve gösterilecek konumu döndürür.
+
+        sender_ns verilirse hız/ivme gönderen zaman damgalarından hesaplanır;
+        kümeler halinde gelen karelerde varış aralıkları hızı bozmaz.
+        """
+        last = self._last
+        if last is not None:
+            dt = t_ns - last[0]
+            if sender_ns is not None and self._last_sender is not None:
+                dt = sender_ns - self._last_sender
+            if 0 < dt <= self.max_extrapolation_ns:
+                vx, vy = (x - last[1]) / dt, (y - last[2]) / dt
+                self._accel = ((vx - self._velocity[0]) / dt, (vy - self._velocity[1]) / dt)
+                self._velocity = (vx, vy)
+                self.interval_ns += (dt - self.interval_ns) // 8
+            elif dt > 0:  # Uzun duraklamadan sonra hareket yeniden başladı
+                self._velocity = self._accel = (0.0, 0.0)
+        if self._predicted and self._shown is not None:
+            self._correction = (self._shown[0] - x, self._shown[1] - y, t_ns)
+        self._predicted = False
+        self._last = (t_ns, x, y)
+        self._last_sender = sender_ns
+        self._shown = self.position(t_ns)
+        return self._shown
+
+    def is_late(self, t_ns: int) -> bool:
+        """Beklenen kare gelmedi ve tahmin sınırı henüz aşılmadı mı?"""
+        if self._last is None:
+            return False
+        age = t_ns - self._last[0]
+        return PREDICT_LATE_FACTOR * self.interval_ns < age <= self.max_extrapolation_ns
+
+    def expired(self, t_ns: int) -> bool:
+        """Son kareden bu yana tahmin sınırı aşıldı mı (veya hiç kare yok mu)?"""
+        return self._last is None or t_ns - self._last[0] > self.max_extrapolation_ns
+
+    def predict(self, t_ns: int):
+        """Kare gecikmişken t_ns anı için tahmini konumu döndürür"""
+        self.predictions += 1
+        self._predicted = True
+        self._shown = self.position(t_ns)
+        return self._shown
+
+    def position(self, t_ns: int):
+        last = self._last
+        if last is None:
+            return None
+        t, x, y = last
+        dt = min(t_ns - t + self.lead_ns, self.max_extrapolation_ns)
+        if dt > 0:
+            vx, vy = self._velocity
+            ax, ay = self._accel
+            dx = vx * dt + 0.5 * ax * dt * dt
+            dy = vy * dt + 0.5 * ay * dt * dt
+            if dx * vx < 0 or dy * vy < 0:  # Frenleme: ivme hareketi tersine çevirmesin
+                dx, dy = vx * dt, vy * dt
+            distance = math.hypot(dx, dy)
+            if distance > self.max_distance_px:
+                scale = self.max_distance_px / distance
+                dx, dy = dx * scale, dy * scale
+            x, y = x + dx, y + dy
+        correction = self._correction
+        if correction is not None:
+            remaining = 1.0 - (t_ns - correction[2]) / self.reconcile_ns
+            if remaining > 0:
+                x, y = x + correction[0] * remaining, y + correction[1] * remaining
+            else:
+                self._correction = None
+        return round(x), round(y)
+
+
+class Extrapolator:
+    """MotionPredictor'ı gerçek zamanlı sürer: kareler gecikince tahmini konumu sink'e verir.
+
+    feed() ağdan (veya jitter buffer'dan) gelen gerçek kareler için çağrılır;
+    ayrı bir thread kare aralığında uyanıp kare gecikmişse tahmin üretir.
+    sink(x, y) her iki thread'den de çağrılabilir.
+    """
+
+    def __init__(self, sink, predictor: MotionPredictor = None, clock=perf_counter_ns):
+        self.sink = sink
+        self.predictor = predictor or MotionPredictor()
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._sent = None  # Sink'e verilen son konum
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="motion-predict", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def reset(self):
+        with self._lock:
+            self.predictor.reset()
+
+    def feed(self, x, y, sender_ns: int = None):
+        with self._lock:
+            position = self._sent = self.predictor.observe(self.clock(), x, y, sender_ns)
+        self.sink(*position)
+        self._wake.set()
+
+    def _run(self):
+        predictor = self.predictor
+        while not self._stopping:
+            # Hareket yoksa ilk kareye kadar uyu
+            self._wake.wait()
+            self._wake.clear()
+            while not self._stopping and not self._wake.is_set():
+                sleep_until(self.clock() + predictor.interval_ns, clock=self.clock)
+                with self._lock:
+                    now = self.clock()
+                    if predictor.expired(now):
+                        break  # Tahmin sınırı aşıldı; yeni kareyi bekle
+                    if not predictor.is_late(now):
+                        continue
+                    position = predictor.predict(now)
+                    if position == self._sent:
+                        continue  # Duran imleç için aynı konumu tekrar enjekte etme
+                    self._sent = position
+                self.sink(*position)
+
+
+def _truth_at(frames, sender_ns):
+    """Gönderen tarafta sender_ns anındaki konum (kareler arası doğrusal)"""
+    lo, hi = 0, len(frames) - 1
+    if sender_ns <= frames[0][0]:
+        return frames[0][2], frames[0][3], 0.0
+    if sender_ns >= frames[hi][0]:
+        return frames[hi][2], frames[hi][3], 0.0
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if frames[mid][0] <= sender_ns:
+            lo = mid
+        else:
+            hi = mid
+    (t0, _, x0, y0), (t1, _, x1, y1) = frames[lo], frames[hi]
+    k = (sender_ns - t0) / (t1 - t0) if t1 > t0 else 0.0
+    speed = math.hypot(x1 - x0, y1 - y0) / ((t1 - t0) / 1e6) if t1 > t0 else 0.0
+    return x0 + (x1 - x0) * k, y0 + (y1 - y0) * k, speed
+
+
+def evaluate(frames, predictor: MotionPredictor = None, tick_ms: float = EVAL_TICK_MS) -> dict:
+    """Kaydedilmiş iz üzerinde tahmini ve tahminsiz gösterimi karşılaştırır.
+
+    frames: (gönderim ns, varış ns, x, y) listesi. İki saat arasındaki fark en
+    küçük geçiş süresiyle elenir; her tick'te gösterilen konum gönderen
+    taraftaki o anki gerçek konumla karşılaştırılır. Etkin gecikme hata/hız
+    olarak hesaplanır; gizlenen gecikme tahminsiz ile tahminli etkin gecikme
+    farkıdır.
+    """
+    frames = sorted(frames, key=lambda frame: frame[1])
+    if len(frames) < 2:
+        raise ValueError("Değerlendirme için en az iki kare gerekli")
+    predictor = predictor or MotionPredictor()
+    predictor.reset()
+    by_sender = sorted(frames)
+    base = min(arrival - sent for sent, arrival, _, _ in frames)
+    tick_ns = int(tick_ms * 1e6)
+
+    errors = {"baseline": [], "predicted": []}
+    latencies = {"baseline": [], "predicted": []}
+    index = 0
+    last_frame = shown = None
+    t = frames[0][1]
+    while t <= frames[-1][1]:
+        while index < len(frames) and frames[index][1] <= t:
+            last_frame = frames[index]
+            shown = predictor.observe(last_frame[1], last_frame[2], last_frame[3], last_frame[0])
+            index += 1
+        if predictor.is_late(t):
+            shown = predictor.predict(t)
+        truth_x, truth_y, speed = _truth_at(by_sender, t - base)
+        for name, (x, y) in (("baseline", last_frame[2:]), ("predicted", shown)):
+            error = math.hypot(x - truth_x, y - truth_y)
+            errors[name].append(error)
+            if speed >= EVAL_MIN_SPEED:
+                latencies[name].append(error / speed)
+        t += tick_ns
+
+    result = {"frames": len(frames), "ticks": len(errors["baseline"]),
+              "predictions": predictor.predictions}
+    for name in ("baseline", "predicted"):
+        values = sorted(errors[name])
+        result[name] = {
+            "mean_error_px": sum(values) / len(values),
+            "p95_error_px": values[min(len(values) - 1, int(0.95 * len(values)))],
+            "max_error_px": values[-1],
+            "effective_latency_ms": (sum(latencies[name]) / len(latencies[name])
+                                     if latencies[name] else 0.0),
+        }
+    result["hidden_latency_ms"] = (result["baseline"]["effective_latency_ms"]
+                                   - result["predicted"]["effective_latency_ms"])
+    return result
+
+
+def load_trace(path: str):
+    """Client'ın --record-motion ile yazdığı JSON izini okur"""
+    with open(path) as f:
+        return [tuple(frame) for frame in json.load(f)["frames"]]
+
+
+def save_trace(frames, path: str):
+    with open(path, "w") as f:
+        json.dump({"frames": [list(frame) for frame in frames]}, f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SynergyClone hareket tahmini araçları")
+    sub = parser.add_subparsers(dest="command", required=True)
+    eval_parser = sub.add_parser("evaluate", help="Kaydedilmiş izde tahmin hatası ve gizlenen gecikme")
+    eval_parser.add_argument("paths", nargs="+", help="--record-motion ile yazılan JSON izleri")
+    eval_parser.add_argument("--lead-ms", type=float, default=0.0, help="Her kareyi bu kadar ileri tahmin et")
+    eval_parser.add_argument("--max-ms", type=float, default=PREDICT_MAX_MS, help="En uzun tahmin süresi")
+    eval_parser.add_argument("--max-px", type=float, default=PREDICT_MAX_PX, help="En uzun tahmin mesafesi")
+    eval_parser.add_argument("--json", action="store_true", help="Sonucu JSON olarak yazdır")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        if not os.path.exists(path):
+            parser.error(f"Dosya bulunamadı: {path}")
+        result = evaluate(load_trace(path), MotionPredictor(args.max_ms, args.max_px, lead_ms=args.lead_ms))
+        if args.json:
+            print(json.dumps({"path": path, **result}))
+            continue
+        print(f"📈 {path}: {result['frames']} kare, {result['predictions']} tahmin")
+        for name in ("baseline", "predicted"):
+            stats = result[name]
+            print(f"   {name:<9} ortalama={stats['mean_error_px']:6.1f}px "
+                  f"p95={stats['p95_error_px']:6.1f}px max={stats['max_error_px']:6.1f}px "
+                  f"etkin gecikme={stats['effective_latency_ms']:5.1f}ms")
+        print(f"   gizlenen gecikme: {result['hidden_latency_ms']:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+SynergyClone ağ bozucu - loopback üzerinde client ile server arasına giren,
+root veya tc/netem gerektirmeyen asyncio proxy'si
+
+Gecikme, jitter, kayıp, yeniden sıralama, bant genişliği sınırı ve ani
+duraklamalar (Wi-Fi tarama/güç tasarrufu tarzı) her yön için ayrı uygulanır.
+TCP (websocket) trafiğinde bayt akışı bozulamayacağı için kayıp yeniden
+gönderim gecikmesi (head-of-line blocking), yeniden sıralama ise öndeki
+paketin geç kalması olarak görünür; datagram trafiğinde paketler gerçekten
+düşürülür ve sırası değişir.
+
+Kullanım:
+    python3 netem.py --listen 8766 --target 127.0.0.1:8765 --profile wifi
+    python3 netem.py --listen 8766 --target 127.0.0.1:8765 --udp --delay-ms 20 --loss 0.05
+    python3 run_client.py --host 127.0.0.1 --port 8766
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import threading
+
+from logs import get_logger
+
+log = get_logger("netem")
+
+READ_CHUNK = 65536          # TCP okuma parçası (bayt)
+MIN_RTO_MS = 200.0          # TCP'nin en küçük yeniden gönderim zaman aşımı (Linux)
+
+# Hazır profiller; gecikmeler tek yön içindir
+PROFILES = {
+    "lan": {"delay_ms": 0.2, "jitter_ms": 0.1},
+    "wifi": {"delay_ms": 3.0, "jitter_ms": 8.0, "loss": 0.02, "reorder": 0.01,
+             "bandwidth_kbps": 20000, "stall_every_s": 2.0, "stall_ms": 80.0},
+    "vpn": {"delay_ms": 25.0, "jitter_ms": 3.0, "loss": 0.005, "reorder": 0.002,
+            "bandwidth_kbps": 10000},
+}
+PROFILE_NAMES = {"good LAN": "lan", "busy Wi-Fi": "wifi", "VPN": "vpn"}
+
+
+class Impairment:
+    """Tek yönlü bağlantı modeli: her paket için teslim anını (veya kaybı) hesaplar.
+
+    Zamanlar saniye cinsinden, çağıranın saatine göredir (loop.time()).
+    Bant genişliği paketleri sıraya dizer (serileştirme süresi), ardından
+    gecikme + |N(0, jitter)| eklenir. Duraklama sırasında gelen paketler
+    duraklama bitene kadar bekler.
+    """
+
+    def __init__(self, delay_ms: float = 0.0, jitter_ms: float = 0.0, loss: float = 0.0,
+                 reorder: float = 0.0, bandwidth_kbps: float = 0.0, stall_every_s: float = 0.0,
+                 stall_ms: float = 0.0, seed: int = None):
+        self.delay = delay_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.loss = loss
+        self.reorder = reorder
+        self.bytes_per_s = bandwidth_kbps * 125.0 if bandwidth_kbps else 0.0
+        self.stall_every = stall_every_s
+        self.stall = stall_ms / 1000.0
+        self.rng = random.Random(seed)
+        self._link_free = 0.0     # Bant genişliği kuyruğunun boşalacağı an
+        self._last_due = 0.0      # Sıra korunan trafikte son teslim anı
+        self._next_stall = None
+        self._stall_end = 0.0
+        self.packets = 0
+        self.dropped = 0
+        self.retransmitted = 0
+        self.reordered = 0
+        self.stalls = 0
+
+    @classmethod
+    def from_profile(cls, name: str, seed: int = None, **overrides) -> "Impairment":
+        name = PROFILE_NAMES.get(name, name)
+        if name not in PROFILES:
+            raise ValueError(f"Bilinmeyen profil: {name} (seçenekler: {', '.join(PROFILES)})")
+        params = dict(PROFILES[name])
+        params.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(seed=seed, **params)
+
+    def _stalled_until(self, now: float) -> float:
+        """Şu an bir duraklamanın içindeyse bitiş anı, değilse now"""
+        if not self.stall_every or not self.stall:
+            return now
+        if self._next_stall is None:
+            self._next_stall = now + self.rng.expovariate(1.0 / self.stall_every)
+        while now >= self._next_stall:
+            self._stall_end = self._next_stall + self.stall
+            self._next_stall = self._stall_end + self.rng.expovariate(1.0 / self.stall_every)
+            self.stalls += 1
+        return max(now, self._stall_end)
+
+    def plan(self, now: float, size: int, ordered: bool = True):
+        """Paketin teslim anı; datagram kaybında None.
+
+        ordered=True (TCP) teslim anları azalmaz: kayıp RTO kadar gecikme,
+        yeniden sıralama öndeki paketin geç kalmasıdır ve arkadakiler de bekler.
+        """
+        self.packets += 1
+        start = self._stalled_until(now)
+        if self.bytes_per_s:
+            self._link_free = max(start, self._link_free) + size / self.bytes_per_s
+            start = self._link_free
+        due = start + self.delay
+        if self.jitter:
+            due += abs(self.rng.gauss(0.0, self.jitter))
+        if self.loss and self.rng.random() < self.loss:
+            if not ordered:
+                self.dropped += 1
+                return None
+            self.retransmitted += 1
+            due += max(MIN_RTO_MS / 1000.0, 3 * self.delay)
+        if self.reorder and self.rng.random() < self.reorder:
+            self.reordered += 1
+            if ordered:
+                due += self.delay + 2 * self.jitter
+            else:
+                # Datagram öndekilerin önüne geçer (sıra korunmaz)
+                return max(now, due - self.delay - self.jitter)
+        if ordered or not self.jitter:
+            due = max(due, self._last_due)
+            self._last_due = due
+        return due
+
+    def stats(self) -> dict:
+        return {"packets": self.packets, "dropped": self.dropped, "retransmitted": self.retransmitted,
+                "reordered": self.reordered, "stalls": self.stalls}
+
+
+class NetemProxy:
+    """listen portundan gelen bağlantıları/datagramları bozarak target'a aktaran proxy.
+
+    Her bağlantının (datagram için her kaynak adresin) her iki yönü kendi
+    Impairment örneğini alır. Aynı loop'ta (start/stop) veya kendi
+    thread'inde (start_in_thread/stop_thread) çalıştırılabilir.
+    """
+
+    def __init__(self, target_host: str, target_port: int, listen_port: int = 0,
+                 listen_host: str = "127.0.0.1", profile: str = "lan", udp: bool = False,
+                 seed: int = None, **overrides):
+        self.target = (target_host, target_port)
+        self.listen_host = listen_host
+        self.port = listen_port
+        self.profile = profile
+        self.udp = udp
+        self.overrides = overrides
+        self._seed = seed
+        self.links = []           # (yön, Impairment)
+        self._server = None
+        self._transport = None
+        self._peers = {}          # datagram: kaynak adres -> upstream transport
+        self._tasks = set()
+        self._loop = None
+        self._thread = None
+
+    def _impairment(self, direction: str) -> Impairment:
+        seed = None if self._seed is None else self._seed + len(self.links)
+        link = Impairment.from_profile(self.profile, seed=seed, **self.overrides)
+        self.links.append((direction, link))
+        return link
+
+    async def start(self) -> int:
+        """Dinlemeye başla; dinlenen portu döndürür"""
+        self._loop = asyncio.get_running_loop()
+        if self.udp:
+            self._transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _DatagramListener(self), local_addr=(self.listen_host, self.port))
+            self.port = self._transport.get_extra_info("sockname")[1]
+        else:
+            self._server = await asyncio.start_server(self._handle_stream, self.listen_host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+        log.info(f"🌧️ Ağ bozucu: {self.listen_host}:{self.port} → {self.target[0]}:{self.target[1]} "
+                 f"({'udp' if self.udp else 'tcp'}, profil {self.profile})")
+        return self.port
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._transport:
+            self._transport.close()
+        for upstream in self._peers.values():
+            upstream.close()
+        self._peers.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def start_in_thread(self) -> int:
+        """Proxy'yi kendi loop thread'inde başlat (senkron benchmark'lar için)"""
+        started = threading.Event()
+        stop_event = None
+
+        async def main():
+            nonlocal stop_event
+            stop_event = asyncio.Event()
+            await self.start()
+            started.set()
+            await stop_event.wait()
+            await self.stop()
+
+        self._thread = threading.Thread(target=lambda: asyncio.run(main()), daemon=True,
+                                        name="netem")
+        self._thread.start()
+        if not started.wait(5):
+            raise RuntimeError("Ağ bozucu başlatılamadı")
+        self._stop_thread = lambda: self._loop.call_soon_threadsafe(stop_event.set)
+        return self.port
+
+    def stop_thread(self):
+        if self._thread:
+            self._stop_thread()
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> dict:
+        """Yön başına toplanmış paket istatistikleri"""
+        totals = {}
+        for direction, link in self.links:
+            entry = totals.setdefault(direction, dict.fromkeys(link.stats(), 0))
+            for key, value in link.stats().items():
+                entry[key] += value
+        return totals
+
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _handle_stream(self, reader, writer):
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(*self.target)
+        except OSError as e:
+            log.warning(f"⚠️ Hedefe bağlanılamadı {self.target}: {e}")
+            writer.close()
+            return
+        pipes = [self._spawn(self._pipe(reader, upstream_writer, self._impairment("upstream"))),
+                 self._spawn(self._pipe(upstream_reader, writer, self._impairment("downstream")))]
+        await asyncio.wait(pipes, return_when=asyncio.FIRST_COMPLETED)
+        for task in pipes:
+            task.cancel()
+        for w in (writer, upstream_writer):
+            w.close()
+
+    async def _pipe(self, reader, writer, link: Impairment):
+        """Okunan parçaları planlanan teslim anında, sırayla yaz"""
+        queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+
+        async def deliver():
+            while True:
+                due, data = await queue.get()
+                if data is None:
+                    if writer.can_write_eof():
+                        writer.write_eof()
+                    return
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                writer.write(data)
+                await writer.drain()
+
+        sender = asyncio.ensure_future(deliver())
+        try:
+            while True:
+                data = await reader.read(READ_CHUNK)
+                if not data:
+                    queue.put_nowait((0.0, None))
+                    break
+                queue.put_nowait((link.plan(loop.time(), len(data)), data))
+            await sender
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            sender.cancel()
+
+    def _forward_datagram(self, data: bytes, addr):
+        upstream = self._peers.get(addr)
+        if upstream is None:
+            link = self._impairment("upstream")
+            upstream = self._pending_upstream(addr, link)
+        self._schedule(upstream.link, data, lambda payload: upstream.send(payload))
+
+    def _pending_upstream(self, addr, link):
+        """Kaynak adres için upstream datagram ucu; bağlantı kurulana kadar paketleri biriktirir"""
+        upstream = _Upstream(link)
+        self._peers[addr] = upstream
+        downstream = self._impairment("downstream")
+
+        async def connect():
+            transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _DatagramRelay(self, addr, downstream), remote_addr=self.target)
+            upstream.attach(transport)
+
+        self._spawn(connect())
+        return upstream
+
+    def _schedule(self, link: Impairment, data: bytes, send):
+        due = link.plan(self._loop.time(), len(data) + 28, ordered=False)  # IP+UDP başlığı
+        if due is not None:
+            self._loop.call_at(due, send, data)
+
+
+class _Upstream:
+    """Henüz bağlanmamış datagram ucu için gönderim tamponu"""
+
+    def __init__(self, link: Impairment):
+        self.link = link
+        self.transport = None
+        self._pending = []
+
+    def attach(self, transport):
+        self.transport = transport
+        for data in self._pending:
+            transport.sendto(data)
+        self._pending = None
+
+    def send(self, data: bytes):
+        if self.transport is None:
+            self._pending.append(data)
+        elif not self.transport.is_closing():
+            self.transport.sendto(data)
+
+    def close(self):
+        if self.transport:
+            self.transport.close()
+
+
+class _DatagramListener(asyncio.DatagramProtocol):
+    def __init__(self, proxy: NetemProxy):
+        self.proxy = proxy
+
+    def datagram_received(self, data, addr):
+        self.proxy._forward_datagram(data, addr)
+
+
+class _DatagramRelay(asyncio.DatagramProtocol):
+    """Hedeften gelen cevapları bozarak asıl gönderene geri yollar"""
+
+    def __init__(self, proxy: NetemProxy, addr, link: Impairment):
+        self.proxy = proxy
+        self.addr = addr
+        self.link = link
+
+    def datagram_received(self, data, _addr):
+        listener = self.proxy._transport
+        self.proxy._schedule(self.link, data, lambda payload: listener.sendto(payload, self.addr))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SynergyClone ağ bozucu (loopback proxy)")
+    parser.add_argument("--listen", type=int, required=True, help="Dinlenecek port")
+    parser.add_argument("--target", required=True, metavar="HOST:PORT", help="Hedef adres")
+    parser.add_argument("--profile", default="lan", choices=sorted(PROFILES), help="Hazır profil")
+    parser.add_argument("--udp", action="store_true", help="TCP yerine datagram trafiğini aktar")
+    parser.add_argument("--delay-ms", type=float, default=None, help="Tek yön gecikme")
+    parser.add_argument("--jitter-ms", type=float, default=None, help="Gecikme sapması")
+    parser.add_argument("--loss", type=float, default=None, help="Kayıp oranı (0-1)")
+    parser.add_argument("--reorder", type=float, default=None, help="Yeniden sıralama oranı (0-1)")
+    parser.add_argument("--bandwidth-kbps", type=float, default=None, help="Bant genişliği sınırı")
+    parser.add_argument("--stall-every-s", type=float, default=None, help="Ortalama duraklama aralığı")
+    parser.add_argument("--stall-ms", type=float, default=None, help="Duraklama süresi")
+    parser.add_argument("--seed", type=int, default=None, help="Tekrarlanabilir rastgelelik")
+    args = parser.parse_args(argv)
+
+    host, _, port = args.target.rpartition(":")
+    proxy = NetemProxy(host or "127.0.0.1", int(port), listen_port=args.listen, profile=args.profile,
+                       udp=args.udp, seed=args.seed, delay_ms=args.delay_ms, jitter_ms=args.jitter_ms,
+                       loss=args.loss, reorder=args.reorder, bandwidth_kbps=args.bandwidth_kbps,
+                       stall_every_s=args.stall_every_s, stall_ms=args.stall_ms)
+
+    async def run():
+        await proxy.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await proxy.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    for direction, stats in proxy.stats().items():
+        log.info(f"📊 {direction}: {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
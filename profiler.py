@@ -0,0 +1,317 @@
+"""
+SynergyClone profil araçları - başlangıç süresi ve import maliyeti ölçümü
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from importlib.abc import MetaPathFinder
+
+from utils import PhaseTimer
+
+
+def current_rss_mb():
+    """Sürecin anlık bellek kullanımını (RSS, MB) döndürür; ölçülemezse None."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS byte, Linux KB döndürür; bu yol tepe değeri verir
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return None
+
+
+class _TimedLoader:
+    """Gerçek loader'ı sarıp exec_module süresini ImportProfiler'a bildirir."""
+
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._leave(self._name, (time.perf_counter() - start) * 1000)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class ImportProfiler(MetaPathFinder):
+    """sys.meta_path'e eklenerek her modülün import süresini ölçer.
+
+    Kümülatif süre alt importları da içerir; öz süre (self) içermez.
+    """
+
+    def __init__(self):
+        self.records = {}  # modül -> (kümülatif ms, öz ms)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, fullname, self)
+        return spec
+
+    def _enter(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)  # Bu import içindeki alt importların toplamı
+
+    def _leave(self, name, elapsed_ms):
+        stack = self._local.stack
+        children_ms = stack.pop()
+        if stack:
+            stack[-1] += elapsed_ms
+        with self._lock:
+            self.records[name] = (elapsed_ms, elapsed_ms - children_ms)
+
+    def by_package(self):
+        """Öz süreleri üst seviye pakete göre toplar."""
+        totals = defaultdict(float)
+        for name, (_, self_ms) in self.records.items():
+            totals[name.split('.')[0]] += self_ms
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def report(self, limit=10) -> str:
+        lines = [f"📦 Import süreleri ({len(self.records)} modül, paket bazında öz süre):"]
+        for package, ms in self.by_package()[:limit]:
+            lines.append(f"   {ms:8.1f}ms  {package}")
+        return "\n".join(lines)
+
+
+class StartupProfile:
+    """--profile-startup modu: import ve aşama sürelerini toplar, hazır olunca yazdırır."""
+
+    def __init__(self, name):
+        self.imports = ImportProfiler()
+        self.imports.install()
+        self.timer = PhaseTimer(name)
+        self.finished = False
+
+    def mark(self, phase):
+        if not self.finished:
+            self.timer.mark(phase)
+
+    def finish(self, phase):
+        """Son aşamayı işaretler ve raporu bir kez yazdırır."""
+        if self.finished:
+            return
+        self.timer.mark(phase)
+        self.finished = True
+        self.imports.uninstall()
+        print(self.report())
+
+    def report(self) -> str:
+        rss = current_rss_mb()
+        memory = f"💾 Bellek (RSS): {rss:.1f} MB" if rss is not None else "💾 Bellek ölçülemedi"
+        return f"{self.timer.summary()}\n{memory}\n{self.imports.report()}"
+
+
+# Örnekleme profili ayarları
+SAMPLE_HZ = 200              # Saniyedeki örnek sayısı
+TRACEMALLOC_FRAMES = 10      # tracemalloc'un her ayırma için sakladığı çerçeve sayısı
+PROFILE_MODES = ("stack", "memory")
+
+
+class SamplingProfiler:
+    """sys._current_frames ile tüm thread'lerin yığınını örnekler (pynput listener'ları,
+    polling thread'leri, asyncio loop'u ve Tk ana thread'i dahil).
+
+    Çıktı flamegraph araçlarının (flamegraph.pl, speedscope) okuduğu
+    "thread;dış;...;iç sayı" biçimindeki daraltılmış yığınlardır.
+    """
+
+    def __init__(self, hz: int = SAMPLE_HZ):
+        self.interval = 1.0 / hz
+        self.counts = defaultdict(int)
+        self.samples = 0
+        self._labels = {}  # kod nesnesi -> "fonksiyon (dosya:satır)"
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        self.counts.clear()
+        self.samples = 0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = (
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        return label
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                stack.reverse()
+                self.counts[";".join(stack)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in
+                       sorted(self.counts.items(), key=lambda item: item[1], reverse=True))
+
+
+class MemoryDiff:
+    """tracemalloc ile başlangıç ve bitiş anlarının farkını satır bazında raporlar."""
+
+    def __init__(self, frames: int = TRACEMALLOC_FRAMES, limit: int = 30):
+        self.frames = frames
+        self.limit = limit
+        self._baseline = None
+        self._started_tracing = False
+
+    @property
+    def running(self) -> bool:
+        return self._baseline is not None
+
+    def start(self):
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._baseline = tracemalloc.take_snapshot()
+
+    def stop(self) -> str:
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.compare_to(self._baseline, "lineno")
+        self._baseline = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        growth = sum(stat.size_diff for stat in stats)
+        lines = [f"Toplam fark: {growth / 1024:+.1f} KiB",
+                 f"En büyük {self.limit} değişiklik (satır bazında):"]
+        for stat in stats[:self.limit]:
+            lines.append(f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blok  "
+                         f"{stat.traceback.format()[0].strip()}")
+        return "\n".join(lines) + "\n"
+
+
+class RuntimeProfiler:
+    """Çalışan süreçte açılıp kapatılabilen profil (GUI, sinyal veya kontrol mesajı ile).
+
+    "stack" modu örnekleme profili (.collapsed), "memory" modu tracemalloc
+    farkı (.tracemalloc.txt) yazar. Dosyalar output_dir altına
+    <isim>-<zaman> adıyla kaydedilir.
+    """
+
+    def __init__(self, name: str, output_dir: str = ".", mode: str = "stack", hz: int = SAMPLE_HZ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Bilinmeyen profil modu: {mode}")
+        self.name = name
+        self.output_dir = output_dir
+        self.mode = mode
+        self.hz = hz
+        self._active = None
+        self._started_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._active is not None
+
+    def start(self, mode: str = None) -> str:
+        with self._lock:
+            if self._active is not None:
+                return "⚠️ Profil zaten çalışıyor"
+            mode = mode or self.mode
+            if mode not in PROFILE_MODES:
+                return f"⚠️ Bilinmeyen profil modu: {mode}"
+            self._active = SamplingProfiler(self.hz) if mode == "stack" else MemoryDiff()
+            self._active.start()
+            self._started_at = time.monotonic()
+            return f"🔬 Profil başladı ({mode})"
+
+    def stop(self) -> str:
+        with self._lock:
+            if self._active is None:
+                return "⚠️ Profil çalışmıyor"
+            active, self._active = self._active, None
+            elapsed = time.monotonic() - self._started_at
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            if isinstance(active, SamplingProfiler):
+                active.stop()
+                path = os.path.join(self.output_dir, f"{self.name}-{stamp}.collapsed")
+                content = active.collapsed()
+                summary = f"{active.samples} örnek"
+            else:
+                path = os.path.join(self.output_dir, f"{self.name}-{stamp}.tracemalloc.txt")
+                content = active.stop()
+                summary = content.splitlines()[0]
+            try:
+                os.makedirs(self.output_dir, exist_ok=True)
+                with open(path, "w") as f:
+                    f.write(content)
+            except OSError as e:
+                return f"⚠️ Profil yazılamadı: {e}"
+            return f"🔬 Profil yazıldı ({elapsed:.1f}s, {summary}): {path}"
+
+    def toggle(self, mode: str = None) -> str:
+        return self.stop() if self.running else self.start(mode)
+
+    def handle_command(self, action: str, mode: str = None) -> str:
+        """Kontrol mesajındaki 'start' / 'stop' / 'toggle' komutunu uygular"""
+        if action == "start":
+            return self.start(mode)
+        if action == "stop":
+            return self.stop()
+        return self.toggle(mode)
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+SynergyClone input kaydı - yakalanan olayları kompakt ikili dosyaya yazar ve
+dosyayı bellek eşlemeli (mmap) okuyarak gerçek hızda, N kat hızda veya
+beklemeden tekrar oynatır
+
+Kullanım:
+    python3 run_server.py --headless --record session.synrec
+    python3 recording.py info session.synrec
+    python3 recording.py replay session.synrec --inject memory --speed 0
+    python3 recording.py replay session.synrec --serve --port 8765 --speed 2
+
+Dosya biçimi (tüm tamsayılar LEB128 varint, işaretliler zigzag):
+    başlık:  b"SYNREC" sürüm(1 byte) bayrak(1 byte) başlangıç_unix_µs ekran_sayısı
+             ekran başına: x y genişlik yükseklik ad
+    kayıt:   etiket(1 byte: tür | basılı<<3) Δzaman_µs yük
+             move:   Δx Δy                (önceki mouse konumuna göre)
+             click:  Δx Δy düğme
+             scroll: Δx Δy dx dy
+             key:    tuş
+    Metinler uzunluk + UTF-8 olarak yazılır.
+"""
+
+import argparse
+import mmap
+import os
+import sys
+import threading
+import time
+from time import perf_counter_ns
+
+from motion import sleep_until
+from utils import ScreenInfo, normalize_coordinates
+
+RECORDING_MAGIC = b"SYNREC"
+RECORDING_VERSION = 1
+RECORD_FLUSH_BYTES = 64 * 1024  # Bu kadar veri birikince dosyaya yazılır
+
+KIND_MOVE = 1
+KIND_CLICK = 2
+KIND_SCROLL = 3
+KIND_KEY = 4
+PRESSED_BIT = 0x08
+
+
+def _zigzag(value: int) -> int:
+    return -2 * value - 1 if value < 0 else 2 * value
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _put_varint(buffer: bytearray, value: int):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _put_string(buffer: bytearray, text: str):
+    data = str(text).encode("utf-8")
+    _put_varint(buffer, len(data))
+    buffer += data
+
+
+def _get_varint(data, pos: int):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _get_string(data, pos: int):
+    length, pos = _get_varint(data, pos)
+    if pos + length > len(data):
+        raise IndexError("metin dosya sonunda yarım kalmış")
+    return bytes(data[pos:pos + length]).decode("utf-8"), pos + length
+
+
+class Recorder:
+    """InputHandler yakalama callback'lerinden çağrılan kayıtçı.
+
+    `input_handler.recorder = Recorder(...)` ile bağlanır. pynput mouse ve
+    klavye olaylarını ayrı thread'lerden verdiği için kayıtlar kilitle
+    sıralanır; veri bellekte birikip RECORD_FLUSH_BYTES'ta bir dosyaya yazılır.
+    """
+
+    def __init__(self, path: str, screens):
+        self.path = path
+        self.events = 0
+        self._file = open(path, "wb")
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._last_us = perf_counter_ns() // 1000
+        self._last_x = self._last_y = 0
+        header = bytearray(RECORDING_MAGIC)
+        header += bytes((RECORDING_VERSION, 0))
+        _put_varint(header, time.time_ns() // 1000)
+        _put_varint(header, len(screens))
+        for screen in screens:
+            _put_varint(header, _zigzag(screen.x))
+            _put_varint(header, _zigzag(screen.y))
+            _put_varint(header, screen.width)
+            _put_varint(header, screen.height)
+            _put_string(header, screen.name)
+        self._file.write(header)
+
+    def _begin(self, tag: int, timestamp_ns: int) -> bytearray:
+        """Kilit altında çağrılır: etiketi ve zaman farkını yazar"""
+        buffer = self._buffer
+        buffer.append(tag)
+        now_us = timestamp_ns // 1000
+        _put_varint(buffer, max(0, now_us - self._last_us))
+        self._last_us = max(self._last_us, now_us)
+        self.events += 1
+        return buffer
+
+    def _put_position(self, buffer: bytearray, x, y):
+        x, y = int(x), int(y)
+        _put_varint(buffer, _zigzag(x - self._last_x))
+        _put_varint(buffer, _zigzag(y - self._last_y))
+        self._last_x, self._last_y = x, y
+
+    def _end(self):
+        if len(self._buffer) >= RECORD_FLUSH_BYTES:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+    def mouse_move(self, timestamp_ns: int, x, y):
+        with self._lock:
+            self._put_position(self._begin(KIND_MOVE, timestamp_ns), x, y)
+            self._end()
+
+    def mouse_click(self, timestamp_ns: int, x, y, button: str, pressed: bool):
+        with self._lock:
+            buffer = self._begin(KIND_CLICK | (PRESSED_BIT if pressed else 0), timestamp_ns)
+            self._put_position(buffer, x, y)
+            _put_string(buffer, button)
+            self._end()
+
+    def mouse_scroll(self, timestamp_ns: int, x, y, dx: int, dy: int):
+        with self._lock:
+            buffer = self._begin(KIND_SCROLL, timestamp_ns)
+            self._put_position(buffer, x, y)
+            _put_varint(buffer, _zigzag(int(dx)))
+            _put_varint(buffer, _zigzag(int(dy)))
+            self._end()
+
+    def key(self, timestamp_ns: int, key_name: str, pressed: bool):
+        with self._lock:
+            _put_string(self._begin(KIND_KEY | (PRESSED_BIT if pressed else 0), timestamp_ns), key_name)
+            self._end()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            self._file.close()
+
+
+class Recording:
+    """Kayıt dosyasını mmap ile açar; olaylar diskten sırayla okunur, RAM'e yüklenmez."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Boş dosya
+            self._file.close()
+            raise ValueError(f"Geçersiz kayıt dosyası: {path}")
+        data = self._map
+        if data[:len(RECORDING_MAGIC)] != RECORDING_MAGIC:
+            self.close()
+            raise ValueError(f"Geçersiz kayıt dosyası: {path}")
+        pos = len(RECORDING_MAGIC)
+        self.version = data[pos]
+        if self.version != RECORDING_VERSION:
+            self.close()
+            raise ValueError(f"Desteklenmeyen kayıt sürümü: {self.version}")
+        pos += 2
+        self.started_us, pos = _get_varint(data, pos)
+        count, pos = _get_varint(data, pos)
+        self.screens = []
+        self.truncated = False  # Son kayıt yarım kaldı mı (events() sonuna kadar okununca belli olur)
+        for _ in range(count):
+            x, pos = _get_varint(data, pos)
+            y, pos = _get_varint(data, pos)
+            width, pos = _get_varint(data, pos)
+            height, pos = _get_varint(data, pos)
+            name, pos = _get_string(data, pos)
+            self.screens.append(ScreenInfo(width, height, _unzigzag(x), _unzigzag(y), name))
+        self._data_offset = pos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    @property
+    def size(self) -> int:
+        return len(self._map)
+
+    def events(self):
+        """(kayıt başından µs, adım) üretir; adım MemoryBackend senaryo biçimindedir.
+
+        ("move", x, y), ("click", x, y, düğme, basılı), ("scroll", x, y, dx, dy),
+        ("press", tuş) veya ("release", tuş). Kayıt çökme ya da kopyalama
+        sırasında yarım kaldıysa son eksik kayıt atlanır ve truncated işaretlenir.
+        """
+        try:
+            yield from self._events()
+        except IndexError:
+            self.truncated = True
+
+    def _events(self):
+        data = self._map
+        end = len(data)
+        pos = self._data_offset
+        t_us = x = y = 0
+        while pos < end:
+            tag = data[pos]
+            kind, pressed = tag & 0x07, bool(tag & PRESSED_BIT)
+            delta, pos = _get_varint(data, pos + 1)
+            t_us += delta
+            if kind == KIND_KEY:
+                key_name, pos = _get_string(data, pos)
+                yield t_us, ("press" if pressed else "release", key_name)
+                continue
+            dx, pos = _get_varint(data, pos)
+            dy, pos = _get_varint(data, pos)
+            x += _unzigzag(dx)
+            y += _unzigzag(dy)
+            if kind == KIND_MOVE:
+                yield t_us, ("move", x, y)
+            elif kind == KIND_CLICK:
+                button, pos = _get_string(data, pos)
+                yield t_us, ("click", x, y, button, pressed)
+            elif kind == KIND_SCROLL:
+                sx, pos = _get_varint(data, pos)
+                sy, pos = _get_varint(data, pos)
+                yield t_us, ("scroll", x, y, _unzigzag(sx), _unzigzag(sy))
+            else:
+                raise ValueError(f"Bozuk kayıt: {pos} konumunda bilinmeyen tür {kind}")
+
+    def info(self) -> dict:
+        counts = {}
+        duration_us = 0
+        for duration_us, step in self.events():
+            counts[step[0]] = counts.get(step[0], 0) + 1
+        total = sum(counts.values())
+        return {
+            "path": self.path,
+            "bytes": self.size,
+            "events": total,
+            "counts": counts,
+            "duration_s": duration_us / 1e6,
+            "bytes_per_event": (self.size - self._data_offset) / total if total else 0.0,
+            "truncated": self.truncated,
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_us / 1e6)),
+            "screens": [f"{s.name or '?'} {s.width}x{s.height}@{s.x},{s.y}" for s in self.screens],
+        }
+
+
+def replay(recording: Recording, deliver, speed: float = 1.0, stop_event=None) -> int:
+    """Olayları deliver(adım) ile iletir; speed=1 gerçek hız, N kat hız, 0 beklemeden.
+
+    Zamanlama kayıt başlangıcına göre hesaplanır, gecikmeler birikmez.
+    Oynatılan olay sayısını döndürür.
+    """
+    start_ns = perf_counter_ns()
+    first_us = None
+    delivered = 0
+    for t_us, step in recording.events():
+        if stop_event is not None and stop_event.is_set():
+            break
+        if first_us is None:
+            first_us = t_us  # Kaydın başındaki boşluk beklenmez
+        if speed > 0:
+            sleep_until(start_ns + int((t_us - first_us) * 1000 / speed))
+        deliver(step)
+        delivered += 1
+    return delivered
+
+
+def capture_target(input_handler):
+    """Adımları yakalama callback'lerine verir: server'da olaylar ağ üzerinden iletilir"""
+    def deliver(step):
+        kind = step[0]
+        if kind == "move":
+            input_handler._on_mouse_move(step[1], step[2])
+        elif kind == "click":
+            input_handler._on_mouse_click(*step[1:])
+        elif kind == "scroll":
+            input_handler._on_mouse_scroll(*step[1:])
+        elif kind == "press":
+            input_handler._on_key_press(step[1])
+        else:
+            input_handler._on_key_release(step[1])
+    return deliver
+
+
+def inject_target(backend, from_screen: ScreenInfo = None):
+    """Adımları doğrudan bir enjeksiyon backend'ine verir; koordinatlar hedef ekrana ölçeklenir"""
+    to_screen = None
+    if from_screen is not None:
+        width, height = backend.get_screen_size()
+        if (width, height) != (from_screen.width, from_screen.height):
+            to_screen = ScreenInfo(width=width, height=height)
+
+    def deliver(step):
+        kind = step[0]
+        if kind in ("press", "release"):
+            backend.key(step[1], kind == "press")
+            return
+        x, y = step[1], step[2]
+        if to_screen is not None:
+            x, y = normalize_coordinates(x, y, from_screen, to_screen)
+        if kind == "move":
+            backend.move_mouse(x, y)
+        elif kind == "click":
+            backend.mouse_button(x, y, step[3], step[4])
+        else:
+            backend.scroll(x, y, step[3], step[4])
+    return deliver
+
+
+def _replay_to_server(recording: Recording, args) -> int:
+    """Kaydı bir memory-backend server'ın yakalama yoluna verip bağlanan client'a iletir"""
+    import asyncio
+    from input_backend import MemoryBackend
+    from server import SynergyServer
+
+    screen = recording.screens[0] if recording.screens else ScreenInfo(1920, 1080)
+    server = SynergyServer(host=args.host, port=args.port,
+                           input_backend=MemoryBackend(screen_size=(screen.width, screen.height)))
+    server.headless = True
+    thread = threading.Thread(target=lambda: asyncio.run(server.start_server()), daemon=True)
+    thread.start()
+    print(f"⏳ Client bekleniyor ({args.host}:{args.port})...")
+    deadline = time.monotonic() + args.wait
+    while not server.client_info and time.monotonic() < deadline:
+        time.sleep(0.1)
+    if not server.client_info:
+        server.stop()
+        print("❌ Client bağlanmadı")
+        return 0
+    server.switch_to_client()
+    try:
+        return replay(recording, capture_target(server.input_handler), args.speed)
+    finally:
+        server.stop()
+        thread.join(timeout=5)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SynergyClone input kaydı araçları")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info_parser = sub.add_parser("info", help="Kayıt özetini yazdır")
+    info_parser.add_argument("path")
+    replay_parser = sub.add_parser("replay", help="Kaydı tekrar oynat")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--speed", type=float, default=1.0,
+                               help="1: gerçek hız, N: N kat hızlı, 0: beklemeden (varsayılan: 1)")
+    target = replay_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--inject", metavar="BACKEND",
+                        help="Olayları bu backend ile enjekte et (ör. memory, pynput)")
+    target.add_argument("--serve", action="store_true",
+                        help="Server başlat, bağlanan client'a olayları ağ üzerinden gönder")
+    replay_parser.add_argument("--host", default="0.0.0.0", help="--serve için dinlenecek adres")
+    replay_parser.add_argument("--port", type=int, default=8765, help="--serve için port")
+    replay_parser.add_argument("--wait", type=float, default=60.0,
+                               help="--serve için client bekleme süresi (saniye)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error(f"Dosya bulunamadı: {args.path}")
+    with Recording(args.path) as recording:
+        if args.command == "info":
+            info = recording.info()
+            print(f"📼 {info['path']}: {info['events']} olay, {info['duration_s']:.1f}s, "
+                  f"{info['bytes']} byte ({info['bytes_per_event']:.1f} byte/olay)")
+            print(f"   başlangıç: {info['started']}, ekranlar: {', '.join(info['screens'])}")
+            print(f"   {info['counts']}")
+            if info['truncated']:
+                print("⚠️ Son kayıt yarım kalmış; atlandı")
+            return 0
+
+        start = perf_counter_ns()
+        if args.serve:
+            delivered = _replay_to_server(recording, args)
+        else:
+            from input_backend import create_backend
+            backend = create_backend(args.inject)
+            backend.start()
+            try:
+                screen = recording.screens[0] if recording.screens else None
+                delivered = replay(recording, inject_target(backend, screen), args.speed)
+            finally:
+                backend.stop()
+        elapsed = (perf_counter_ns() - start) / 1e9
+        print(f"✅ {delivered} olay {elapsed:.2f}s'de oynatıldı "
+              f"({delivered / elapsed if elapsed else 0:.0f} olay/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,106 @@
 SynergyClone Client Çalıştırıcı - Windows
 """
 
-from client import SynergyClient
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser(description="SynergyClone Client")
+    parser.add_argument("--host", default=None, help="Server IP adresi (verilirse otomatik bağlanır)")
+    parser.add_argument("--port", type=int, default=None, help="Server portu (varsayılan: 8765)")
+    parser.add_argument("--config", default=None, help="Ayarların okunacağı config.json yolu")
+    parser.add_argument("--backend", default=None, help="Input backend adı (varsayılan: platforma göre)")
+    parser.add_argument("--log-level", default=None, choices=["debug", "info", "warning", "error"],
+                        help="Log seviyesi (varsayılan: SYNERGY_LOG_LEVEL veya info)")
+    parser.add_argument("--latency-json", default=None, metavar="PATH",
+                        help="Kapanışta aşama gecikme histogramlarını bu JSON dosyasına yaz")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Prometheus metriklerini http://127.0.0.1:PORT/metrics adresinde sun")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="Kontrol geçişlerini izle ve kapanışta Chrome trace JSON olarak yaz")
+    parser.add_argument("--profile-dir", default=".",
+                        help="Çalışırken alınan profillerin yazılacağı klasör (GUI/SIGUSR2/kontrol mesajı)")
+    parser.add_argument("--profile-mode", default="stack", choices=["stack", "memory"],
+                        help="stack: örnekleme profili (.collapsed), memory: tracemalloc farkı")
+    parser.add_argument("--profile-hz", type=int, default=200, help="Örnekleme profili sıklığı")
+    parser.add_argument("--jitter-buffer", action="store_true",
+                        help="Hareketleri server zaman damgalarına göre orijinal aralıklarıyla oynat")
+    parser.add_argument("--jitter-max-ms", type=float, default=None,
+                        help="Jitter buffer'ın ekleyebileceği en fazla gecikme (varsayılan: 50)")
+    parser.add_argument("--predict", action="store_true",
+                        help="Kare geciktiğinde imleç konumunu hız/ivmeden tahmin et")
+    parser.add_argument("--predict-lead-ms", type=float, default=0.0,
+                        help="Her kareyi bu kadar ileriye tahmin et (ağ gecikmesini gizlemek için)")
+    parser.add_argument("--predict-max-px", type=float, default=None,
+                        help="Tahminin son gerçek konumdan en fazla uzaklığı (varsayılan: 64)")
+    parser.add_argument("--relative-mouse", default=None, choices=["off", "on", "auto"],
+                        help="Göreli (ham delta) mouse enjeksiyonu: oyunlar/3D uygulamalar için; "
+                             "auto: ön plandaki uygulama işaretçiyi yakalayınca")
+    parser.add_argument("--record-motion", default=None, metavar="PATH",
+                        help="Gelen hareketleri kapanışta `motion.py evaluate` için JSON olarak yaz")
+    parser.add_argument("--headless", action="store_true",
+                        help="GUI olmadan çalış; log stdout'a yazılır, SIGINT/SIGTERM ile kapanır")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Bağlantı kurulana kadar import/aşama sürelerini yazdır")
+    args = parser.parse_args()
+
+    if args.log_level:
+        from logs import set_log_level
+        set_log_level(args.log_level)
+    if args.trace:
+        from tracing import CLIENT_PID, tracer
+        tracer.enable("SynergyClone Client", CLIENT_PID, args.trace)
+
+    profile = None
+    if args.profile_startup:
+        from profiler import StartupProfile
+        profile = StartupProfile("Client başlangıcı")
+
+    from client import SynergyClient
+    if profile:
+        profile.mark("import")
+
+    # Öncelik: komut satırı > config dosyası > varsayılan
+    host, port, relative_mouse = None, 8765, "off"
+    if args.config:
+        from utils import ConfigManager
+        client_config = ConfigManager(args.config).load_config()["client"]
+        port = client_config.get("server_port", port)
+        relative_mouse = client_config.get("relative_mouse", relative_mouse)
+        if client_config.get("auto_connect") or args.headless:
+            host = client_config.get("server_host")
+    host = args.host or host
+    port = args.port or port
+
+    kwargs = {'server_port': port, 'input_backend': args.backend}
+    if host:
+        kwargs['server_host'] = host
+
+    if args.headless:
+        if not host:
+            parser.error("--headless için --host veya config'te client.server_host gerekli")
+        print(f"🪟 SynergyClone Client headless başlatılıyor ({host}:{port})...")
+    else:
+        print("🪟 SynergyClone Client (Windows) GUI başlatılıyor...")
+    client = SynergyClient(**kwargs)
+    client.startup_profile = profile
+    client.latency_dump_path = args.latency_json
+    client.metrics_port = args.metrics_port
+    from profiler import RuntimeProfiler
+    client.profiler = RuntimeProfiler("client", args.profile_dir, args.profile_mode, args.profile_hz)
+    if args.jitter_buffer:
+        client.enable_jitter_buffer(max_delay_ms=args.jitter_max_ms)
+    if args.predict:
+        client.enable_prediction(args.predict_lead_ms, args.predict_max_px)
+    if args.record_motion:
+        client.record_motion(args.record_motion)
+    client.relative_mouse = args.relative_mouse or relative_mouse
+    if profile:
+        profile.mark("init")
+
+    if args.headless:
+        client.run_headless()
+    else:
+        client.run(autoconnect=bool(host))
 
 if __name__ == "__main__":
-    print("🪟 SynergyClone Client (Windows) GUI başlatılıyor...")
-    client = SynergyClient()
-    client.run() 
\ No newline at end of file
+    main()
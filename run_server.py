@@ -3,9 +3,97 @@
 SynergyClone Server Çalıştırıcı - macOS
 """
 
-from server import SynergyServer
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser(description="SynergyClone Server")
+    parser.add_argument("--host", default=None, help="Dinlenecek adres (varsayılan: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=None, help="Dinlenecek port (varsayılan: 8765)")
+    parser.add_argument("--config", default=None, help="Ayarların okunacağı config.json yolu")
+    parser.add_argument("--backend", default=None, help="Input backend adı (varsayılan: platforma göre)")
+    parser.add_argument("--log-level", default=None, choices=["debug", "info", "warning", "error"],
+                        help="Log seviyesi (varsayılan: SYNERGY_LOG_LEVEL veya info)")
+    parser.add_argument("--latency-json", default=None, metavar="PATH",
+                        help="Kapanışta aşama gecikme histogramlarını bu JSON dosyasına yaz")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Prometheus metriklerini http://127.0.0.1:PORT/metrics adresinde sun")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="Kontrol geçişlerini izle ve kapanışta Chrome trace JSON olarak yaz")
+    parser.add_argument("--profile-dir", default=".",
+                        help="Çalışırken alınan profillerin yazılacağı klasör (GUI/SIGUSR2/kontrol mesajı)")
+    parser.add_argument("--profile-mode", default="stack", choices=["stack", "memory"],
+                        help="stack: örnekleme profili (.collapsed), memory: tracemalloc farkı")
+    parser.add_argument("--profile-hz", type=int, default=200, help="Örnekleme profili sıklığı")
+    parser.add_argument("--record", default=None, metavar="PATH",
+                        help="Yakalanan input'u `recording.py replay` için bu dosyaya kaydet")
+    parser.add_argument("--edge-threshold", default=None, metavar="SPEC",
+                        help="Kenar eşiği (px): 5 veya kenar başına right=5,left=3,top=off")
+    parser.add_argument("--edge-velocity", type=float, default=None,
+                        help="Geçiş için kenara doğru en küçük itiş hızı (px/s, 0: kapalı)")
+    parser.add_argument("--edge-dwell-ms", type=float, default=None,
+                        help="Yavaş yaklaşımda kenara dayalı kalma süresi (ms, 0: kapalı)")
+    parser.add_argument("--edge-corner", type=int, default=None, help="Köşe ölü bölgesi (px)")
+    parser.add_argument("--edge-hysteresis", type=int, default=None,
+                        help="Geri dönüşten sonra yeniden geçiş için kenardan uzaklaşma (px)")
+    parser.add_argument("--lock-cursor", action="store_true",
+                        help="Client kontrolündeyken imleci gizle, ortada kilitle ve hareketi göreli oku")
+    parser.add_argument("--headless", action="store_true",
+                        help="GUI olmadan çalış; log stdout'a yazılır, SIGINT/SIGTERM ile kapanır")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Server'ı hemen başlat ve dinlemeye kadar import/aşama sürelerini yazdır")
+    args = parser.parse_args()
+
+    if args.log_level:
+        from logs import set_log_level
+        set_log_level(args.log_level)
+    if args.trace:
+        from tracing import SERVER_PID, tracer
+        tracer.enable("SynergyClone Server", SERVER_PID, args.trace)
+
+    profile = None
+    if args.profile_startup:
+        from profiler import StartupProfile
+        profile = StartupProfile("Server başlangıcı")
+
+    from server import SynergyServer
+    if profile:
+        profile.mark("import")
+
+    # Öncelik: komut satırı > config dosyası > varsayılan
+    host, port = '0.0.0.0', 8765
+    if args.config:
+        from utils import ConfigManager
+        server_config = ConfigManager(args.config).load_config()["server"]
+        host, port = server_config.get("host", host), server_config.get("port", port)
+    host = args.host or host
+    port = args.port or port
+
+    if args.headless:
+        print(f"🍎 SynergyClone Server headless başlatılıyor ({host}:{port})...")
+    else:
+        print("🍎 SynergyClone Server (macOS) GUI başlatılıyor...")
+    server = SynergyServer(host=host, port=port, input_backend=args.backend)
+    server.startup_profile = profile
+    server.latency_dump_path = args.latency_json
+    server.metrics_port = args.metrics_port
+    server.record_path = args.record
+    if args.edge_threshold is not None:
+        from edge import parse_thresholds
+        server.edge_options['thresholds'] = parse_thresholds(args.edge_threshold)
+    for option, value in (('min_velocity', args.edge_velocity), ('dwell_ms', args.edge_dwell_ms),
+                          ('corner_px', args.edge_corner), ('hysteresis_px', args.edge_hysteresis)):
+        if value is not None:
+            server.edge_options[option] = value
+    server.lock_cursor = args.lock_cursor
+    from profiler import RuntimeProfiler
+    server.profiler = RuntimeProfiler("server", args.profile_dir, args.profile_mode, args.profile_hz)
+    if profile:
+        profile.mark("init")
+
+    if args.headless:
+        server.run_headless()
+    else:
+        server.run(autostart=args.profile_startup)
 
 if __name__ == "__main__":
-    print("🍎 SynergyClone Server (macOS) GUI başlatılıyor...")
-    server = SynergyServer()
-    server.run() 
\ No newline at end of file
+    main()
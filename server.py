@@ -4,22 +4,65 @@ SynergyClone Server - Mouse ve keyboard paylaşımı için server
 """
 
 import asyncio
-import websockets
 import json
+import signal
 import threading
 import time
 import platform
-import tkinter as tk
-from tkinter import ttk, scrolledtext
+from time import perf_counter_ns
+from cursor_lock import CursorLock
+from edge import EdgeDetector
+from injection import InjectionWorker
 from input_handler import InputHandler
+from logs import GuiLogFlusher, Logger, LogRing
+from loop_monitor import LoopMonitor
+from metrics import SERVER_STAGES, Metrics, MetricsEndpoint, PipelineLatency
+from profiler import RuntimeProfiler
+from recording import Recorder
+from tracing import tracer
+from utils import MessageType, PhaseTimer, ScreenInfo, lazy_import, normalize_coordinates
+
+# Ağır modüller ilk kullanımda yüklenir (GUI oluşturma / server başlatma)
+websockets = lazy_import("websockets")
+tk = lazy_import("tkinter")
+ttk = lazy_import("tkinter.ttk")
+scrolledtext = lazy_import("tkinter.scrolledtext")
 
 class SynergyServer:
-    def __init__(self, host='0.0.0.0', port=8765):
+    def __init__(self, host='0.0.0.0', port=8765, input_backend=None):
         self.host = host
         self.port = port
         self.clients = set()
-        self.input_handler = InputHandler()
+        self.latency = PipelineLatency(SERVER_STAGES)  # Aşama bazında gecikme histogramları
+        self.latency_dump_path = None  # Kapanışta histogramların yazılacağı JSON dosyası
+        self.input_handler = InputHandler(input_backend, latency=self.latency)
+        self._handoff_latency = self.latency.stage("handoff")
+        self._encode_latency = self.latency.stage("encode")
+        self._send_latency = self.latency.stage("send")
+        self.metrics = Metrics("synergy_server", self.latency)
+        self.metrics_port = None  # Verilirse localhost'ta Prometheus /metrics sunulur
+        self.record_path = None  # Verilirse yakalanan input bu dosyaya kaydedilir (bkz. recording)
+        self._handoff_submitted = 0  # Yakalama thread'inden loop'a gönderilen mesajlar
+        self._handoff_started = 0    # Loop'ta işlenmeye başlanan mesajlar
+        self._setup_metrics()
+        self.profiler = RuntimeProfiler("server")  # Çalışırken açılıp kapatılabilen profil
+        self.loop = None  # Server'ın asyncio loop'u (start_server içinde atanır)
+        self.startup_profile = None  # --profile-startup modunda StartupProfile
+        self.headless = False  # GUI olmadan (daemon) çalışıyor mu?
+        self._stop_event = None
         self.controlling_local = True  # Başlangıçta local kontrolde
+        self.edge_detector = None  # Kenar geçişi kararı (mouse_edge_detection ile kurulur)
+        self.edge_options = {}  # EdgeDetector ayarları (eşikler, hız, bekleme, köşe, histerezis)
+        self._edge_lock = threading.Lock()  # Detektör capture thread'i ve bekleme zamanlayıcısından kullanılır
+        self._edge_position = (0, 0)  # Son yerel capture konumu (bekleme geçişinde kullanılır)
+        self._dwell_deadline = None
+        self._dwell_timer = None
+        self.lock_cursor = False  # Client kontrolündeyken imleci gizleyip ortada kilitle (göreli capture)
+        self.cursor_lock = None  # lock_cursor açıksa start_server içinde kurulur
+        # X grab round-trip'leri capture/bekleme thread'lerini bloklamasın; sıra korunur
+        self.suppress_worker = InjectionWorker(name="suppress")
+        self._virtual = (0, 0)  # Client kontrolündeyken client ekranındaki sanal imleç konumu
+        self._last_move = (0, 0)  # Önceki capture konumu (kilitsizken delta için)
         self.screen_width = 1920  # Varsayılan değerler
         self.screen_height = 1080
         self.client_info = {}  # Client bilgileri
@@ -30,6 +73,10 @@ class SynergyServer:
         self.status_label = None
         self.client_count_label = None
         self.log_text = None
+        self.log_ring = LogRing()
+        self.logger = Logger("server", sink=self._write_log)
+        self.loop_monitor = LoopMonitor(logger=self.logger)
+        self.log_flusher = None
         self.start_button = None
         self.stop_button = None
         
@@ -72,7 +119,9 @@ class SynergyServer:
         
         ttk.Button(control_buttons_frame, text="Windows'a Geç", command=self._switch_to_client_gui).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(control_buttons_frame, text="macOS'a Geç", command=self._switch_to_local_gui).pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Button(control_buttons_frame, text="Durum Göster", command=self._show_status_gui).pack(side=tk.LEFT)
+        ttk.Button(control_buttons_frame, text="Durum Göster", command=self._show_status_gui).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(control_buttons_frame, text="Profil", command=self.toggle_profiler).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(control_buttons_frame, text="Client Profili", command=self.send_profile_command).pack(side=tk.LEFT)
         
         # Durum bilgileri
         status_frame = ttk.LabelFrame(main_frame, text="Durum", padding="10")
@@ -90,6 +139,8 @@ class SynergyServer:
         
         self.log_text = scrolledtext.ScrolledText(log_frame, height=20, width=80)
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.log_flusher = GuiLogFlusher(self.root, self.log_text, self.log_ring)
+        self.log_flusher.start()
         
         # Grid weights
         self.root.columnconfigure(0, weight=1)
@@ -138,11 +189,17 @@ class SynergyServer:
                 return "localhost"
 
     def log(self, message):
-        """Log mesajı ekle"""
-        if self.log_text:
-            self.log_text.insert(tk.END, f"{time.strftime('%H:%M:%S')} - {message}\n")
-            self.log_text.see(tk.END)
-        print(message)
+        """Log mesajı ekle (her thread'den çağrılabilir; GUI toplu olarak güncellenir)"""
+        self.logger.info(message)
+
+    def _write_log(self, level, message):
+        """Logger çıktısını halkaya ve stdout'a yazar."""
+        line = f"{time.strftime('%H:%M:%S')} - {message}"
+        self.log_ring.append(line)
+        if self.headless:
+            print(line, flush=True)
+        else:
+            print(message)
 
     def _start_server_gui(self):
         """GUI'den server başlat"""
@@ -157,18 +214,18 @@ class SynergyServer:
             try:
                 loop.run_until_complete(self.start_server())
             except Exception as e:
-                self.log(f"❌ Server hatası: {e}")
+                self.logger.error(f"❌ Server hatası: {e}")
             finally:
                 loop.close()
                 # GUI'yi güncelle
-                self.root.after(0, self._update_server_status_stopped)
+                self._gui_call(self._update_server_status_stopped)
         
         thread = threading.Thread(target=start_async, daemon=True)
         thread.start()
 
     def _stop_server_gui(self):
         """GUI'den server durdur"""
-        self.running = False
+        self.stop()
         self._update_server_status_stopped()
 
     def _switch_to_client_gui(self):
@@ -189,6 +246,7 @@ class SynergyServer:
         if self.client_info:
             for addr, info in self.client_info.items():
                 self.log(f"   📱 {addr}: {info['screen_width']}x{info['screen_height']}")
+        self.log(self.latency.report())
 
     def _update_server_status_running(self):
         """Server durumunu güncelle - çalışıyor"""
@@ -212,50 +270,172 @@ class SynergyServer:
 
     def _on_closing(self):
         """Pencere kapatılırken"""
-        self.running = False
+        self.stop()
         self.root.destroy()
 
+    def stop(self):
+        """Server'ı durdur (herhangi bir thread'den veya sinyal işleyicisinden)"""
+        self.running = False
+        if self.loop and self._stop_event and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._stop_event.set)
+
+    def dump_latency(self):
+        """Aşama gecikme raporunu logla; latency_dump_path verildiyse JSON olarak yaz"""
+        self.log(self.latency.report())
+        self.log(self.loop_monitor.report())
+        if self.latency_dump_path:
+            try:
+                self.latency.dump(self.latency_dump_path)
+                self.log(f"💾 Gecikme histogramları yazıldı: {self.latency_dump_path}")
+            except OSError as e:
+                self.logger.warning("⚠️ Gecikme histogramları yazılamadı: %s", e)
+
+    def toggle_profiler(self, action="toggle", mode=None):
+        """Çalışırken profili aç/kapat (GUI, SIGUSR2 veya 'profile' kontrol mesajı)"""
+        self.log(self.profiler.handle_command(action, mode))
+
+    def write_trace(self):
+        """Tracing açıksa olayları Chrome trace dosyasına yaz"""
+        if tracer.enabled and tracer.path:
+            try:
+                self.log(f"🧵 Trace yazıldı: {tracer.write()}")
+            except OSError as e:
+                self.logger.warning("⚠️ Trace yazılamadı: %s", e)
+
+    def start_recording(self):
+        """record_path verildiyse yakalanan olayları ekran bilgisiyle birlikte kaydet"""
+        if not self.record_path or self.input_handler.recorder is not None:
+            return
+        screen = ScreenInfo(width=self.screen_width, height=self.screen_height, name=platform.node())
+        try:
+            self.input_handler.recorder = Recorder(self.record_path, [screen])
+        except OSError as e:
+            self.logger.warning("⚠️ Input kaydı başlatılamadı: %s", e)
+            return
+        self.log(f"📼 Input kaydediliyor: {self.record_path}")
+
+    def stop_recording(self):
+        recorder, self.input_handler.recorder = self.input_handler.recorder, None
+        if recorder is not None:
+            recorder.close()
+            self.log(f"📼 Kayıt kapatıldı: {recorder.path} ({recorder.events} olay)")
+
+    def _gui_call(self, callback):
+        """GUI varsa callback'i Tk thread'inde çalıştır"""
+        if self.root:
+            self.root.after(0, callback)
+
+    def _send_threadsafe(self, message, captured_ns=0):
+        """Herhangi bir thread'den server loop'u üzerinden mesaj gönder"""
+        if self.loop and self.loop.is_running():
+            if captured_ns:
+                message['ts'] = captured_ns // 1000  # Gönderen zaman damgası (µs), client jitter buffer'ı için
+            self._handoff_submitted += 1
+            asyncio.run_coroutine_threadsafe(self._send_handoff(message, captured_ns), self.loop)
+
+    def _trace_tag(self, message):
+        """Tracing açıksa kontrol mesajına olay kimliği ekle"""
+        if tracer.enabled:
+            message['event_id'] = tracer.new_event_id()
+        return message
+
+    async def _send_handoff(self, message, captured_ns):
+        self._handoff_started += 1
+        await self.send_to_clients(message, captured_ns)
+
+    def _setup_metrics(self):
+        """Scrape anında hesaplanan göstergeleri kaydet"""
+        def write_buffers():
+            return {self.metrics.peer_labels.get(ws, "?"): ws.transport.get_write_buffer_size()
+                    for ws in list(self.clients) if ws.transport is not None}
+
+        self.metrics.gauge("clients", "Bağlı client sayısı", lambda: len(self.clients))
+        self.metrics.gauge("controlling_local", "Kontrol server'da mı (1/0)",
+                           lambda: int(self.controlling_local))
+        self.metrics.gauge("handoff_queue_depth", "Loop'a aktarılmayı bekleyen mesajlar",
+                           lambda: self._handoff_submitted - self._handoff_started)
+        self.metrics.gauge("send_buffer_bytes", "Client başına gönderim tamponunda bekleyen byte",
+                           write_buffers, label="peer")
+        self.metrics.gauge("loop_lag_max_seconds", "En yüksek asyncio loop gecikmesi",
+                           lambda: self.loop_monitor.max_lag_ns / 1e9)
+        self.metrics.gauge("loop_stalls", "Eşiği aşan loop tıkanmaları",
+                           lambda: self.loop_monitor.stall_count)
+
     async def register_client(self, websocket, path):
         """Yeni client kaydı"""
         self.clients.add(websocket)
         client_addr = websocket.remote_address
+        self.metrics.add_peer(websocket, f"{client_addr[0]}:{client_addr[1]}" if client_addr else "?")
         self.log(f"✅ Client bağlandı: {client_addr}")
-        self.root.after(0, self._update_client_count)
+        self._gui_call(self._update_client_count)
         
         try:
             await websocket.wait_closed()
         finally:
             self.clients.remove(websocket)
+            self.metrics.remove_peer(websocket)
             if client_addr in self.client_info:
                 del self.client_info[client_addr]
+            if not self.clients and not self.controlling_local:
+                # Kontroldeki client koptu; bastırmayı kaldır, kilitli imleci geri getir
+                await self.loop.run_in_executor(None, self.set_controlling_local, True)
             self.log(f"❌ Client ayrıldı: {client_addr}")
-            self.root.after(0, self._update_client_count)
+            self._gui_call(self._update_client_count)
 
-    async def send_to_clients(self, message):
-        """Tüm clientlara mesaj gönder"""
+    async def send_to_clients(self, message, captured_ns=0):
+        """Tüm clientlara mesaj gönder
+
+        captured_ns verilirse (olayın yakalandığı an) thread'den loop'a geçiş
+        süresi "handoff" aşamasına yazılır. Mesaj bir kez kodlanıp tüm
+        clientlara aynı metin gönderilir.
+        """
+        start = perf_counter_ns()
+        if captured_ns:
+            self._handoff_latency.record(start - captured_ns)
         if self.clients:
+            payload = json.dumps(message)
+            self._encode_latency.record(perf_counter_ns() - start)
+            msg_type = message.get('type')
+            if self.metrics.enabled:
+                events = self.metrics.events_out
+                events[msg_type if msg_type in events else 'other'] += 1
             # Thread-safe mesaj gönderimi
             await asyncio.gather(
-                *[self.safe_send(client, message) for client in self.clients.copy()],
+                *[self.safe_send(client, payload) for client in self.clients.copy()],
                 return_exceptions=True
             )
+            if tracer.enabled and 'event_id' in message:
+                tracer.span(f"send:{msg_type}", start, event_id=message['event_id'])
+                tracer.flow_start(message['event_id'], start)
 
     async def safe_send(self, websocket, message):
-        """Güvenli mesaj gönderimi"""
+        """Güvenli mesaj gönderimi (message: sözlük veya önceden kodlanmış JSON metni)"""
         try:
-            await websocket.send(json.dumps(message))
+            payload = message if isinstance(message, str) else json.dumps(message)
+            start = perf_counter_ns()
+            await websocket.send(payload)
+            self._send_latency.record(perf_counter_ns() - start)
+            bytes_out = self.metrics.bytes_out
+            if self.metrics.enabled and websocket in bytes_out:
+                bytes_out[websocket] += len(payload)  # ensure_ascii JSON: karakter = byte
         except websockets.exceptions.ConnectionClosed:
             # Client bağlantısı kesilmiş, listeden çıkar
+            self.metrics.send_errors += 1
             self.clients.discard(websocket)
         except Exception as e:
-            self.log(f"⚠️ Mesaj gönderme hatası: {e}")
+            self.metrics.send_errors += 1
+            self.logger.warning("⚠️ Mesaj gönderme hatası: %s", e, every=1.0)
             self.clients.discard(websocket)
 
     async def handle_client_message(self, websocket, message):
         """Client mesajlarını işle"""
+        received = perf_counter_ns()
         try:
             data = json.loads(message)
             msg_type = data.get('type')
+            if self.metrics.enabled:
+                events = self.metrics.events_in
+                events[msg_type if msg_type in events else 'other'] += 1
             
             if msg_type == 'client_info':
                 # Client bilgilerini kaydet
@@ -264,14 +444,32 @@ class SynergyServer:
                 self.log(f"📱 Client bilgisi alındı: {data['screen_width']}x{data['screen_height']}")
                 
             elif msg_type == 'control_returned':
-                # Kontrol geri döndü
-                self.controlling_local = True
+                # Kontrol geri döndü; input bastırmayı kaldırmak OS çağrısı, loop dışında yap
+                await self.loop.run_in_executor(None, self.set_controlling_local, True)
                 self.log("🔄 Kontrol server'a geri döndü")
                 
+            elif msg_type == 'profile':
+                # Server profilini uzaktan aç/kapat
+                await self.loop.run_in_executor(
+                    None, self.toggle_profiler, data.get('action', 'toggle'), data.get('mode'))
+                
+            elif msg_type == 'trace_sync':
+                # Client'ın saat farkı ölçümü: alım ve yanıt zamanlarını geri gönder
+                await self.safe_send(websocket, {
+                    'type': 'trace_sync',
+                    't0': data['t0'],
+                    't1': received,
+                    't2': perf_counter_ns()
+                })
+            
+            if tracer.enabled and 'event_id' in data:
+                tracer.span(f"receive:{msg_type}", received, event_id=data['event_id'])
+                tracer.flow_end(data['event_id'], received)
+                
         except json.JSONDecodeError:
-            self.log(f"⚠️ Geçersiz JSON mesajı: {message}")
+            self.logger.warning("⚠️ Geçersiz JSON mesajı: %.200s", message, every=1.0)
         except Exception as e:
-            self.log(f"⚠️ Mesaj işleme hatası: {e}")
+            self.logger.warning("⚠️ Mesaj işleme hatası: %s", e, every=1.0)
 
     def switch_to_client(self):
         """Manuel olarak client'a geç"""
@@ -283,7 +481,7 @@ class SynergyServer:
             self.log("⚠️ Bağlı client yok")
             return
             
-        self.controlling_local = False
+        self.set_controlling_local(False)
         self.log("🎮 Manuel olarak client'a geçildi")
         
         # Client'a kontrol mesajı gönder
@@ -293,7 +491,18 @@ class SynergyServer:
         }
         
         # Asyncio loop'ta çalıştır
-        asyncio.create_task(self.send_to_clients(message))
+        self._send_threadsafe(self._trace_tag(message))
+
+    def send_profile_command(self, action="toggle", mode=None):
+        """Bağlı client'ların profilini 'profile' kontrol mesajıyla aç/kapat"""
+        if not self.clients:
+            self.log("⚠️ Bağlı client yok")
+            return
+        message = {'type': 'profile', 'action': action}
+        if mode:
+            message['mode'] = mode
+        self._send_threadsafe(message)
+        self.log(f"🔬 Client'lara profil komutu gönderildi: {action}")
 
     def switch_to_local(self):
         """Manuel olarak local'e geç"""
@@ -301,7 +510,7 @@ class SynergyServer:
             self.log("⚠️ Zaten local kontrolünde")
             return
             
-        self.controlling_local = True
+        self.set_controlling_local(True)
         self.log("🎮 Manuel olarak local'e geçildi")
         
         # Client'a kontrol bırakma mesajı gönder
@@ -311,91 +520,187 @@ class SynergyServer:
         }
         
         # Asyncio loop'ta çalıştır
-        asyncio.create_task(self.send_to_clients(message))
+        self._send_threadsafe(self._trace_tag(message))
+
+    def set_controlling_local(self, local):
+        """Kontrolün yerini değiştir; client kontrolündeyken yerel input bastırılır"""
+        if local != self.controlling_local:
+            self.metrics.control_switches += 1
+        lock = self.cursor_lock
+        if not local and self.controlling_local:
+            # Sanal konum, kontrol bayrağı değişmeden önce hazır olmalı (capture thread'i okur)
+            position = self._last_move
+            if lock is not None and not lock.engaged:
+                lock.engage()
+                position = lock.saved
+            self._virtual = self._to_client_coordinates(*position)
+        self.controlling_local = local
+        self.suppress_worker.submit(self._apply_suppress, not local)
+        if local and lock is not None:
+            lock.release()
+        if local and self.edge_detector is not None:
+            # Kontrol kenarda geri döndü; imleç kenardan uzaklaşmadan tekrar geçme
+            with self._edge_lock:
+                self.edge_detector.disarm()
+
+    def _apply_suppress(self, suppress):
+        """Suppress worker'ında: yerel input bastırmayı uygula; olmazsa bastırmasız devam et"""
+        if not self.input_handler.set_suppress_input(suppress) and suppress:
+            self.logger.warning("⚠️ Yerel input bastırılamadı; client kontrolündeyken yerel "
+                                "uygulamalar da input alacak", every=5.0)
+
+    def _client_screen(self):
+        """İlk client'ın ekran bilgisini döndür"""
+        if not self.client_info:
+            return None
+        client_addr = list(self.client_info.keys())[0]
+        info = self.client_info[client_addr]
+        return ScreenInfo(width=info['screen_width'], height=info['screen_height'])
+
+    def _to_client_coordinates(self, x, y):
+        """Server koordinatlarını client ekranına dönüştür"""
+        client_screen = self._client_screen()
+        if client_screen is None:
+            return int(x), int(y)
+        server_screen = ScreenInfo(width=self.screen_width, height=self.screen_height)
+        return normalize_coordinates(x, y, server_screen, client_screen)
+
+    def setup_input_forwarding(self):
+        """Yakalanan input'u client kontrolündeyken client'lara ilet"""
+        self.input_handler.on_mouse_move = self._forward_mouse_move
+        self.input_handler.on_mouse_click = self._forward_mouse_click
+        self.input_handler.on_mouse_scroll = self._forward_mouse_scroll
+        self.input_handler.on_key_press = self._forward_key
+        self.input_handler.on_key_release = self._forward_key
+
+    def _forward_mouse_move(self, event):
+        last, self._last_move = self._last_move, (event.x, event.y)
+        if self.controlling_local:
+            detector = self.edge_detector
+            if detector is not None:
+                self._edge_position = (event.x, event.y)
+                with self._edge_lock:
+                    edge = detector.feed(event.timestamp_ns or perf_counter_ns(), event.x, event.y)
+                    deadline = detector.dwell_deadline
+                if edge:
+                    self._switch_at_edge(edge, event.x, event.y)
+                elif deadline != self._dwell_deadline:
+                    self._schedule_dwell(deadline)
+            return
+        # İmleç kenara dayalı kaldığından mutlak konum iletilmez; client'taki sanal imleç
+        # iniş noktasından itibaren deltalarla kaydırılır (kilitliyken deltayı kilit verir)
+        lock = self.cursor_lock
+        if lock is not None and lock.engaged:
+            dx, dy = lock.delta(event.x, event.y)
+        else:
+            dx, dy = event.x - last[0], event.y - last[1]
+        if not dx and not dy:
+            return  # Işınlamanın kendisi veya hareketsiz örnek
+        client_screen = self._client_screen()
+        x, y = self._virtual[0] + dx, self._virtual[1] + dy
+        if client_screen is not None:
+            x = min(max(x, 0), client_screen.width - 1)
+            y = min(max(y, 0), client_screen.height - 1)
+        self._virtual = (x, y)
+        # dx/dy ölçeklenmemiş capture deltasıdır (client'ın göreli modu için)
+        self._send_threadsafe({'type': MessageType.MOUSE_MOVE.value, 'x': x, 'y': y,
+                               'dx': dx, 'dy': dy}, event.timestamp_ns)
+
+    def _forward_mouse_click(self, event):
+        if self.controlling_local:
+            if self.edge_detector is not None:
+                with self._edge_lock:
+                    self.edge_detector.button(event.pressed)
+            return
+        x, y = self._virtual
+        self._send_threadsafe({
+            'type': MessageType.MOUSE_CLICK.value,
+            'x': x,
+            'y': y,
+            'button': event.button,
+            'pressed': event.pressed
+        }, event.timestamp_ns)
+
+    def _forward_mouse_scroll(self, event):
+        if self.controlling_local:
+            return
+        x, y = self._virtual
+        self._send_threadsafe({
+            'type': MessageType.MOUSE_SCROLL.value,
+            'x': x,
+            'y': y,
+            'dx': event.scroll_x,
+            'dy': event.scroll_y
+        }, event.timestamp_ns)
+
+    def _forward_key(self, event):
+        if self.controlling_local:
+            return
+        msg_type = MessageType.KEY_PRESS if event.pressed else MessageType.KEY_RELEASE
+        self._send_threadsafe({'type': msg_type.value, 'key': event.key}, event.timestamp_ns)
 
     def mouse_edge_detection(self):
-        """Mouse kenar algılama"""
-        def edge_detection_thread():
-            last_pos = None
-            edge_threshold = 5  # Kenardan kaç pixel uzakta algılansın
-            
-            while self.running:
-                try:
-                    if not self.controlling_local:
-                        time.sleep(0.1)
-                        continue
-                    
-                    # Mouse pozisyonunu al
-                    current_pos = self.input_handler.get_mouse_position()
-                    if current_pos is None:
-                        time.sleep(0.1)
-                        continue
-                    
-                    x, y = current_pos
-                    
-                    # Ekran boyutlarını al
-                    screen_width, screen_height = self.input_handler.get_screen_size()
-                    
-                    # Kenar kontrolü
-                    at_right_edge = x >= screen_width - edge_threshold
-                    at_left_edge = x <= edge_threshold
-                    at_top_edge = y <= edge_threshold
-                    at_bottom_edge = y >= screen_height - edge_threshold
-                    
-                    # Eğer kenardaysa ve hareket ettiyse
-                    if (at_right_edge or at_left_edge or at_top_edge or at_bottom_edge):
-                        if last_pos and current_pos != last_pos:
-                            self.log(f"🎯 Kenar algılandı: ({x}, {y}) - Ekran: {screen_width}x{screen_height}")
-                            
-                            # Client'a geç
-                            if self.clients:
-                                self.controlling_local = False
-                                
-                                # Koordinatları client ekranına dönüştür
-                                if self.client_info:
-                                    client_addr = list(self.client_info.keys())[0]
-                                    client_screen = self.client_info[client_addr]
-                                    
-                                    # Kenar pozisyonuna göre client'taki pozisyonu hesapla
-                                    if at_right_edge:
-                                        client_x = 10  # Sol kenara
-                                        client_y = int(y * client_screen['screen_height'] / screen_height)
-                                    elif at_left_edge:
-                                        client_x = client_screen['screen_width'] - 10  # Sağ kenara
-                                        client_y = int(y * client_screen['screen_height'] / screen_height)
-                                    elif at_top_edge:
-                                        client_x = int(x * client_screen['screen_width'] / screen_width)
-                                        client_y = client_screen['screen_height'] - 10  # Alt kenara
-                                    else:  # at_bottom_edge
-                                        client_x = int(x * client_screen['screen_width'] / screen_width)
-                                        client_y = 10  # Üst kenara
-                                    
-                                    message = {
-                                        'type': 'take_control',
-                                        'mouse_x': client_x,
-                                        'mouse_y': client_y,
-                                        'reason': 'edge_detection'
-                                    }
-                                else:
-                                    message = {
-                                        'type': 'take_control',
-                                        'reason': 'edge_detection'
-                                    }
-                                
-                                # Asyncio loop'ta mesaj gönder
-                                asyncio.create_task(self.send_to_clients(message))
-                                self.log(f"📤 Client'a kontrol gönderildi")
-                    
-                    last_pos = current_pos
-                    time.sleep(0.05)  # 50ms bekle
-                    
-                except Exception as e:
-                    self.log(f"⚠️ Kenar algılama hatası: {e}")
-                    time.sleep(1)
-        
-        # Kenar algılama thread'ini başlat
-        edge_thread = threading.Thread(target=edge_detection_thread, daemon=True)
-        edge_thread.start()
+        """Kenar algılamayı capture olay akışına bağla (ayrı yoklama thread'i yok)"""
+        self.edge_detector = EdgeDetector(self.screen_width, self.screen_height, **self.edge_options)
+
+    def _schedule_dwell(self, deadline):
+        """İmleç kenarda durunca olay gelmez; bekleme süresi dolunca kontrol eden zamanlayıcı kur"""
+        if self._dwell_timer is not None:
+            self._dwell_timer.cancel()
+            self._dwell_timer = None
+        self._dwell_deadline = deadline
+        if deadline is None:
+            return
+        delay = max(0.0, (deadline - perf_counter_ns()) / 1e9) + 0.001
+        self._dwell_timer = threading.Timer(delay, self._dwell_expired)
+        self._dwell_timer.name = "edge-dwell"
+        self._dwell_timer.daemon = True
+        self._dwell_timer.start()
+
+    def _dwell_expired(self):
+        """Zamanlayıcı thread'inden: imleç hâlâ kenara dayalıysa kontrolü geçir"""
+        if not self.controlling_local or self.edge_detector is None:
+            return
+        with self._edge_lock:
+            edge = self.edge_detector.check_dwell(perf_counter_ns())
+        if edge:
+            self._switch_at_edge(edge, *self._edge_position)
+
+    def _switch_at_edge(self, edge, x, y):
+        """Capture thread'inden: imleç kenardan itildi, kontrolü client'a geçir"""
+        edge_ns = perf_counter_ns()
+        screen_width, screen_height = self.screen_width, self.screen_height
+        self.logger.info("🎯 Kenar algılandı: %s (%d, %d) - Ekran: %dx%d", edge, x, y,
+                         screen_width, screen_height, every=1.0)
+        if not self.clients:
+            return
+        self.set_controlling_local(False)
+        
+        message = {
+            'type': 'take_control',
+            'reason': 'edge_detection'
+        }
+        # Kenar pozisyonuna göre client'taki pozisyonu hesapla (karşı kenara yerleştir)
+        client_screen = self._client_screen()
+        if client_screen is not None:
+            if edge == 'right':
+                message['mouse_x'] = 10
+                message['mouse_y'] = int(y * client_screen.height / screen_height)
+            elif edge == 'left':
+                message['mouse_x'] = client_screen.width - 10
+                message['mouse_y'] = int(y * client_screen.height / screen_height)
+            elif edge == 'top':
+                message['mouse_x'] = int(x * client_screen.width / screen_width)
+                message['mouse_y'] = client_screen.height - 10
+            else:
+                message['mouse_x'] = int(x * client_screen.width / screen_width)
+                message['mouse_y'] = 10
+            self._virtual = (message['mouse_x'], message['mouse_y'])
+        
+        self._send_threadsafe(self._trace_tag(message))
+        if tracer.enabled:
+            tracer.span("edge_detection", edge_ns, event_id=message['event_id'], x=x, y=y, edge=edge)
+        self.logger.info("📤 Client'a kontrol gönderildi", every=1.0)
 
     async def start_server(self):
         """Server'ı başlat"""
@@ -403,13 +708,17 @@ class SynergyServer:
         self.log(f"📡 Adres: {self.host}:{self.port}")
         self.log(f"💻 Platform: {platform.system()}")
         
-        # Input handler'ı başlat
-        if not self.input_handler.start():
-            self.log("❌ Input handler başlatılamadı!")
-            return
+        self.loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self.loop_monitor.start()
+        timeline = PhaseTimer("Server başlatma")
         
-        # Mouse kenar algılamayı başlat
-        self.mouse_edge_detection()
+        # Input handler'ı başlat (backend başlatma OS çağrısı yapar, loop dışında)
+        if not await self.loop.run_in_executor(None, self.input_handler.start):
+            self.logger.error("❌ Input handler başlatılamadı!")
+            self.loop_monitor.stop()
+            return
+        timeline.mark("input_handler")
         
         # WebSocket server'ı başlat
         async def handle_client(websocket, path):
@@ -419,38 +728,126 @@ class SynergyServer:
             )
         
         async with websockets.serve(handle_client, self.host, self.port):
+            timeline.mark("websocket")
+            if self.startup_profile:
+                self.startup_profile.finish("listening")
             self.log("✅ Server başlatıldı! Clientların bağlanması bekleniyor...")
-            self.root.after(0, self._update_server_status_running)
+            self._gui_call(self._update_server_status_running)
+            
+            # Dinlemeye başladıktan sonra input tarafını hazırla;
+            # listener hazır olana kadar loop'u bloklamamak için executor'da bekle
+            self.screen_width, self.screen_height = await self.loop.run_in_executor(
+                None, self.input_handler.get_screen_size)
+            timeline.mark("screen_size")
+            
+            # Input yakalama ve client'lara iletim
+            self.setup_input_forwarding()
+            self.start_recording()
+            try:
+                await self.loop.run_in_executor(None, self.input_handler.start_capture)
+            except Exception as e:
+                self.log(f"⚠️ Input yakalama başlatılamadı: {e}")
+            timeline.mark("capture")
+            
+            # Mouse kenar algılamayı başlat
+            self.mouse_edge_detection()
+            if self.lock_cursor:
+                self.cursor_lock = CursorLock(self.input_handler.backend,
+                                              (self.screen_width, self.screen_height))
+            timeline.mark("edge_detection")
+            self.log(timeline.summary())
+            
+            metrics_endpoint = None
+            if self.metrics_port:
+                metrics_endpoint = MetricsEndpoint(self.metrics, self.metrics_port)
+                try:
+                    await metrics_endpoint.start()
+                    self.log(f"📈 Metrikler: http://{metrics_endpoint.host}:{self.metrics_port}/metrics")
+                except OSError as e:
+                    self.logger.warning("⚠️ Metrik uç noktası başlatılamadı: %s", e)
             
             # Server'ı çalışır durumda tut
             try:
                 while self.running:
-                    await asyncio.sleep(1)
+                    try:
+                        await asyncio.wait_for(self._stop_event.wait(), timeout=1)
+                    except asyncio.TimeoutError:
+                        pass
             except KeyboardInterrupt:
                 self.log("\n👋 Server kapatılıyor...")
             finally:
                 self.running = False
+                self._schedule_dwell(None)
+                if self.cursor_lock is not None:
+                    self.cursor_lock.release()
+                if metrics_endpoint:
+                    await metrics_endpoint.stop()
+                self.loop_monitor.stop()
+                try:
+                    self.suppress_worker.flush(timeout=1.0)  # Bekleyen grab listener'lar durmadan bitsin
+                except Exception:
+                    pass
+                self.suppress_worker.shutdown()
                 self.input_handler.stop()
+                self.stop_recording()
+                self.dump_latency()
+                self.write_trace()
 
     async def handle_messages(self, websocket):
         """Client mesajlarını dinle"""
         try:
+            metrics = self.metrics
+            bytes_in = metrics.bytes_in
             async for message in websocket:
+                if metrics.enabled and websocket in bytes_in:
+                    bytes_in[websocket] += len(message)
                 await self.handle_client_message(websocket, message)
         except websockets.exceptions.ConnectionClosed:
             pass
         except Exception as e:
-            self.log(f"⚠️ Mesaj dinleme hatası: {e}")
+            self.logger.warning("⚠️ Mesaj dinleme hatası: %s", e, every=1.0)
 
-    def run(self):
+    def run(self, autostart=False):
         """Server'ı çalıştır"""
         # GUI oluştur ve çalıştır
         self.create_gui()
+        if self.startup_profile:
+            self.startup_profile.mark("gui")
+        if autostart:
+            self.root.after(0, self._start_server_gui)
+        if hasattr(signal, "SIGUSR2"):
+            # Çalışırken profil aç/kapat: kill -USR2 <pid>
+            signal.signal(signal.SIGUSR2, lambda signum, frame: self.toggle_profiler())
         self.root.mainloop()
         
         # Temizlik
         self.running = False
 
+    def run_headless(self):
+        """GUI olmadan server'ı çalıştır; SIGINT/SIGTERM ile düzgün kapanır"""
+        self.headless = True
+        asyncio.run(self._run_headless())
+
+    async def _run_headless(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._on_signal, sig)
+            except (NotImplementedError, RuntimeError):
+                # Windows: loop sinyal işleyicisi desteklemiyor
+                signal.signal(sig, lambda signum, frame: self._on_signal(signum))
+        if hasattr(signal, "SIGUSR1"):
+            # Çalışırken gecikme raporu: kill -USR1 <pid>
+            loop.add_signal_handler(signal.SIGUSR1, lambda: self.log(self.latency.report()))
+            # Profil aç/kapat: kill -USR2 <pid> (dosya yazımı loop'u bloklamasın)
+            loop.add_signal_handler(signal.SIGUSR2, lambda: loop.run_in_executor(None, self.toggle_profiler))
+        await self.start_server()
+        self.log("👋 Server kapatıldı")
+
+    def _on_signal(self, signum):
+        self.log(f"🛑 Sinyal alındı ({signal.Signals(signum).name}), server kapatılıyor...")
+        self.stop()
+
 if __name__ == "__main__":
     server = SynergyServer()
     server.run() 
\ No newline at end of file
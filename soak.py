@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+SynergyClone dayanıklılık (soak) testi - memory backend'lerle binlerce kez
+bağlan → kontrolü geçir → bağlantıyı kes döngüsü çalıştırır ve kaynak
+kullanımının zamanla artıp artmadığını izler
+
+Örneklenenler: RSS, thread sayısı, açık soketler, server ve client loop'larındaki
+asyncio task sayısı ve tracemalloc ile izlenen bellek. Isınma sonrası örneklere
+doğru uydurulur; döngü boyunca öngörülen artış sınırı aşan değer varsa test
+başarısız olur ve en çok büyüyen allocation satırları raporlanır.
+
+Kullanım:
+    python3 soak.py --cycles 2000
+    python3 soak.py --cycles 10000 --sample-every 250 --json soak.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import logs
+from input_backend import MemoryBackend
+from latency_harness import SCREEN, _free_port, _wait_for
+from profiler import current_rss_mb
+
+WARMUP_SAMPLES = 2          # Trend hesabına katılmayan ilk örnekler (önbellekler, JIT'siz ısınma)
+SETTLE_S = 0.2              # Örneklemeden önce çıkan thread'lerin bitmesi için bekleme
+TOP_ALLOCATIONS = 10        # Raporlanan en çok büyüyen allocation satırı
+
+# Döngü boyunca izin verilen en fazla (doğrusal trendle öngörülen) artış
+TREND_LIMITS = {
+    "rss_mb": 16.0,
+    "traced_mb": 4.0,
+    "threads": 1.0,
+    "sockets": 2.0,
+    "tasks": 2.0,
+}
+
+
+def open_sockets():
+    """Sürecin açık soket sayısı (/proc üzerinden; desteklenmiyorsa None)"""
+    fd_dir = "/proc/self/fd"
+    if not os.path.isdir(fd_dir):
+        return None
+    count = 0
+    for fd in os.listdir(fd_dir):
+        try:
+            if os.readlink(os.path.join(fd_dir, fd)).startswith("socket:"):
+                count += 1
+        except OSError:
+            pass
+    return count
+
+
+def _count_tasks(loop):
+    if loop is None or loop.is_closed():
+        return 0
+
+    async def count():
+        return len(asyncio.all_tasks())
+    return asyncio.run_coroutine_threadsafe(count(), loop).result(timeout=5)
+
+
+def trend(samples, key):
+    """Isınma sonrası örneklere en küçük kareler doğrusu; (döngü başına eğim, öngörülen artış)"""
+    points = [(s["cycle"], s[key]) for s in samples[WARMUP_SAMPLES:] if s.get(key) is not None]
+    if len(points) < 3:
+        return 0.0, 0.0
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return 0.0, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+    return slope, slope * (points[-1][0] - points[0][0])
+
+
+def check_trends(samples, limits=TREND_LIMITS):
+    """(ad, ilk, son, öngörülen artış, sınır, başarısız mı?) listesi"""
+    rows = []
+    measured = samples[WARMUP_SAMPLES:]
+    for key, limit in limits.items():
+        values = [s[key] for s in measured if s.get(key) is not None]
+        if not values:
+            continue
+        _, growth = trend(samples, key)
+        rows.append((key, values[0], values[-1], growth, limit, growth > limit and values[-1] > values[0]))
+    return rows
+
+
+class Soak:
+    """Tek server, tek client; client'ın loop'u kalıcı, her döngüde yeniden bağlanır"""
+
+    def __init__(self, port: int = None):
+        from client import SynergyClient
+        from server import SynergyServer
+        self.port = port or _free_port()
+        self.server = SynergyServer(host="127.0.0.1", port=self.port,
+                                    input_backend=MemoryBackend(screen_size=SCREEN))
+        self.client = SynergyClient(server_host="127.0.0.1", server_port=self.port,
+                                    input_backend=MemoryBackend(screen_size=SCREEN))
+        self.client.headless = True
+        self.client_loop = asyncio.new_event_loop()
+        self._threads = []
+        self.failures = 0
+
+    def start(self):
+        server_thread = threading.Thread(target=lambda: asyncio.run(self.server.start_server()),
+                                         daemon=True, name="soak-server")
+        client_thread = threading.Thread(target=self.client_loop.run_forever, daemon=True,
+                                         name="soak-client")
+        self._threads = [server_thread, client_thread]
+        for thread in self._threads:
+            thread.start()
+        if not _wait_for(lambda: getattr(self.server.input_handler.backend, "capturing", False)):
+            raise RuntimeError("Server başlatılamadı")
+        self.client.input_handler.start()
+
+    def stop(self):
+        self.client.stop()
+        self.server.stop()
+        self.client.injector.shutdown()
+        self.client.input_handler.stop()
+        self.client_loop.call_soon_threadsafe(self.client_loop.stop)
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def cycle(self, index: int):
+        """Bağlan, kontrolü client'a geçir, (yarısında geri al) ve bağlantıyı kes"""
+        server, client = self.server, self.client
+        if not server.controlling_local:
+            server.switch_to_local()
+        connection = asyncio.run_coroutine_threadsafe(client.connect_to_server(), self.client_loop)
+        if not _wait_for(lambda: server.client_info):
+            self.failures += 1
+        else:
+            server.switch_to_client()
+            if not _wait_for(lambda: client.controlling):
+                self.failures += 1
+            # Döngülerin yarısında kontrol geri alınır, yarısında bağlantı kontroldeyken kopar
+            if index % 2 == 0:
+                server.switch_to_local()
+                _wait_for(lambda: not client.controlling)
+        if client.websocket is not None:
+            asyncio.run_coroutine_threadsafe(client.websocket.close(), self.client_loop).result(timeout=5)
+        connection.result(timeout=10)
+        if not _wait_for(lambda: not server.clients):
+            self.failures += 1
+
+    def sample(self, cycle: int) -> dict:
+        time.sleep(SETTLE_S)
+        gc.collect()
+        traced, _ = tracemalloc.get_traced_memory()
+        return {
+            "cycle": cycle,
+            "rss_mb": current_rss_mb(),
+            "traced_mb": traced / (1024 * 1024),
+            "threads": threading.active_count(),
+            "sockets": open_sockets(),
+            "tasks": _count_tasks(self.server.loop) + _count_tasks(self.client_loop),
+        }
+
+
+def run(args):
+    tracemalloc.start(args.traceback_depth)
+    soak = Soak(args.port)
+    soak.start()
+    samples = []
+    baseline_snapshot = None
+    start = time.monotonic()
+    try:
+        samples.append(soak.sample(0))
+        for i in range(1, args.cycles + 1):
+            soak.cycle(i)
+            if i % args.sample_every == 0:
+                samples.append(soak.sample(i))
+                if len(samples) == WARMUP_SAMPLES + 1:
+                    baseline_snapshot = tracemalloc.take_snapshot()
+                print(_format_sample(samples[-1], args.cycles), flush=True)
+        top = []
+        if baseline_snapshot is not None:
+            stats = tracemalloc.take_snapshot().compare_to(baseline_snapshot, "lineno")
+            top = [(str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+                   for stat in stats[:TOP_ALLOCATIONS] if stat.size_diff > 0]
+    finally:
+        soak.stop()
+        tracemalloc.stop()
+    return {
+        "cycles": args.cycles,
+        "elapsed_s": time.monotonic() - start,
+        "failures": soak.failures,
+        "samples": samples,
+        "top_allocations": top,
+    }
+
+
+def _format_sample(sample, cycles):
+    sockets = "?" if sample["sockets"] is None else sample["sockets"]
+    return (f"🔄 {sample['cycle']}/{cycles}: RSS {sample['rss_mb']:.1f}MB, "
+            f"tracemalloc {sample['traced_mb']:.2f}MB, thread {sample['threads']}, "
+            f"soket {sockets}, task {sample['tasks']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SynergyClone dayanıklılık (soak) testi")
+    parser.add_argument("--cycles", type=int, default=2000, help="Bağlan/geçiş/kes döngüsü sayısı")
+    parser.add_argument("--sample-every", type=int, default=None,
+                        help="Kaç döngüde bir örneklenir (varsayılan: cycles/20)")
+    parser.add_argument("--traceback-depth", type=int, default=1, help="tracemalloc yığın derinliği")
+    parser.add_argument("--port", type=int, default=None, help="Loopback portu (varsayılan: boş port)")
+    parser.add_argument("--json", default=None, metavar="PATH", help="Örnekleri ve sonucu JSON olarak yaz")
+    parser.add_argument("--verbose", action="store_true", help="Server/client loglarını göster")
+    args = parser.parse_args(argv)
+    args.sample_every = args.sample_every or max(1, args.cycles // 20)
+    if not args.verbose:
+        logs.set_log_level("warning")
+
+    result = run(args)
+    rows = check_trends(result["samples"])
+    result["trends"] = {key: {"first": first, "last": last, "growth": growth, "limit": limit,
+                              "failed": failed}
+                        for key, first, last, growth, limit, failed in rows}
+
+    print(f"⏱️ {result['cycles']} döngü {result['elapsed_s']:.1f}s "
+          f"({result['cycles'] / result['elapsed_s']:.0f} döngü/s), başarısız döngü {result['failures']}")
+    for key, first, last, growth, limit, failed in rows:
+        mark = "❌" if failed else "✅"
+        print(f"   {mark} {key}: {first:.2f} → {last:.2f} (trend {growth:+.2f}, sınır {limit:g})")
+    if result["top_allocations"]:
+        print("🧠 En çok büyüyen allocation'lar:")
+        for where, size_diff, count_diff in result["top_allocations"]:
+            print(f"   {size_diff / 1024:+.1f}KB ({count_diff:+d}) {where}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Sonuçlar yazıldı: {args.json}")
+
+    failed = [key for key, *_, is_failed in rows if is_failed]
+    if failed or result["failures"]:
+        print(f"❌ Kaynak artışı: {', '.join(failed) or '-'}; başarısız döngü: {result['failures']}")
+        return 1
+    print("✅ Kaynak kullanımı sabit")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+İmleç kilidi testleri - göreli capture, ışınlama sıklığı ve dönüşte konumun geri gelmesi
+"""
+
+from cursor_lock import CursorLock
+from input_backend import MemoryBackend
+from server import SynergyServer
+
+WIDTH, HEIGHT = 1920, 1080
+
+
+class DeltaSink:
+    """Capture olaylarını kilide verip deltaları toplayan sink"""
+
+    def __init__(self, lock):
+        self.lock = lock
+        self.deltas = []
+
+    def _on_mouse_move(self, x, y):
+        self.deltas.append(self.lock.delta(x, y))
+
+
+def locked_backend():
+    backend = MemoryBackend(screen_size=(WIDTH, HEIGHT))
+    lock = CursorLock(backend, backend.screen_size)
+    sink = DeltaSink(lock)
+    backend.start_capture(sink)
+    return backend, lock, sink
+
+
+def test_relative_motion_is_unbounded_and_warps_per_batch():
+    backend, lock, sink = locked_backend()
+    backend.move_mouse(WIDTH - 1, 400)  # Kenara dayalı
+    lock.engage()
+    assert backend.position == lock.center and backend.cursor_hidden
+
+    # Kenarın ötesine sürekli sağa itiş: imleç kilitli olmasa 0 delta üretirdi
+    script = [("rel", 7, 1)] * 2000 + [("rel", -3, -2)] * 500
+    backend.play(script, realtime=False)
+    assert sum(dx for dx, _ in sink.deltas) == 7 * 2000 - 3 * 500
+    assert sum(dy for _, dy in sink.deltas) == 2000 - 2 * 500
+    assert lock.events == 2500
+    # Olay başına değil, imleç margin kadar uzaklaştığında bir ışınlama (~margin / 7 olayda bir)
+    assert 0 < lock.warps <= 7 * 2000 // lock.margin + 1500 // lock.margin + 2
+
+
+def test_release_restores_exact_position():
+    backend, lock, _ = locked_backend()
+    backend.move_mouse(0, 733)
+    lock.engage()
+    backend.play([("rel", 250, -40)] * 20, realtime=False)
+    lock.release()
+    assert backend.position == (0, 733)
+    assert not backend.cursor_hidden
+    assert backend.injected[-1][1:] == ("move", 0, 733)
+
+    lock.release()  # İkinci release bir şey yapmaz
+    assert lock.delta(10, 10) == (0, 0)
+
+
+def test_in_flight_event_before_warp_keeps_delta():
+    backend, lock, _ = locked_backend()
+    lock.engage()
+    cx, cy = lock.center
+    assert lock.delta(cx + lock.margin + 5, cy) == (lock.margin + 5, 0)
+    warps = lock.warps
+    assert warps == 2  # engage + kenar payı aşıldı
+
+    # Işınlamadan önce üretilmiş olay geç teslim edildi: eski konuma göre delta
+    assert lock.delta(cx + lock.margin + 9, cy) == (4, 0)
+    # Işınlamadan sonraki ilk olay orta noktaya göre
+    assert lock.delta(cx + 3, cy + 1) == (3, 1)
+    assert lock.warps == warps
+
+
+def test_server_forwards_deltas_and_releases_on_return():
+    backend = MemoryBackend(screen_size=(WIDTH, HEIGHT))
+    server = SynergyServer(host="127.0.0.1", input_backend=backend)
+    server.lock_cursor = True
+    sent = []
+    server._send_threadsafe = lambda message, captured_ns=0: sent.append(message)
+    server.clients = {object()}
+    server.client_info = {("127.0.0.1", 1): {"screen_width": 1280, "screen_height": 720}}
+    server.screen_width, server.screen_height = WIDTH, HEIGHT
+    server.setup_input_forwarding()
+    server.input_handler.start_capture()
+    server.mouse_edge_detection()
+    server.cursor_lock = CursorLock(backend, (WIDTH, HEIGHT))
+
+    backend.move_mouse(1500, 300)
+    backend.play([("move", 1700, 400), ("move", WIDTH - 1, 500)], realtime=False)
+    take = sent[-1]
+    assert take["type"] == "take_control" and backend.cursor_hidden
+    assert server._virtual == (take["mouse_x"], take["mouse_y"])
+
+    backend.play([("rel", 5, 0)] * 400 + [("click", 0, 0, "left", True)], realtime=False)
+    moves = [m for m in sent if m["type"] == "mouse_move"]
+    assert sum(m["dx"] for m in moves) == 5 * 400
+    assert moves[-1]["x"] == 1279  # Client ekranına sığdırılmış sanal imleç
+    click = sent[-1]
+    assert (click["type"], click["x"], click["y"]) == ("mouse_click", 1279, take["mouse_y"])
+
+    server.set_controlling_local(True)
+    assert backend.position == (WIDTH - 1, 500)
+    assert not backend.cursor_hidden
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Kenar algılama testleri - kayıtlı oturumlarda yanlış geçiş oranı ve kalıcı kenar izleyici
+thread'inin yaşam döngüsü
+"""
+
+import asyncio
+import threading
+import time
+from time import perf_counter_ns
+
+from client import SynergyClient
+from edge import EdgeDetector, EdgeMonitor, parse_thresholds, replay_switches
+from input_backend import MemoryBackend
+from recording import Recorder, Recording
+from utils import ScreenInfo
+
+WIDTH, HEIGHT = 1920, 1080
+FRAME_US = 8000  # 125Hz mouse
+
+
+class Session:
+    """Etiketli sentetik oturum: (t_us, adım) olayları ve kasıtlı geçişlerin zamanları"""
+
+    def __init__(self):
+        self.t_us = 0
+        self.x, self.y = WIDTH // 2, HEIGHT // 2
+        self.events = []
+        self.intended = []
+
+    def move_to(self, x, y, speed_px_s):
+        """Sabit hızla (x, y)'ye git; her karede bir hareket olayı"""
+        distance = max(abs(x - self.x), abs(y - self.y))
+        frames = max(1, round(distance / speed_px_s * 1e6 / FRAME_US))
+        x0, y0 = self.x, self.y
+        for i in range(1, frames + 1):
+            self.t_us += FRAME_US
+            self.x, self.y = round(x0 + (x - x0) * i / frames), round(y0 + (y - y0) * i / frames)
+            self.events.append((self.t_us, ("move", self.x, self.y)))
+
+    def button(self, pressed):
+        self.t_us += FRAME_US
+        self.events.append((self.t_us, ("click", self.x, self.y, "left", pressed)))
+
+    def pause(self, seconds):
+        self.t_us += int(seconds * 1e6)
+
+    def push(self, x, y):
+        """Kasıtlı geçiş: kenara hızlı itiş"""
+        self.intended.append(self.t_us)
+        self.move_to(x, y, 2500)
+        self.pause(0.3)
+        self.move_to(WIDTH // 2, HEIGHT // 2, 3000)  # Kontrol geri döndü, imleç içeri
+
+
+def office_session():
+    session = Session()
+    for _ in range(3):
+        session.push(WIDTH - 1, 400)
+        session.push(0, 700)
+        session.push(1200, HEIGHT - 1)
+        # Pencere kenarını sürükleyerek boyutlandırma (düğme basılı)
+        session.move_to(WIDTH - 60, 300, 1500)
+        session.move_to(WIDTH - 3, 300, 200)  # Tutamağa yavaşça yaklaşılır
+        session.button(True)
+        session.move_to(WIDTH - 1, 900, 600)
+        session.button(False)
+        session.move_to(1500, 600, 1500)
+        # Hot corner hareketleri
+        session.move_to(WIDTH - 1, 0, 4000)
+        session.pause(0.5)
+        session.move_to(900, 500, 3000)
+        session.move_to(0, HEIGHT - 1, 4000)
+        session.move_to(900, 500, 3000)
+        # Sekme çubuğunda, üst kenar boyunca gezinme
+        session.move_to(300, 40, 1500)
+        session.move_to(300, 3, 150)
+        session.move_to(1500, 2, 300)
+        session.move_to(900, 500, 1500)
+        # Kenara yavaşça yaklaşıp dayanma (bekleme ile geçiş)
+        session.intended.append(session.t_us)
+        session.move_to(WIDTH - 20, 600, 1500)
+        session.move_to(WIDTH - 1, 600, 100)
+        session.pause(0.5)  # Kenarda durur; bu sürede hiç hareket olayı yok
+        session.move_to(900, 500, 3000)
+    return session
+
+
+def record(session, path):
+    recorder = Recorder(str(path), [ScreenInfo(WIDTH, HEIGHT)])
+    base_ns = perf_counter_ns() + 1_000_000
+    for t_us, step in session.events:
+        if step[0] == "move":
+            recorder.mouse_move(base_ns + t_us * 1000, step[1], step[2])
+        else:
+            recorder.mouse_click(base_ns + t_us * 1000, *step[1:])
+    recorder.close()
+
+
+def naive_switches(events, threshold=5, poll_us=50_000):
+    """Eski yoklamalı kural: 50ms'de bir, 5px bandında ve konum değiştiyse geçiş"""
+    switches, last_pos, position, next_poll = [], None, None, 0
+    for t_us, step in events:
+        while t_us >= next_poll and position is not None:
+            x, y = position
+            at_edge = x <= threshold or y <= threshold or x >= WIDTH - threshold or y >= HEIGHT - threshold
+            if at_edge and last_pos and position != last_pos:
+                switches.append(next_poll)
+            last_pos, next_poll = position, next_poll + poll_us
+        if step[0] == "move":
+            position = step[1:3]
+        next_poll = max(next_poll, t_us - t_us % poll_us)
+    return switches
+
+
+def classify(switch_times, intended, window_us=1_500_000):
+    """(isabet, yanlış) geçiş sayısı; kasıtlı geçişten sonraki pencere içindekiler isabet"""
+    hits, false, matched = 0, 0, set()
+    for t_us in switch_times:
+        target = next((i for i, start in enumerate(intended)
+                       if start <= t_us <= start + window_us and i not in matched), None)
+        if target is None:
+            false += 1
+        else:
+            matched.add(target)
+            hits += 1
+    return hits, false
+
+
+def test_false_switch_rate_on_recorded_session(tmp_path):
+    session = office_session()
+    path = tmp_path / "office.synrec"
+    record(session, path)
+
+    with Recording(str(path)) as recording:
+        events = list(recording.events())
+        switches = replay_switches(events, EdgeDetector(WIDTH, HEIGHT))
+    hits, false = classify([t for t, *_ in switches], session.intended)
+    assert hits == len(session.intended)
+    assert false == 0
+
+    # Aynı oturumda eski kural sürükleme, köşe ve sekme çubuğunda sürekli geçiş yapar
+    naive_hits, naive_false = classify(naive_switches(events), session.intended)
+    assert naive_hits == len(session.intended)
+    assert naive_false > len(session.intended)
+
+
+def test_hysteresis_prevents_ping_pong():
+    detector = EdgeDetector(WIDTH, HEIGHT)
+    t_ns = 0
+    for x in (1000, 1500, WIDTH - 1):
+        t_ns += 8_000_000
+        edge = detector.feed(t_ns, x, 500)
+    assert edge == "right"
+
+    # Kontrol kenarda geri döndü; kenar yakınında titreme tekrar geçiş yapmaz
+    for i in range(200):
+        t_ns += 8_000_000
+        assert detector.feed(t_ns, WIDTH - 1 - i % 20, 500) is None
+    for x in list(range(1900, 1500, -50)) + list(range(1560, WIDTH, 60)) + [WIDTH - 1]:
+        t_ns += 8_000_000  # Uzaklaşıp tekrar itince yeniden kurulmuş olur
+        edge = detector.feed(t_ns, x, 500)
+    assert edge == "right"
+
+
+def test_per_edge_thresholds():
+    thresholds = parse_thresholds("right=8,left=off")
+    assert thresholds == {"left": None, "right": 8, "top": None, "bottom": None}
+    detector = EdgeDetector(WIDTH, HEIGHT, thresholds, min_velocity=0)
+    assert detector.feed(0, 0, 500) is None
+    assert detector.feed(8_000_000, 500, 0) is None
+    assert detector.feed(16_000_000, WIDTH - 8, 500) == "right"
+
+
+def test_dwell_fires_without_further_events():
+    detector = EdgeDetector(WIDTH, HEIGHT)
+    t_ns = 0
+    for x in range(WIDTH - 20, WIDTH):  # Kenara yavaşça (125 px/s) yaklaşıp durur
+        t_ns += 8_000_000
+        assert detector.feed(t_ns, x, 600) is None
+    deadline = detector.dwell_deadline
+    assert deadline == t_ns + detector.dwell_ns
+    assert detector.check_dwell(deadline - 1) is None
+    assert detector.check_dwell(deadline) == "right"
+    assert detector.dwell_deadline is None and detector.check_dwell(deadline + 10**9) is None
+
+
+def test_server_switches_on_dwell_after_cursor_stops():
+    from server import SynergyServer
+    backend = MemoryBackend(screen_size=(WIDTH, HEIGHT))
+    server = SynergyServer(host="127.0.0.1", input_backend=backend)
+    sent = []
+    server._send_threadsafe = lambda message, captured_ns=0: sent.append(message)
+    server.clients = {object()}
+    server.screen_width, server.screen_height = WIDTH, HEIGHT
+    server.edge_options = {'dwell_ms': 100}
+    server.setup_input_forwarding()
+    server.input_handler.start_capture()
+    server.mouse_edge_detection()
+
+    script = []
+    for x in range(WIDTH - 20, WIDTH):
+        script += [("move", x, 600), ("sleep", FRAME_US / 1e6)]
+    backend.play(script)
+    assert sent == []  # Yavaş yaklaşım itiş sayılmaz; son olaydan sonra hiç olay yok
+    assert wait_for(lambda: sent, timeout=1.0)
+    assert sent[0]['type'] == 'take_control' and sent[0]['reason'] == 'edge_detection'
+    assert not server.controlling_local
+
+
+def test_edge_crossing_does_not_bounce_back():
+    from latency_harness import EDGE_POLL_WAIT, Harness
+    harness = Harness()
+    harness.start()
+    server, client = harness.server, harness.client
+    try:
+        harness.server_backend.play([("move", WIDTH // 2, 500)])
+        time.sleep(EDGE_POLL_WAIT)
+        harness.server_backend.play([("move", WIDTH - 1, 500)])
+        assert wait_for(lambda: client.controlling)
+        client.injector.flush(2.0)
+        assert harness.client_backend.position == (10, 500)  # Karşı kenara iniş
+
+        # Server imleci kenara dayalı; hareketler iniş noktasından delta olarak taşınır
+        harness.server_backend.play([("move", WIDTH - 1, 510), ("move", WIDTH - 1, 530)])
+        assert wait_for(lambda: harness.client_backend.position == (10, 530))
+        time.sleep(0.1)  # Client kenar izleyicisi birkaç kez yoklasın
+        assert client.controlling and not server.controlling_local
+
+        # Sola sürekli çekiş client'ın sol kenarına ulaşır ve kontrolü geri verir
+        harness.server_backend.play([("move", WIDTH - 1 - 40 * i, 530) for i in range(1, 5)])
+        assert wait_for(lambda: server.controlling_local)
+        assert not client.controlling
+    finally:
+        harness.stop()
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def make_monitor(backend, edges):
+    return EdgeMonitor(lambda: backend.position, lambda: backend.screen_size,
+                       lambda x, y: edges.append((x, y)), interval=0.005)
+
+
+def test_thread_count_is_constant_across_10000_switches():
+    client = SynergyClient(server_host="127.0.0.1", input_backend=MemoryBackend())
+    client.edge_monitor.start()  # connect_to_server'ın yaptığı gibi
+    take, release = {"type": "take_control"}, {"type": "release_control"}
+
+    async def switch(times):
+        for _ in range(times):
+            await client.handle_server_message(take)
+            await client.handle_server_message(release)
+
+    try:
+        asyncio.run(switch(100))
+        before = threading.active_count()
+        asyncio.run(switch(10000))
+        assert threading.active_count() == before
+        names = [thread.name for thread in threading.enumerate()]
+        assert names.count("client-edge") == 1
+    finally:
+        client.edge_monitor.stop()
+    assert "client-edge" not in [thread.name for thread in threading.enumerate()]
+
+
+def test_activation_wakes_monitor_and_fires_once():
+    backend, edges = MemoryBackend(), []
+    monitor = make_monitor(backend, edges)
+    monitor.start()
+    try:
+        backend.move_mouse(1919, 500)
+        time.sleep(0.05)
+        assert edges == []  # Kontrol yokken uyur
+
+        monitor.activate()
+        time.sleep(0.02)
+        backend.move_mouse(1918, 520)
+        assert wait_for(lambda: edges)
+        assert edges == [(1918, 520)] and not monitor.active
+
+        backend.move_mouse(1917, 540)
+        time.sleep(0.05)
+        assert len(edges) == 1  # Yeniden aktive edilene kadar tekrar bildirmez
+    finally:
+        monitor.stop()
+    assert not monitor.running
+
+
+def test_deactivate_stops_detection():
+    backend, edges = MemoryBackend(), []
+    monitor = make_monitor(backend, edges)
+    monitor.start()
+    try:
+        monitor.activate()
+        time.sleep(0.02)
+        monitor.deactivate()
+        time.sleep(0.02)
+        backend.move_mouse(0, 300)
+        backend.move_mouse(1, 300)
+        time.sleep(0.05)
+        assert edges == []
+    finally:
+        monitor.stop()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Enjeksiyon kuyruğu testleri - dolu kuyrukta tıklama/tuş olaylarının korunması
+"""
+
+import threading
+import time
+
+from injection import PUT_WAIT_TIMEOUT, InjectionWorker
+
+
+def stalled_worker(capacity):
+    worker = InjectionWorker(capacity=capacity)
+    gate, started = threading.Event(), threading.Event()
+    worker.submit(lambda: (started.set(), gate.wait()))
+    started.wait(2)  # Worker takıldı; kuyruk boş
+    return worker, gate
+
+
+def test_release_evicts_queued_move_when_full():
+    worker, gate = stalled_worker(capacity=4)
+    done = []
+
+    def move(x, y):
+        done.append(("move", x))
+
+    try:
+        worker.submit_move(move, 1, 0)
+        worker.submit(done.append, ("press", "a"))
+        worker.submit_move(move, 2, 0)
+        worker.submit(done.append, ("press", "b"))
+        assert not worker.submit_move(move, 3, 0)  # Hareket düşer
+        assert worker.submit(done.append, ("release", "a"))  # En eski hareketin yerine geçer
+        gate.set()
+        worker.flush(timeout=2)
+    finally:
+        worker.shutdown()
+    assert done == [("press", "a"), ("move", 2), ("press", "b"), ("release", "a")]
+    assert worker.dropped == 2
+
+
+def test_release_waits_briefly_for_room():
+    worker, gate = stalled_worker(capacity=2)
+    done = []
+    try:
+        worker.submit(done.append, "press")
+        worker.submit(done.append, "click")
+        threading.Timer(PUT_WAIT_TIMEOUT / 5, gate.set).start()
+        assert worker.submit(done.append, "release")  # Worker yer açana kadar bekler
+        worker.flush(timeout=2)
+        assert done == ["press", "click", "release"] and worker.dropped == 0
+
+        # Worker hiç ilerlemezse kısa beklemeden sonra düşer (loop uzun bloklanmaz)
+        gate.clear()
+        stalled = threading.Event()
+        worker.submit(lambda: (stalled.set(), gate.wait()))
+        stalled.wait(2)
+        worker.submit(done.append, "a")
+        worker.submit(done.append, "b")
+        start = time.monotonic()
+        assert not worker.submit(done.append, "c")
+        assert PUT_WAIT_TIMEOUT * 0.9 <= time.monotonic() - start < 1.0
+        assert worker.dropped == 1
+    finally:
+        gate.set()
+        worker.shutdown()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Listener hazır bekleme testleri - zaman aşımıyla bekleme ve başarısız başlatmada thread sızıntısı
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from input_backend import wait_for_listener
+
+
+class FakeListener(threading.Thread):
+    """pynput AbstractListener'ın hazır bildirimini taklit eden thread"""
+
+    def __init__(self, ready_after=None, die_after=None):
+        super().__init__(daemon=True)
+        self._condition = threading.Condition()
+        self._ready = False
+        self.running = False
+        self.ready_after = ready_after
+        self.die_after = die_after
+        self._stop_event = threading.Event()
+
+    def run(self):
+        self.running = True
+        if self.die_after is not None:
+            time.sleep(self.die_after)
+            self.running = False
+            return
+        time.sleep(self.ready_after)
+        with self._condition:
+            self._ready = True
+            self._condition.notify()
+        self._stop_event.wait()
+        self.running = False
+
+    def wait(self):
+        # pynput'taki gibi zaman aşımı yok
+        with self._condition:
+            while not self._ready:
+                self._condition.wait()
+
+
+def test_waits_for_ready_signal():
+    listener = FakeListener(ready_after=0.02)
+    listener.start()
+    try:
+        assert wait_for_listener(listener, timeout=1.0) >= 15
+    finally:
+        listener._stop_event.set()
+
+
+def test_dead_listener_does_not_leak_threads():
+    before = threading.active_count()
+    for _ in range(5):
+        listener = FakeListener(die_after=0.01)
+        listener.start()
+        with pytest.raises(RuntimeError, match="sonlandı"):
+            wait_for_listener(listener, timeout=1.0)
+        listener.join()
+    assert threading.active_count() == before
+
+
+def test_backend_registry_and_create_backend(monkeypatch):
+    from input_backend import MemoryBackend, PynputBackend, available_backends, create_backend
+
+    assert {"pynput", "windows", "macos", "memory"} <= set(available_backends())
+    backend = create_backend("memory", screen_size=(800, 600))
+    assert isinstance(backend, MemoryBackend) and backend.name == "memory"
+    assert backend.get_screen_size() == (800, 600)
+
+    monkeypatch.setenv("SYNERGY_INPUT_BACKEND", "memory")
+    assert isinstance(create_backend(), MemoryBackend)
+    monkeypatch.delenv("SYNERGY_INPUT_BACKEND")
+    monkeypatch.setattr("input_backend.get_platform_name", lambda: "linux")
+    assert type(create_backend()) is PynputBackend  # pynput ilk kullanımda yüklenir
+
+    with pytest.raises(ValueError, match="Bilinmeyen input backend"):
+        create_backend("nope")
+
+
+def test_headless_client_does_not_import_tkinter():
+    # Ayrı süreç: diğer testler tkinter'ı yüklemiş olabilir
+    script = (
+        "import sys\n"
+        "from client import SynergyClient\n"
+        "from input_backend import InputBackend, PynputBackend, create_backend\n"
+        "client = SynergyClient(server_host='127.0.0.1', input_backend='memory')\n"
+        "client.headless = True\n"
+        "PynputBackend.get_screen_size(object.__new__(PynputBackend))\n"
+        "InputBackend.get_clipboard_text(create_backend('memory'))\n"
+        "client.injector.shutdown()\n"
+        "assert 'tkinter' not in sys.modules, 'tkinter yüklendi'\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=30)
+    assert result.returncode == 0, result.stderr
+
+
+def test_failed_suppress_is_reported_and_disabled():
+    from input_backend import PynputBackend
+
+    backend = object.__new__(PynputBackend)
+    backend.capturing, backend.mouse_listener, backend.suppress_input = True, object(), False
+
+    def no_display(suppress):
+        raise ImportError("No module named 'Xlib'")
+
+    backend._apply_suppress = no_display
+    assert backend.set_suppress(True) is False
+    assert backend.suppress_input is False  # Bastırma açıkça kapalı
+    backend._apply_suppress = lambda suppress: True
+    assert backend.set_suppress(True) is True and backend.suppress_input
+
+
+def test_server_applies_suppress_off_the_capture_thread():
+    from input_backend import MemoryBackend
+    from server import SynergyServer
+
+    backend = MemoryBackend(screen_size=(800, 600))
+    calls = []
+
+    def failing_suppress(suppress):
+        calls.append((suppress, threading.current_thread().name))
+        backend.suppress_input = False
+        return not suppress
+
+    backend.set_suppress = failing_suppress
+    server = SynergyServer(host="127.0.0.1", input_backend=backend)
+    lines = []
+    server.logger.sink = lambda level, message: lines.append(message)
+    try:
+        server.set_controlling_local(False)
+        server.suppress_worker.flush(timeout=2)
+    finally:
+        server.suppress_worker.shutdown()
+    assert calls == [(True, "suppress")]
+    assert not server.input_handler.suppress_input
+    assert any("bastırılamadı" in line for line in lines)
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Log halkası testleri - sırasız eklenen satırlar ve dolu halkada atlanan sayısı
+"""
+
+from logs import LogRing
+
+
+def test_since_orders_out_of_order_entries():
+    ring = LogRing(capacity=8)
+    ring.append("a")
+    # İki thread numara aldı; ikincisi halkaya önce girdi
+    ring._buffer.append((3, "c"))
+    ring._buffer.append((2, "b"))
+    assert ring.since(0) == (3, ["a", "b", "c"], 0)
+    assert ring.since(1) == (3, ["b", "c"], 0)
+    assert ring.since(3) == (3, [], 0)
+
+
+def test_since_reports_dropped_lines():
+    ring = LogRing(capacity=4)
+    for i in range(10):
+        ring.append(str(i))
+    last, lines, skipped = ring.since(2)
+    assert (last, lines, skipped) == (10, ["6", "7", "8", "9"], 4)
+    assert ring.since(last) == (10, [], 0)
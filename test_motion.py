@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Hareket testleri - sentetik, düzensiz varış izinde jitter buffer oynatması ve hareket tahmini
+"""
+
+import math
+import random
+import statistics
+from time import perf_counter_ns
+
+import pytest
+
+from motion import JitterBuffer, MotionPredictor, evaluate, load_trace, save_trace, sleep_until
+
+FRAME_NS = 8_000_000          # 125Hz mouse
+CLOCK_OFFSET_NS = 7 * 10**9   # İki makine saati arasındaki (bilinmeyen) fark
+
+
+def jittery_trace(frames=600, seed=7):
+    """(gönderim, varış) çiftleri: 1-3ms ağ gecikmesi + Wi-Fi tarzı kümelenme.
+
+    40ms'lik (5 karelik) grupların her ikincisi grup sonuna kadar bekletilip
+    birlikte teslim edilir; TCP sırası korunduğu için varış zamanları azalmaz.
+    """
+    rng = random.Random(seed)
+    trace = []
+    last_arrival = 0
+    for i in range(frames):
+        sent = i * FRAME_NS
+        arrival = sent + CLOCK_OFFSET_NS + rng.randint(1_000_000, 3_000_000)
+        if (i // 5) % 2 == 1:  # Her 5 karelik grubun biri bekletilir ve toplu gelir
+            arrival = max(arrival, CLOCK_OFFSET_NS + ((i // 5) * 5 + 5) * FRAME_NS
+                          + rng.randint(0, 2_000_000))
+        last_arrival = max(last_arrival, arrival)
+        trace.append((sent, last_arrival))
+    return trace
+
+
+def replay(buffer, trace):
+    """Her kare için (varış, oynatma anı); oynatma varıştan önce olamaz"""
+    return [(arrival, max(arrival, buffer.schedule(sent, arrival))) for sent, arrival in trace]
+
+
+def test_jittery_trace_is_replayed_at_original_cadence():
+    trace = jittery_trace()
+    buffer = JitterBuffer(sink=None)
+    played = replay(buffer, trace)[64:]  # Isınma sonrası
+
+    arrival_gaps = [b[0] - a[0] for a, b in zip(played, played[1:])]
+    playout_gaps = [b[1] - a[1] for a, b in zip(played, played[1:])]
+    assert statistics.pstdev(arrival_gaps) > 5_000_000
+    assert statistics.pstdev(playout_gaps) < 500_000
+    on_time = sum(abs(gap - FRAME_NS) <= 1_000_000 for gap in playout_gaps)
+    assert on_time >= 0.95 * len(playout_gaps)
+
+    # Eklenen gecikme en kötü kümelenmeyi (~40ms) karşılayacak kadar, fazlası değil
+    added = [play - arrival for arrival, play in played]
+    assert max(added) <= 45_000_000
+    assert buffer.delay_ns <= 45_000_000
+
+
+def test_delay_follows_observed_jitter():
+    rng = random.Random(1)
+    buffer = JitterBuffer(sink=None, min_delay_ms=1.0, max_delay_ms=50.0)
+    for i in range(400):  # Kararlı ağ: 0.2ms jitter
+        sent = i * FRAME_NS
+        buffer.schedule(sent, sent + CLOCK_OFFSET_NS + rng.randint(0, 200_000))
+    assert buffer.delay_ns == buffer.min_delay_ns
+
+    for sent, arrival in jittery_trace(frames=200):
+        buffer.schedule(sent + 400 * FRAME_NS, arrival + 400 * FRAME_NS)
+    assert buffer.delay_ns > 20_000_000
+
+
+def test_playout_thread_keeps_order_and_cadence():
+    played = []
+    buffer = JitterBuffer(lambda func, args, coalescable: played.append((perf_counter_ns(), args)))
+    buffer.start()
+    try:
+        start_ns = perf_counter_ns()
+        # 4ms aralıklı 60 kare, 3'erli kümeler halinde teslim edilir; her 10. olay tıklama
+        for i in range(60):
+            sent_ns = start_ns + i * 4_000_000
+            if i % 3 == 0:
+                sleep_until(sent_ns + 3 * 4_000_000)
+            buffer.push(sent_ns // 1000, i % 10 != 0, None, (i,))
+        sleep_until(perf_counter_ns() + 100_000_000)
+    finally:
+        buffer.stop()
+
+    order = [args[0] for _, args in played]
+    assert order == sorted(order)
+    assert all(i in order for i in range(0, 60, 10))  # Tıklamalar asla atlanmaz
+    gaps = [b[0] - a[0] for a, b in zip(played[20:], played[21:])]
+    assert statistics.median(gaps) == pytest.approx(4_000_000, abs=500_000)
+
+
+def test_sleep_until_is_sub_millisecond():
+    errors = []
+    for _ in range(20):
+        deadline = perf_counter_ns() + 3_000_000
+        sleep_until(deadline)
+        errors.append(perf_counter_ns() - deadline)
+    assert statistics.median(errors) < 200_000
+
+
+def circular_trace(arrivals):
+    """Saniyede 1.5 tur dönen hızlı imleç; varışlar verilen izden"""
+    frames = []
+    for sent, arrival in arrivals:
+        angle = sent / 1e9 * 2 * math.pi * 1.5
+        frames.append((sent, arrival, 800 + 300 * math.cos(angle), 500 + 300 * math.sin(angle)))
+    return frames
+
+
+def test_prediction_reduces_error_on_recorded_trace(tmp_path):
+    path = tmp_path / "motion.json"
+    save_trace(circular_trace(jittery_trace()), str(path))
+    result = evaluate(load_trace(str(path)), MotionPredictor())
+
+    assert result["predictions"] > 0
+    assert result["predicted"]["mean_error_px"] < 0.7 * result["baseline"]["mean_error_px"]
+    assert result["hidden_latency_ms"] > 3.0
+
+
+def test_extrapolation_is_capped_and_reconciled():
+    predictor = MotionPredictor(max_extrapolation_ms=40, max_distance_px=64, reconcile_ms=24)
+    for i in range(10):  # 8ms'de 20px sağa
+        predictor.observe(i * FRAME_NS, 100 + 20 * i, 300)
+    last_ns = 9 * FRAME_NS
+
+    assert not predictor.is_late(last_ns + FRAME_NS)
+    assert predictor.is_late(last_ns + 2 * FRAME_NS)
+    x, y = predictor.predict(last_ns + 30_000_000)
+    assert 280 + 60 <= x <= 280 + 64 and y == 300
+    assert predictor.expired(last_ns + 41_000_000)
+
+    # Gerçek kare tahminin gerisinde gelir: imleç geri sıçramaz, fark 24ms'de erir
+    arrival_ns = last_ns + 32_000_000
+    shown = predictor.observe(arrival_ns, 300, 300)
+    assert shown[0] >= x - 2
+    halfway = predictor.position(arrival_ns + 12_000_000)
+    assert 300 < halfway[0] < shown[0]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Ağ bozucu testleri - bağlantı modeli ve loopback üzerinde TCP/datagram proxy'si
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from netem import Impairment, NetemProxy
+
+
+def test_stream_delivery_is_ordered_and_delayed():
+    link = Impairment.from_profile("busy Wi-Fi", seed=3)
+    dues = [link.plan(i * 0.002, 200) for i in range(5000)]
+    assert dues == sorted(dues)
+    assert all(due >= i * 0.002 + link.delay for i, due in enumerate(dues))
+    assert link.retransmitted > 0 and link.stalls > 0 and link.dropped == 0
+
+
+def test_datagram_loss_and_reordering():
+    link = Impairment(delay_ms=5, jitter_ms=1, loss=0.1, reorder=0.05, seed=1)
+    dues = [link.plan(i * 0.001, 100, ordered=False) for i in range(10000)]
+    delivered = [due for due in dues if due is not None]
+    assert link.dropped == pytest.approx(1000, rel=0.15)
+    assert len(delivered) == 10000 - link.dropped
+    inversions = sum(b < a for a, b in zip(delivered, delivered[1:]))
+    assert inversions > 0
+
+
+def test_bandwidth_cap_serializes_packets():
+    link = Impairment(bandwidth_kbps=800)  # 100 KB/s
+    dues = [link.plan(0.0, 1000) for _ in range(100)]
+    assert dues[-1] == pytest.approx(1.0)
+
+
+async def _echo_stream(reader, writer):
+    while data := await reader.read(4096):
+        writer.write(data)
+        await writer.drain()
+    writer.close()
+
+
+class _EchoDatagram(asyncio.DatagramProtocol):
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.transport.sendto(data, addr)
+
+
+class _Collector(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.received = asyncio.Queue()
+
+    def datagram_received(self, data, addr):
+        self.received.put_nowait(data)
+
+
+def test_tcp_proxy_round_trip_adds_delay():
+    async def run():
+        server = await asyncio.start_server(_echo_stream, "127.0.0.1", 0)
+        proxy = NetemProxy("127.0.0.1", server.sockets[0].getsockname()[1], delay_ms=20, jitter_ms=0)
+        port = await proxy.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        start = time.perf_counter()
+        writer.write(b"ping")
+        assert await asyncio.wait_for(reader.readexactly(4), 2) == b"ping"
+        elapsed = time.perf_counter() - start
+        writer.close()
+        await proxy.stop()
+        server.close()
+        return elapsed
+
+    assert 0.039 <= asyncio.run(run()) < 0.2
+
+
+def test_datagram_proxy_round_trip():
+    async def run():
+        loop = asyncio.get_running_loop()
+        echo, _ = await loop.create_datagram_endpoint(_EchoDatagram, local_addr=("127.0.0.1", 0))
+        proxy = NetemProxy("127.0.0.1", echo.get_extra_info("sockname")[1], udp=True, delay_ms=10)
+        port = await proxy.start()
+        transport, collector = await loop.create_datagram_endpoint(
+            _Collector, remote_addr=("127.0.0.1", port))
+        start = time.perf_counter()
+        for i in range(20):
+            transport.sendto(bytes([i]))
+        received = [await asyncio.wait_for(collector.received.get(), 2) for _ in range(20)]
+        elapsed = time.perf_counter() - start
+        transport.close()
+        await proxy.stop()
+        echo.close()
+        return received, elapsed, proxy.stats()
+
+    received, elapsed, stats = asyncio.run(run())
+    assert sorted(received) == [bytes([i]) for i in range(20)]
+    assert elapsed >= 0.019
+    assert stats["upstream"]["packets"] == 20 and stats["downstream"]["packets"] == 20
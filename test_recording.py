@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Input kaydı testleri - yazma/okuma gidiş-dönüşü, yarım kalmış dosya ve capture oynatma
+"""
+
+from input_backend import MemoryBackend
+from input_handler import InputHandler
+from recording import Recorder, Recording, capture_target
+from utils import ScreenInfo
+
+STEPS = [
+    ("move", -1280, 40),  # Sol monitör: negatif koordinat
+    ("move", -5, -300),
+    ("click", -5, -300, "left", True),
+    ("click", -5, -300, "left", False),
+    ("scroll", 12, 7, 0, -3),
+    ("press", "ş"),
+    ("release", "ş"),
+    ("press", "ctrl_l"),
+]
+
+
+def write(path, steps):
+    recorder = Recorder(str(path), [ScreenInfo(1920, 1080, -1920, 0, "sol"), ScreenInfo(1920, 1080)])
+    for i, step in enumerate(steps):
+        t_ns = (i + 1) * 1_000_000
+        kind = step[0]
+        if kind == "move":
+            recorder.mouse_move(t_ns, *step[1:])
+        elif kind == "click":
+            recorder.mouse_click(t_ns, *step[1:])
+        elif kind == "scroll":
+            recorder.mouse_scroll(t_ns, *step[1:])
+        else:
+            recorder.key(t_ns, step[1], kind == "press")
+    recorder.close()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "session.synrec"
+    write(path, STEPS)
+    with Recording(str(path)) as recording:
+        assert [step for _, step in recording.events()] == STEPS
+        assert recording.screens[0] == ScreenInfo(1920, 1080, -1920, 0, "sol")
+        info = recording.info()
+        assert info["events"] == len(STEPS) and not info["truncated"]
+
+
+def test_truncated_trailing_record_stops_cleanly(tmp_path):
+    path = tmp_path / "session.synrec"
+    write(path, STEPS)
+    data = path.read_bytes()
+    for cut in (1, 7, 8):  # Son kaydın ("ctrl_l") metni, uzunluğu ya da zaman farkı kesik
+        path.write_bytes(data[:-cut])
+        with Recording(str(path)) as recording:
+            assert [step for _, step in recording.events()] == STEPS[:-1]
+            assert recording.truncated
+
+
+def test_capture_target_keeps_button_names():
+    handler = InputHandler(MemoryBackend())
+    clicks = []
+    handler.on_mouse_click = clicks.append
+    handler.backend.button_to_string = lambda button: "unknown"  # pynput yalnızca kendi nesnelerini tanır
+    capture_target(handler)(("click", 10, 20, "right", True))
+    assert (clicks[0].button, clicks[0].pressed) == ("right", True)
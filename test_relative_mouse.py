@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Göreli mouse enjeksiyonu testleri - 1000 olay/s throughput, delta toplama ve auto mod
+"""
+
+import asyncio
+import threading
+import time
+
+import client as client_module
+from client import SynergyClient
+from injection import InjectionWorker
+from input_backend import MemoryBackend
+
+RATE = 1000  # olay/s (oyun mouse'larının yoklama hızı)
+SECONDS = 2
+
+
+def make_client(mode):
+    backend = MemoryBackend(screen_size=(1920, 1080))
+    client = SynergyClient(server_host="127.0.0.1", input_backend=backend)
+    client.relative_mouse = mode
+    return client, backend
+
+
+def injected(backend, kind):
+    return [entry for entry in backend.injected if entry[1] == kind]
+
+
+def test_relative_throughput_at_1000_events_per_second():
+    client, backend = make_client("on")
+    count = RATE * SECONDS
+    deltas = [((i % 7) - 2, (i % 5) - 2) for i in range(count)]
+
+    late = 0  # Zamanında gönderilemeyip bir öncekinin hemen ardından giden mesajlar
+
+    async def stream():
+        nonlocal late
+        start = time.perf_counter()
+        for i, (dx, dy) in enumerate(deltas):
+            # Kayan saat yerine hedef zamana göre bekle; ortalama hız RATE'te kalır
+            delay = start + i / RATE - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                late += 1
+            await client.handle_server_message({'type': 'mouse_move', 'x': 0, 'y': 0, 'dx': dx, 'dy': dy})
+        return time.perf_counter() - start
+
+    try:
+        elapsed = asyncio.run(stream())
+        client.injector.flush(timeout=5)
+    finally:
+        client.injector.shutdown()
+
+    rel = injected(backend, "rel")
+    assert not injected(backend, "move")
+    # Deltalar ölçeklenmeden ve eksiksiz geçer
+    assert sum(e[2] for e in rel) == sum(dx for dx, _ in deltas)
+    assert sum(e[3] for e in rel) == sum(dy for _, dy in deltas)
+    # Kaynak hızında: olay ayrı enjekte edilir; yalnızca art arda gelen (geç kalmış)
+    # mesajlar worker onları almadan önce birleşir
+    assert client.injector.dropped == 0
+    assert len(rel) + client.injector.coalesced == count
+    assert client.injector.coalesced <= late + 0.05 * count
+    assert count / elapsed >= 0.8 * RATE
+
+
+def test_backed_up_worker_sums_deltas():
+    client, backend = make_client("on")
+    gate = threading.Event()
+    count = 5000  # Kuyruk kapasitesinden (4096) fazla
+
+    async def send():
+        client.injector.submit(gate.wait)  # Worker takıldı
+        for _ in range(count):
+            await client.handle_server_message({'type': 'mouse_move', 'x': 0, 'y': 0, 'dx': 1, 'dy': -1})
+        await client.handle_server_message({'type': 'mouse_move', 'x': 5, 'y': 5})  # dx yok: mutlak
+
+    try:
+        asyncio.run(send())
+        gate.set()
+        client.injector.flush(timeout=5)
+    finally:
+        client.injector.shutdown()
+
+    rel = injected(backend, "rel")
+    assert sum(e[2] for e in rel) == count and sum(e[3] for e in rel) == -count
+    assert client.injector.dropped == 0 and client.injector.coalesced == count - 1
+    # Mutlak hareket bekleyen göreli hareketin yerine geçmez
+    assert [e[1] for e in backend.injected] == ["rel", "move"]
+
+
+def test_auto_mode_follows_pointer_grab(monkeypatch):
+    monkeypatch.setattr(client_module, "GRAB_CHECK_INTERVAL", 0.0)
+    client, backend = make_client("auto")
+    move = {'type': 'mouse_move', 'x': 400, 'y': 300, 'dx': 5, 'dy': -2}
+    click = {'type': 'mouse_click', 'x': 400, 'y': 300, 'button': 'left', 'pressed': True}
+    release = dict(click, pressed=False)
+
+    async def send(*messages):
+        for message in messages:
+            await client.handle_server_message(message)
+        client.injector.flush(timeout=5)
+
+    try:
+        asyncio.run(send(move))
+        assert backend.injected[-1][1:] == ("move", 400, 300)
+
+        backend.pointer_grab = True  # Oyun işaretçiyi yakaladı
+        for message in (move, move, click, release):
+            asyncio.run(send(message))  # Ayrı gönderim: göreli hareketler birleştirilmesin
+        assert [e[1:] for e in backend.injected[-4:]] == [
+            ("rel", 5, -2), ("rel", 5, -2), ("click", 410, 296, "left", True),
+            ("click", 410, 296, "left", False)]
+
+        backend.pointer_grab = False
+        asyncio.run(send(move))
+        assert backend.injected[-1][1:] == ("move", 400, 300)
+    finally:
+        client.injector.shutdown()
+
+
+def test_auto_mode_does_not_flip_during_drag(monkeypatch):
+    monkeypatch.setattr(client_module, "GRAB_CHECK_INTERVAL", 0.0)
+    client, backend = make_client("auto")
+    press = {'type': 'mouse_click', 'x': 100, 'y': 100, 'button': 'left', 'pressed': True}
+    drag = [{'type': 'mouse_move', 'x': 100 + 10 * i, 'y': 100, 'dx': 10, 'dy': 0} for i in range(1, 6)]
+    release = dict(press, x=150, pressed=False)
+    after = {'type': 'mouse_move', 'x': 160, 'y': 100, 'dx': 10, 'dy': 0}
+
+    async def send(*messages):
+        for message in messages:
+            await client.handle_server_message(message)
+            client.injector.flush(timeout=5)
+
+    try:
+        asyncio.run(send(press, *drag, release, after))
+    finally:
+        client.injector.shutdown()
+    # Düğme basılıyken backend yakalama bildirse de sürükleme mutlak konumlarla sürer
+    assert [e[1:] for e in backend.injected] == (
+        [("click", 100, 100, "left", True)] + [("move", 100 + 10 * i, 100) for i in range(1, 6)]
+        + [("click", 150, 100, "left", False), ("move", 160, 100)])
+    assert not backend.buttons_held
+
+
+def test_off_mode_and_old_servers_use_absolute_moves():
+    client, backend = make_client("on")
+
+    async def send():
+        await client.handle_server_message({'type': 'mouse_move', 'x': 10, 'y': 20})  # dx yok
+        client.injector.flush(timeout=5)  # Mutlak hareketler birleştirilmesin
+        client.relative_mouse = "off"
+        await client.handle_server_message({'type': 'mouse_move', 'x': 30, 'y': 40, 'dx': 20, 'dy': 20})
+        client.injector.flush(timeout=5)
+
+    try:
+        asyncio.run(send())
+    finally:
+        client.injector.shutdown()
+    assert [e[1:] for e in backend.injected] == [("move", 10, 20), ("move", 30, 40)]
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Soak testi trend analizi testleri - sentetik örnek serilerinde artış tespiti
+"""
+
+import random
+
+from soak import check_trends
+
+
+def samples(threads, rss, seed=5):
+    rng = random.Random(seed)
+    return [{"cycle": i * 100, "threads": threads(i), "rss_mb": rss(i) + rng.uniform(-2, 2),
+             "sockets": None} for i in range(20)]
+
+
+def failed(rows):
+    return {key for key, *_, is_failed in rows if is_failed}
+
+
+def test_flat_but_noisy_series_pass():
+    rows = check_trends(samples(lambda i: 7, lambda i: 40.0))
+    assert failed(rows) == set()
+    assert "sockets" not in {row[0] for row in rows}  # Ölçülemeyen değer atlanır
+
+
+def test_growing_threads_and_memory_fail():
+    rows = check_trends(samples(lambda i: 7 + i // 4, lambda i: 40.0 + 1.5 * i))
+    assert failed(rows) == {"threads", "rss_mb"}
+
+
+def test_warmup_growth_is_ignored():
+    rows = check_trends(samples(lambda i: 3 if i < 2 else 7, lambda i: 20.0 if i < 2 else 40.0))
+    assert failed(rows) == set()
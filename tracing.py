@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+SynergyClone olay izleme - kontrol geçişleri ve mesaj akışı için Chrome trace çıktısı
+
+Kapalıyken çağrı noktalarındaki maliyet tek bir `if tracer.enabled:` kontrolüdür.
+Açıkken olaylar bellekteki bir halkaya yazılır ve kapanışta chrome://tracing /
+Perfetto'nun açabildiği JSON olarak kaydedilir. İki makinenin çıktısı aynı
+zaman eksenine oturtulabilsin diye client, server saatine göre farkını ölçer.
+
+Kullanım:
+    python3 run_server.py --trace server_trace.json
+    python3 run_client.py --host 192.168.1.100 --trace client_trace.json
+    python3 tracing.py merge server_trace.json client_trace.json -o switch_trace.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+from collections import deque
+from time import perf_counter_ns
+
+TRACE_CAPACITY = 200000     # Bellekte tutulan en fazla olay
+CLOCK_SYNC_SAMPLES = 8      # Bağlantı başına saat farkı ölçüm sayısı
+CLOCK_SYNC_INTERVAL = 0.05  # Ölçümler arası bekleme (saniye)
+
+# Birleştirilmiş görünümde süreçlerin ayrı satırlarda görünmesi için sabit pid'ler
+SERVER_PID = 1
+CLIENT_PID = 2
+
+
+class ClockSync:
+    """NTP tarzı dört zaman damgasından saat farkı tahmini; en düşük RTT'li örnek kazanır.
+
+    t0: client gönderim, t1: server alım, t2: server yanıt, t3: client alım.
+    offset, client saatine eklendiğinde server saatini verir.
+    """
+
+    def __init__(self):
+        self.offset_ns = 0
+        self.rtt_ns = None
+        self.samples = 0
+
+    def add_sample(self, t0: int, t1: int, t2: int, t3: int):
+        rtt = (t3 - t0) - (t2 - t1)
+        self.samples += 1
+        if self.rtt_ns is None or rtt < self.rtt_ns:
+            self.rtt_ns = rtt
+            self.offset_ns = ((t1 - t0) + (t2 - t3)) // 2
+
+
+class Tracer:
+    """Süreç başına tek izleyici; olaylar (faz, ad, zaman, süre, thread, kimlik, argümanlar) olarak tutulur."""
+
+    def __init__(self):
+        self.enabled = False
+        self.process_name = ""
+        self.pid = 0
+        self.path = None
+        self.clock = ClockSync()
+        self._events = deque(maxlen=TRACE_CAPACITY)
+        self._ids = itertools.count(1)
+        self._id_prefix = ""
+
+    def enable(self, process_name: str, pid: int, path: str = None, id_prefix: str = None):
+        self.process_name = process_name
+        self.pid = pid
+        self.path = path
+        self._id_prefix = id_prefix or process_name.split()[-1].lower()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self._events.clear()
+
+    def new_event_id(self) -> str:
+        """Mesajla taşınan, iki makinede de eşsiz olay kimliği"""
+        return f"{self._id_prefix}-{next(self._ids)}"
+
+    def span(self, name: str, start_ns: int, end_ns: int = None, event_id: str = None, **args):
+        """Tamamlanmış süre olayı (Chrome 'X')"""
+        if end_ns is None:
+            end_ns = perf_counter_ns()
+        self._events.append(("X", name, start_ns, end_ns - start_ns,
+                             threading.get_native_id(), event_id, args))
+
+    def instant(self, name: str, event_id: str = None, **args):
+        self._events.append(("i", name, perf_counter_ns(), 0,
+                             threading.get_native_id(), event_id, args))
+
+    def flow_start(self, event_id: str, ts_ns: int = None):
+        """Olay kimliğiyle başlayan akış oku (diğer makinedeki flow_end'e bağlanır)"""
+        self._events.append(("s", "flow", ts_ns or perf_counter_ns(), 0,
+                             threading.get_native_id(), event_id, None))
+
+    def flow_end(self, event_id: str, ts_ns: int = None):
+        self._events.append(("f", "flow", ts_ns or perf_counter_ns(), 0,
+                             threading.get_native_id(), event_id, None))
+
+    def to_chrome(self) -> dict:
+        """Olayları server zaman eksenine kaydırılmış Chrome trace sözlüğüne çevirir."""
+        offset = self.clock.offset_ns
+        thread_names = {t.native_id: t.name for t in threading.enumerate()}
+        trace_events = [{"name": "process_name", "ph": "M", "pid": self.pid,
+                         "args": {"name": self.process_name}}]
+        for tid in {event[4] for event in self._events}:
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+                                 "args": {"name": thread_names.get(tid, str(tid))}})
+
+        for phase, name, ts_ns, dur_ns, tid, event_id, args in list(self._events):
+            event = {"name": name, "ph": phase, "ts": (ts_ns + offset) / 1000,
+                     "pid": self.pid, "tid": tid}
+            if phase == "X":
+                event["dur"] = dur_ns / 1000
+            elif phase == "i":
+                event["s"] = "t"
+            else:
+                event["cat"] = "control"
+                event["id"] = event_id
+                if phase == "f":
+                    event["bp"] = "e"
+            if phase in ("X", "i"):
+                event["cat"] = "control"
+                event["args"] = dict(args or {})
+                if event_id is not None:
+                    event["args"]["event_id"] = event_id
+            trace_events.append(event)
+
+        return {
+            "traceEvents": trace_events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "process": self.process_name,
+                "clock_offset_ns": offset,
+                "clock_sync_rtt_ns": self.clock.rtt_ns,
+                "clock_sync_samples": self.clock.samples,
+            },
+        }
+
+    def write(self, path: str = None) -> str:
+        path = path or self.path
+        with open(path, "w") as f:
+            json.dump(self.to_chrome(), f)
+        return path
+
+
+# Süreç genelinde paylaşılan izleyici
+tracer = Tracer()
+
+
+def merge(paths, output: str) -> int:
+    """Birden fazla trace dosyasını tek dosyada birleştirir; olay sayısını döndürür."""
+    events = []
+    for path in paths:
+        with open(path) as f:
+            events.extend(json.load(f)["traceEvents"])
+    with open(output, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return len(events)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SynergyClone trace araçları")
+    sub = parser.add_subparsers(dest="command", required=True)
+    merge_parser = sub.add_parser("merge", help="Server ve client trace dosyalarını birleştir")
+    merge_parser.add_argument("paths", nargs="+", help="Birleştirilecek trace JSON dosyaları")
+    merge_parser.add_argument("-o", "--output", required=True, help="Çıktı dosyası")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        if not os.path.exists(path):
+            parser.error(f"Dosya bulunamadı: {path}")
+    count = merge(args.paths, args.output)
+    print(f"✅ {count} olay birleştirildi: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
+import importlib
 import json
 import platform
 import socket
+import time
 from typing import Dict, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -33,11 +35,13 @@ class MouseEvent:
     pressed: Optional[bool] = None
     scroll_x: Optional[int] = None
     scroll_y: Optional[int] = None
+    timestamp_ns: int = 0  # Yakalama anı (time.perf_counter_ns)
 
 @dataclass
 class KeyEvent:
     key: str
     pressed: bool
+    timestamp_ns: int = 0  # Yakalama anı (time.perf_counter_ns)
 
 class Message:
     def __init__(self, msg_type: MessageType, data: dict = None):
@@ -110,7 +114,8 @@ class ConfigManager:
             "client": {
                 "server_host": "127.0.0.1",
                 "server_port": 24800,
-                "auto_connect": False
+                "auto_connect": False,
+                "relative_mouse": "off"
             },
             "screens": [],
             "settings": {
@@ -144,6 +149,54 @@ class ConfigManager:
         except Exception as e:
             print(f"Yapılandırma kaydedilemedi: {e}")
 
+class LazyModule:
+    """İlk öznitelik erişiminde import edilen modül vekili."""
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+    
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+    
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+    
+    def __repr__(self):
+        state = "yüklendi" if self._module is not None else "yüklenmedi"
+        return f"<LazyModule {self._name} ({state})>"
+
+def lazy_import(name: str) -> LazyModule:
+    """Ağır modülleri ilk kullanıma kadar ertelemek için vekil döndürür."""
+    return LazyModule(name)
+
+class PhaseTimer:
+    """Başlangıç aşamalarının süresini milisaniye olarak ölçer."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []
+    
+    def mark(self, phase: str) -> float:
+        """Önceki işaretten bu yana geçen süreyi aşama olarak kaydeder."""
+        now = time.perf_counter()
+        elapsed_ms = (now - self.last) * 1000
+        self.phases.append((phase, elapsed_ms))
+        self.last = now
+        return elapsed_ms
+    
+    def total_ms(self) -> float:
+        return (self.last - self.start) * 1000
+    
+    def summary(self) -> str:
+        """Aşama dökümünü tek satır olarak döndürür."""
+        parts = ", ".join(f"{phase}={ms:.1f}ms" for phase, ms in self.phases)
+        return f"⏱️ {self.name}: {parts} (toplam {self.total_ms():.1f}ms)"
+
 def validate_ip_address(ip: str) -> bool:
     """IP adresinin geçerli olup olmadığını kontrol eder."""
     try: